@@ -0,0 +1,120 @@
+import json
+import os
+from collections import Counter
+
+ABILITIES = [
+  ('strength', 'STR'),
+  ('dexterity', 'DEX'),
+  ('constitution', 'CON'),
+  ('intelligence', 'INT'),
+  ('wisdom', 'WIS'),
+  ('charisma', 'CHA'),
+]
+COINS = [('platinum', 'pp'), ('gold', 'gp'), ('electrum', 'ep'), ('silver', 'sp'), ('copper', 'cp')]
+# Fields rendered on the header lines rather than one line each
+HEADER_FIELDS = {
+  'name', 'type', 'class', 'level', 'age', 'experience', 'hit_dice', 'hit_points',
+  'current_hit_points', 'armor_class', 'speed',
+} | {field for field, _ in ABILITIES}
+
+# Rendered sheets keyed by path, with the (mtime_ns, size) they were read at
+_sheets = {}
+
+def is_empty(value) -> bool:
+  return value is None or value == '' or value == [] or value == {}
+
+def render_value(value) -> str:
+  if isinstance(value, dict):
+    if set(value) == {'name'}:
+      return str(value['name'])
+    return ', '.join(f"{key.replace('_', ' ')} {render_value(item)}" for key, item in value.items() if not is_empty(item))
+  if isinstance(value, list):
+    counts = Counter(render_value(item) for item in value if not is_empty(item))
+    return ', '.join(item if count == 1 else f"{item} x{count}" for item, count in counts.items())
+  return str(value)
+
+def render_bonus(bonus) -> str:
+  if isinstance(bonus, int) and not isinstance(bonus, bool):
+    return f"{bonus:+d}"
+  return render_value(bonus)
+
+def render_sheet(sheet: dict) -> str:
+  """
+  Render a character sheet as compact text for the prompt. Empty fields are
+  dropped, repeated list items are counted, and the core statistics share
+  two header lines.
+  """
+  def has(field: str) -> bool:
+    return not is_empty(sheet.get(field))
+
+  header = [str(sheet['name']) if has('name') else 'Unnamed']
+  identity = ' '.join(str(sheet[field]) for field in ('type', 'class') if not is_empty(sheet.get(field)))
+  if identity:
+    header[0] += f": {identity}"
+  if has('level'):
+    header.append(f"level {sheet['level']}")
+  if has('age'):
+    header.append(f"age {sheet['age']}")
+  if sheet.get('experience'):
+    header.append(f"XP {sheet['experience']}")
+  lines = [', '.join(header)]
+
+  stats = [f"{abbreviation} {sheet[field]}" for field, abbreviation in ABILITIES if has(field)]
+  if has('hit_points'):
+    current_hit_points = sheet['current_hit_points'] if has('current_hit_points') else sheet['hit_points']
+    hit_points = f"HP {current_hit_points}/{sheet['hit_points']}"
+    stats.append(f"{hit_points} ({sheet['hit_dice']})" if has('hit_dice') else hit_points)
+  if has('armor_class'):
+    stats.append(f"AC {sheet['armor_class']}")
+  if has('speed'):
+    stats.append(f"Speed {sheet['speed']}")
+  if stats:
+    lines.append(' '.join(stats))
+
+  for field, value in sheet.items():
+    if field in HEADER_FIELDS or is_empty(value):
+      continue
+    if field == 'currency' and isinstance(value, dict):
+      coins = [f"{value[coin]} {abbreviation}" for coin, abbreviation in COINS if value.get(coin)]
+      if coins:
+        lines.append(f"Currency: {', '.join(coins)}")
+      continue
+    if field == 'skills' and isinstance(value, dict):
+      skills = [f"{skill} {render_bonus(bonus)}" for skill, bonus in value.items() if not is_empty(bonus)]
+      if skills:
+        lines.append(f"Skills: {', '.join(skills)}")
+      continue
+    lines.append(f"{field.replace('_', ' ').capitalize()}: {render_value(value)}")
+  return '\n'.join(lines)
+
+def load_sheets(directory: str) -> list[str]:
+  """
+  Get the rendered character sheets in a directory, in file name order.
+  Sheets are parsed once and only read again after their file changes.
+  Files that aren't JSON are passed through as they are.
+  """
+  sheets = []
+  paths = set()
+  for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+    if not entry.is_file():
+      continue
+    stat = entry.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _sheets.get(entry.path)
+    if cached is None or cached[0] != key:
+      with open(entry.path, "r") as f:
+        text = f.read()
+      try:
+        sheet = json.loads(text)
+        rendered = render_sheet(sheet) if isinstance(sheet, dict) else text
+      except json.JSONDecodeError:
+        rendered = text
+      cached = (key, rendered)
+      _sheets[entry.path] = cached
+    sheets.append(cached[1])
+    paths.add(entry.path)
+
+  for path in set(_sheets) - paths:
+    if os.path.dirname(path) == directory.rstrip('/'):
+      del _sheets[path]
+  return sheets
@@ -26,10 +26,20 @@ if [[ -f "$ZIP_FILE" ]]; then
     rm -f "$ZIP_FILE"
 fi
 
+# Run the webapi tests first. CI makes the tests that need test-only dependencies fail rather than skip
+echo "🧪 Running webapi tests..."
+(cd "$WEBAPI_DIR" && pip install -q -r requirements-test.txt && CI=true python3 -m pytest -q)
+
 # Create package directory
 echo "📦 Creating package directory..."
 mkdir -p "$PACKAGE_DIR"
 
+# Build the offline D&D 5e SRD snapshot once, it is bundled with the package
+if [[ ! -f "$WEBAPI_DIR/data/dnd_5e_srd/srd-2014.snapshot" ]]; then
+    echo "📖 Building D&D 5e SRD snapshot..."
+    (cd "$WEBAPI_DIR" && python3 -m data.dnd_5e_srd.snapshot)
+fi
+
 # Copy Python files, requirements, and subdirectories, excluding __pycache__ and .venv
 echo "📋 Copying application files..."
 # Copy the entire webapi directory structure while preserving hierarchy
@@ -46,10 +56,12 @@ if [[ -d ".venv" ]]; then
 fi
 cd ..
 
-# Install dependencies to package directory
+# Install dependencies to package directory, along with their own dependencies.
+# aiobotocore only works with the botocore versions it pins, so the runtime's botocore can't be relied on
 echo "📚 Installing Python dependencies..."
 cd "$PACKAGE_DIR"
-pip install -r requirements.txt -t . --no-deps --platform manylinux2014_x86_64 --only-binary=:all:
+rm -f requirements-test.txt
+pip install -r requirements.txt -t . --platform manylinux2014_x86_64 --only-binary=:all:
 cd ..
 
 # Remove unnecessary files to reduce package size
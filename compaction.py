@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+from typing import Optional
+import dm
+from story_log import StoryLog
+
+# Story turns always sent verbatim, newest first, within a token budget
+RECENT_TURNS = 6
+RECENT_TOKEN_BUDGET = 3000
+# How far the verbatim turns may grow past their budget before older turns are
+# folded into the summary, so the summary is rewritten every few turns rather
+# than before every turn
+SUMMARY_SLACK_TURNS = 6
+SUMMARY_SLACK_TOKENS = 1500
+# Most story tokens folded into the summary by one model call
+SUMMARY_INPUT_TOKEN_BUDGET = 6000
+SUMMARY_MAX_TOKENS = 1024
+SUMMARY_PATH = "../story-summary.json"
+
+def estimate_tokens(text: str) -> int:
+  # About four characters per token for English prose
+  return len(text) // 4 + 1
+
+def get_digest(chunk: str) -> str:
+  return hashlib.sha256(chunk.encode('utf-8')).hexdigest()
+
+def get_recent(story_log: StoryLog) -> tuple[int, list[str]]:
+  """
+  Read the verbatim recent turns: at most RECENT_TURNS within
+  RECENT_TOKEN_BUDGET, and always at least the newest turn.
+
+  Returns:
+    The number of the first recent turn and the recent turns, oldest first
+  """
+  recent = story_log.tail(RECENT_TURNS)
+  start = len(recent)
+  tokens = 0
+  while start > 0:
+    chunk_tokens = estimate_tokens(recent[start - 1])
+    if start < len(recent) and tokens + chunk_tokens > RECENT_TOKEN_BUDGET:
+      break
+    tokens += chunk_tokens
+    start -= 1
+  return story_log.count() - len(recent) + start, recent[start:]
+
+def get_empty_summary() -> dict:
+  return {'summarized_count': 0, 'last_digest': None, 'summary': ''}
+
+def load_summary() -> dict:
+  if not os.path.exists(SUMMARY_PATH):
+    return get_empty_summary()
+  with open(SUMMARY_PATH, "r") as f:
+    return json.load(f)
+
+def save_summary(summary: dict):
+  temp_path = f"{SUMMARY_PATH}.tmp"
+  with open(temp_path, "w") as f:
+    json.dump(summary, f)
+  os.replace(temp_path, SUMMARY_PATH)
+
+def get_saved_summary(story_log: StoryLog) -> dict:
+  """
+  Load the saved summary, or an empty one if it doesn't belong to this story log.
+  """
+  summary = load_summary()
+  summarized_count = summary['summarized_count']
+  if summarized_count > story_log.count() or (
+    summarized_count and summary['last_digest'] != get_digest(story_log.read(summarized_count - 1))
+  ):
+    return get_empty_summary()
+  return summary
+
+def get_summary(story_log: StoryLog, older_count: int) -> str:
+  """
+  Get the rolling summary of the first older_count turns. Only turns that
+  arrived since the last call are read and sent to the model, folded into
+  the previous summary in batches under SUMMARY_INPUT_TOKEN_BUDGET. The
+  summary is rebuilt from scratch if it doesn't belong to this story log.
+  """
+  summary = get_saved_summary(story_log)
+  summarized_count = summary['summarized_count']
+  if summarized_count > older_count:
+    summary = get_empty_summary()
+    summarized_count = 0
+
+  if summarized_count == older_count:
+    return summary['summary']
+
+  text = summary['summary']
+  new_chunks = story_log.read_range(summarized_count, older_count)
+  while new_chunks:
+    batch_tokens = 0
+    batch_size = 0
+    for chunk in new_chunks:
+      chunk_tokens = estimate_tokens(chunk)
+      if batch_size and batch_tokens + chunk_tokens > SUMMARY_INPUT_TOKEN_BUDGET:
+        break
+      batch_tokens += chunk_tokens
+      batch_size += 1
+    text = dm.summarize_story(text, new_chunks[:batch_size], SUMMARY_MAX_TOKENS)
+    new_chunks = new_chunks[batch_size:]
+
+  save_summary({
+    'summarized_count': older_count,
+    'last_digest': get_digest(story_log.read(older_count - 1)),
+    'summary': text,
+  })
+  return text
+
+def get_unsummarized(story_log: StoryLog, summarized_count: int) -> Optional[list[str]]:
+  """
+  Read the turns after the summary, or None if they have grown past the
+  recent budget plus its slack and older turns must be folded into the summary.
+  """
+  if story_log.count() - summarized_count > RECENT_TURNS + SUMMARY_SLACK_TURNS:
+    return None
+  turns = story_log.read_range(summarized_count, story_log.count())
+  if len(turns) > 1 and sum(estimate_tokens(turn) for turn in turns) > RECENT_TOKEN_BUDGET + SUMMARY_SLACK_TOKENS:
+    return None
+  return turns
+
+def get_story_parts(story_log: StoryLog) -> tuple[str, str]:
+  """
+  Build the story part of the prompt: a rolling summary of the older story
+  followed by the most recent turns verbatim, so the prompt stays bounded
+  however long the campaign runs. The turns after the summary are sent
+  verbatim until they outgrow the recent budget by the slack, and only then
+  is a batch folded into the summary, so most turns make no summary call
+  and see the same summary as the turn before.
+
+  Returns:
+    The summary, empty while every turn is recent, and the recent turns
+  """
+  saved_summary = get_saved_summary(story_log)
+  recent_start = saved_summary['summarized_count']
+  recent = get_unsummarized(story_log, recent_start)
+  if recent is not None:
+    summary = saved_summary['summary']
+  else:
+    recent_start, recent = get_recent(story_log)
+    summary = get_summary(story_log, recent_start) if recent_start else ''
+  recent_string = "\n".join(recent)
+  if recent_start == 0:
+    return '', recent_string
+  return f"The story so far:\n{summary}\n", f"What happened most recently:\n{recent_string}"
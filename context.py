@@ -1,25 +1,31 @@
-import datetime
 import os
+import character_sheets
+from story_log import StoryLog, import_story_directory
+
+HUMAN_CHARACTERS_DIR = "../human-characters"
+STORY_DIR = "../story"
+STORY_LOG_DIR = "../story-log"
+
+_story_log = None
 
 def get_human_characters() -> list[str]:
-  files_path = "../human-characters"
-  files_in_dir = os.listdir(files_path)
-  human_characters = []
-  for file in files_in_dir:
-    with open(f"{files_path}/{file}", "r") as f:
-      human_characters.append(f.read())
-  return human_characters
+  return character_sheets.load_sheets(HUMAN_CHARACTERS_DIR)
+
+def get_story_log() -> StoryLog:
+  """
+  Open the story log. The first time, the turns of the old one-file-per-turn
+  story directory are imported into it.
+  """
+  global _story_log
+  if _story_log is None:
+    if not os.path.exists(STORY_LOG_DIR) and os.path.isdir(STORY_DIR):
+      import_story_directory(STORY_DIR, STORY_LOG_DIR)
+    _story_log = StoryLog(STORY_LOG_DIR)
+  return _story_log
 
 def get_story() -> list[str]:
-  files_path = "../story"
-  files_in_dir = sorted(os.listdir(files_path))
-  stories = []
-  for file in files_in_dir:
-    with open(f"{files_path}/{file}", "r") as f:
-      stories.append(f.read())
-  return stories
+  story_log = get_story_log()
+  return story_log.read_range(0, story_log.count())
 
 def save_story(dm_says: str):
-  now_timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-  with open(f"../story/{now_timestamp}.txt", "a") as f:
-    f.write(dm_says)
+  get_story_log().append(dm_says)
@@ -1,57 +1,53 @@
-import boto3
-import json
-import ollama
+import os
+import sys
+from typing import Iterator
 
-bedrock_client = boto3.client('bedrock-runtime', region_name='us-west-2')
-ollama_client = ollama.Client()
-BEDROCK_MODEL_ID='anthropic.claude-3-7-sonnet-20250219-v1:0'
+# The model providers live in the webapi llm package, shared with the NPC and monster roles
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'webapi'))
 
-def get_next(human_characters_string: str, story_string: str) -> str:
+from llm.provider import get_provider
+
+def warm():
+  get_provider().warm()
+
+def get_next(human_characters_string: str, story_string: str, story_summary: str = '') -> str:
+  print("The DM is thinking...")
+  return get_provider().complete(get_system_message(), get_user_message(story_string),
+                                 user_prefix=get_user_prefix(human_characters_string, story_summary))
+
+def stream_next(human_characters_string: str, story_string: str, story_summary: str = '') -> Iterator[str]:
   print("The DM is thinking...")
-  return get_next_bedrock(human_characters_string, story_string)
-
-def get_next_bedrock(human_characters_string: str, story_string: str) -> str:
-  system_message = get_system_message()
-  user_message = get_user_message(human_characters_string, story_string)
-  json_prompt = json.dumps({
-    'anthropic_version': 'bedrock-2023-05-31',
-    'max_tokens': 4096,
-    'system': system_message,
-    'temperature': 0.5,
-    'messages': [
-      {
-        'role': 'user',
-        'content': [
-          {
-            'type': 'text',
-            'text': user_message
-          }
-        ]
-      }
-    ]
-  })
-  response = bedrock_client.invoke_model(
-    body=json_prompt,
-    modelId=BEDROCK_MODEL_ID,
-    accept='application/json',
-    contentType='application/json'
-  )
-  response_body = json.loads(response['body'].read())
-  response_text = response_body['content'][0]['text']
-  return response_text
-
-def get_next_ollama(human_characters_string: str, story_string: str) -> str:
-  system_message = get_system_message()
-  user_message = get_user_message(human_characters_string, story_string)
-  messages = [
-    {'role': 'system', 'content': system_message },
-    {'role': 'user', 'content': user_message},
-  ]
-  response = ollama_client.chat(model='llama3', messages=messages)
-  return response['message']['content']
+  return get_provider().stream(get_system_message(), get_user_message(story_string),
+                               user_prefix=get_user_prefix(human_characters_string, story_summary))
+
+def report_stats():
+  stats = get_provider().get_stats()
+  if stats:
+    print(f"Model usage: {stats}")
 
 def get_system_message() -> str:
   return 'You are a DnD 5e dungeon master. Use the provided data to facilitate the next step of game play,'
 
-def get_user_message(human_characters_string: str, story_string: str) -> str:
-  return f"{human_characters_string}\n{story_string}\n\nWhat happens next?"
+def get_user_prefix(human_characters_string: str, story_summary: str) -> list[str]:
+  """
+  The start of the prompt that repeats between turns, least often changing
+  first: the character sheets, then the summary of the older story. The
+  summary is only rewritten when a batch of turns is folded into it, so it
+  is reused by the turns in between.
+  """
+  return [human_characters_string, story_summary] if story_summary else [human_characters_string]
+
+def get_user_message(story_string: str) -> str:
+  return f"{story_string}\n\nWhat happens next?"
+
+def summarize_story(summary: str, story_chunks: list[str], max_tokens: int) -> str:
+  """
+  Fold new story chunks into the running summary of the campaign.
+  """
+  story_string = "\n".join(story_chunks)
+  user_message = f"Summary so far:\n{summary or '(the story has just begun)'}\n\nWhat happened next:\n{story_string}\n\nWrite the updated summary."
+  return get_provider().complete(get_summary_system_message(), user_message, max_tokens=max_tokens)
+
+def get_summary_system_message() -> str:
+  return ('You keep the campaign notes for a DnD 5e dungeon master. Summarize the story in a few paragraphs, '
+          'keeping the characters, places, open quests, items gained and lost, and unresolved threads.')
@@ -1,14 +1,64 @@
+import argparse
+import compaction
 import context
 import dm
 
+def take_turn(human_characters_string: str, players_say: str = '') -> str:
+  """
+  Let the DM take the next turn of the story. What the players say is sent
+  with the recent story, and only saved along with the DM's reply, so a
+  failed turn leaves the story log as it was.
+  """
+  story_summary, recent_story = compaction.get_story_parts(context.get_story_log())
+  players_turn = f"The players: {players_say}" if players_say else ''
+  if players_turn:
+    recent_story = "\n".join(filter(None, [recent_story, players_turn]))
+  dm_says = []
+  for delta in dm.stream_next(human_characters_string, recent_story, story_summary):
+    print(delta, end='', flush=True)
+    dm_says.append(delta)
+  print()
+  if players_turn:
+    context.save_story(players_turn)
+  context.save_story(''.join(dm_says))
+  return ''.join(dm_says)
+
 def main():
   human_characters = context.get_human_characters()
   human_characters_string = "\n".join(human_characters)
-  story = context.get_story()
-  story_string = "\n".join(story)
-  dm_says = dm.get_next(human_characters_string, story_string)
-  context.save_story(dm_says)
-  print(dm_says)
+  take_turn(human_characters_string)
+  dm.report_stats()
+
+def session():
+  """
+  Run a game session in one process. The model client, the story log and
+  the character sheets stay loaded between turns, so each player input
+  costs only the model call.
+  """
+  dm.warm()
+  context.get_story_log()
+  print("Session started. Describe what the players do, or type 'quit' to end the session.")
+  while True:
+    try:
+      players_say = input("\n> ").strip()
+    except (EOFError, KeyboardInterrupt):
+      print()
+      break
+    if players_say.lower() in ('quit', 'exit'):
+      break
+    try:
+      # Sheets are only read again when their files change
+      human_characters_string = "\n".join(context.get_human_characters())
+      take_turn(human_characters_string, players_say)
+    except Exception as e:
+      print(f"\nThe DM couldn't take this turn, nothing was saved: {e}")
+  dm.report_stats()
 
 if __name__ == "__main__":
-  main()
+  parser = argparse.ArgumentParser(description='Let the DM take the next turn of the story.')
+  parser.add_argument('--session', action='store_true', help='keep playing turns interactively until you quit')
+  args = parser.parse_args()
+  if args.session:
+    session()
+  else:
+    main()
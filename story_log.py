@@ -0,0 +1,156 @@
+import os
+import shutil
+import struct
+import tempfile
+import threading
+
+# Each index entry locates one turn: segment number, offset in the segment, length in bytes
+INDEX_ENTRY = struct.Struct('<IQI')
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+
+class StoryLog:
+  """
+  An append-only log of story turns.
+
+  Turns are appended to numbered segment files, rolling over to a new
+  segment at SEGMENT_MAX_BYTES. A fixed-width index file holds one entry
+  per turn, so counting turns, reading turn i, reading the last N turns
+  and appending are all O(1) in the length of the story. The index entry
+  is written after the turn's text, so a turn interrupted mid-append is
+  never visible.
+  """
+
+  def __init__(self, path: str):
+    """
+    Open a story log, creating its directory if needed.
+
+    Args:
+      path: Directory holding the segments and index
+    """
+    self.path = path
+    os.makedirs(path, exist_ok=True)
+    self.index_path = os.path.join(path, "index.bin")
+    self.lock = threading.Lock()
+    with open(self.index_path, "ab") as f:
+      # Drop a partly written index entry left by an interrupted append
+      index_size = f.tell()
+      if index_size % INDEX_ENTRY.size:
+        f.truncate(index_size - index_size % INDEX_ENTRY.size)
+
+  def get_segment_path(self, segment: int) -> str:
+    return os.path.join(self.path, f"segment-{segment:06d}.log")
+
+  def count(self) -> int:
+    """
+    Get the number of turns in the story.
+    """
+    return os.path.getsize(self.index_path) // INDEX_ENTRY.size
+
+  def get_entry(self, turn: int) -> tuple[int, int, int]:
+    with open(self.index_path, "rb") as f:
+      f.seek(turn * INDEX_ENTRY.size)
+      return INDEX_ENTRY.unpack(f.read(INDEX_ENTRY.size))
+
+  def append(self, text: str) -> int:
+    """
+    Append a turn to the story.
+
+    Args:
+      text: The text of the turn
+
+    Returns:
+      int: The number of the new turn
+    """
+    data = text.encode('utf-8')
+    with self.lock:
+      turn = self.count()
+      segment = self.get_entry(turn - 1)[0] if turn else 0
+      segment_path = self.get_segment_path(segment)
+      if os.path.exists(segment_path) and os.path.getsize(segment_path) + len(data) > SEGMENT_MAX_BYTES:
+        segment += 1
+        segment_path = self.get_segment_path(segment)
+      with open(segment_path, "ab") as f:
+        offset = f.tell()
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+      with open(self.index_path, "ab") as f:
+        f.write(INDEX_ENTRY.pack(segment, offset, len(data)))
+        f.flush()
+        os.fsync(f.fileno())
+      return turn
+
+  def read(self, turn: int) -> str:
+    """
+    Read one turn. Negative numbers count from the end, like list indexes.
+    """
+    if turn < 0:
+      turn += self.count()
+    return self.read_range(turn, turn + 1)[0]
+
+  def read_range(self, start: int, end: int) -> list[str]:
+    """
+    Read the turns from start up to but not including end.
+    """
+    end = min(end, self.count())
+    if start >= end:
+      return []
+    with open(self.index_path, "rb") as f:
+      f.seek(start * INDEX_ENTRY.size)
+      entries = list(INDEX_ENTRY.iter_unpack(f.read((end - start) * INDEX_ENTRY.size)))
+
+    turns = []
+    segment_file = None
+    open_segment = None
+    try:
+      for segment, offset, length in entries:
+        if segment != open_segment:
+          if segment_file is not None:
+            segment_file.close()
+          segment_file = open(self.get_segment_path(segment), "rb")
+          open_segment = segment
+        segment_file.seek(offset)
+        turns.append(segment_file.read(length).decode('utf-8'))
+    finally:
+      if segment_file is not None:
+        segment_file.close()
+    return turns
+
+  def tail(self, turns: int) -> list[str]:
+    """
+    Read the last turns of the story, oldest first.
+    """
+    count = self.count()
+    return self.read_range(max(0, count - turns), count)
+
+  def import_directory(self, directory: str) -> int:
+    """
+    Append every file of a one-file-per-turn story directory, in file name order.
+
+    Returns:
+      int: The number of turns imported
+    """
+    files_in_dir = sorted(os.listdir(directory))
+    for file in files_in_dir:
+      with open(os.path.join(directory, file), "r") as f:
+        self.append(f.read())
+    return len(files_in_dir)
+
+def import_story_directory(directory: str, path: str) -> int:
+  """
+  Build a new story log at path from a one-file-per-turn story directory.
+  The log is built in a temporary directory and renamed into place, so an
+  interrupted import leaves no log behind and runs again from the start.
+
+  Returns:
+    int: The number of turns imported
+  """
+  parent = os.path.dirname(os.path.abspath(path))
+  temp_path = tempfile.mkdtemp(dir=parent, prefix=".story-log-")
+  try:
+    imported = StoryLog(temp_path).import_directory(directory)
+    os.rename(temp_path, path)
+  except BaseException:
+    shutil.rmtree(temp_path, ignore_errors=True)
+    raise
+  return imported
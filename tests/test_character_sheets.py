@@ -0,0 +1,78 @@
+"""
+Tests for the compact character sheet renderer.
+"""
+
+import json
+import os
+import pytest
+import character_sheets
+from character_sheets import load_sheets, render_sheet
+
+
+@pytest.fixture(autouse=True)
+def clear_sheets():
+    character_sheets._sheets.clear()
+    yield
+    character_sheets._sheets.clear()
+
+
+def test_render_sheet():
+    sheet = {
+        'name': 'Andros', 'type': 'Human', 'class': 'Ranger', 'level': 3, 'age': 27, 'experience': 900,
+        'strength': 12, 'dexterity': 16, 'hit_points': 24, 'current_hit_points': 17, 'hit_dice': '3d10',
+        'armor_class': 14, 'speed': 30, 'skills': {'stealth': 5, 'survival': 'expert'},
+        'currency': {'gold': 12, 'silver': 0, 'copper': 4},
+        'inventory': ['arrow', 'arrow', {'name': 'longbow'}, None], 'notes': '', 'spells': [],
+    }
+    assert render_sheet(sheet) == '\n'.join([
+        'Andros: Human Ranger, level 3, age 27, XP 900',
+        'STR 12 DEX 16 HP 17/24 (3d10) AC 14 Speed 30',
+        'Skills: stealth +5, survival expert',
+        'Currency: 12 gp, 4 cp',
+        'Inventory: arrow x2, longbow',
+    ])
+
+
+def test_render_sheet_drops_empty_header_fields():
+    sheet = {'name': None, 'level': None, 'age': '', 'hit_points': None, 'armor_class': None,
+             'speed': None, 'strength': None, 'current_hit_points': None}
+    assert render_sheet(sheet) == 'Unnamed'
+    assert render_sheet({'name': 'Cat', 'hit_points': 8, 'current_hit_points': None}) == 'Cat\nHP 8/8'
+
+
+def test_render_sheet_skills():
+    sheet = {'name': 'Mira', 'skills': {'stealth': 4, 'arcana': None, 'history': '', 'insight': True, 'perception': -1}}
+    assert render_sheet(sheet) == 'Mira\nSkills: stealth +4, insight True, perception -1'
+    assert render_sheet({'name': 'Mira', 'skills': {'arcana': None}}) == 'Mira'
+
+
+def write_sheet(path, sheet, mtime_ns):
+    path.write_text(json.dumps(sheet))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_load_sheets_rereads_changed_files(tmp_path, monkeypatch):
+    write_sheet(tmp_path / 'andros.json', {'name': 'Andros'}, 1_000_000_000)
+    write_sheet(tmp_path / 'cat-girl.json', {'name': 'Mira'}, 1_000_000_000)
+    (tmp_path / 'notes.txt').write_text('Plain notes')
+    assert load_sheets(str(tmp_path)) == ['Andros', 'Mira', 'Plain notes']
+
+    rendered = []
+    render = character_sheets.render_sheet
+    monkeypatch.setattr(character_sheets, 'render_sheet', lambda sheet: rendered.append(sheet) or render(sheet))
+    assert load_sheets(str(tmp_path)) == ['Andros', 'Mira', 'Plain notes']
+    assert rendered == []
+
+    write_sheet(tmp_path / 'andros.json', {'name': 'Andros', 'level': 2}, 2_000_000_000)
+    assert load_sheets(str(tmp_path)) == ['Andros, level 2', 'Mira', 'Plain notes']
+    assert rendered == [{'name': 'Andros', 'level': 2}]
+
+
+def test_load_sheets_drops_deleted_files(tmp_path):
+    write_sheet(tmp_path / 'andros.json', {'name': 'Andros'}, 1_000_000_000)
+    write_sheet(tmp_path / 'cat-girl.json', {'name': 'Mira'}, 1_000_000_000)
+    load_sheets(str(tmp_path))
+
+    os.remove(tmp_path / 'cat-girl.json')
+    assert load_sheets(str(tmp_path)) == ['Andros']
+    assert list(character_sheets._sheets) == [str(tmp_path / 'andros.json')]
@@ -0,0 +1,101 @@
+"""
+Tests for the rolling story summary.
+"""
+
+import json
+import pytest
+import compaction
+from llm.fake import FakeProvider
+from llm.provider import set_provider
+from story_log import StoryLog
+
+
+class CountingProvider(FakeProvider):
+    def __init__(self):
+        super().__init__(first_token_seconds=0, token_seconds=0)
+        self.prompts = []
+
+    def complete(self, system_message, user_text, max_tokens=None, temperature=None, user_prefix=()):
+        self.prompts.append(user_text)
+        return super().complete(system_message, user_text, max_tokens, temperature, user_prefix)
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    monkeypatch.setattr(compaction, 'SUMMARY_PATH', str(tmp_path / 'story-summary.json'))
+    provider = CountingProvider()
+    set_provider(provider)
+    yield provider
+    set_provider(None)
+
+
+def add_turns(story_log, start, end):
+    for turn in range(start, end):
+        story_log.append(f"Turn {turn}: the party presses on.")
+
+
+def test_short_story_is_sent_verbatim(tmp_path, provider):
+    story_log = StoryLog(str(tmp_path / 'story-log'))
+    add_turns(story_log, 0, compaction.RECENT_TURNS)
+
+    summary, recent = compaction.get_story_parts(story_log)
+    assert summary == ''
+    assert recent == '\n'.join(story_log.read_range(0, compaction.RECENT_TURNS))
+    assert provider.prompts == []
+
+
+def test_summary_is_folded_every_few_turns(tmp_path, provider):
+    story_log = StoryLog(str(tmp_path / 'story-log'))
+    window = compaction.RECENT_TURNS + compaction.SUMMARY_SLACK_TURNS
+    add_turns(story_log, 0, window)
+    assert compaction.get_story_parts(story_log)[0] == ''
+    assert provider.prompts == []
+
+    # Outgrowing the window folds everything but the recent turns into the summary
+    add_turns(story_log, window, window + 1)
+    summary, recent = compaction.get_story_parts(story_log)
+    assert len(provider.prompts) == 1
+    assert 'Turn 6:' in provider.prompts[0] and 'Turn 7:' not in provider.prompts[0]
+    assert recent.startswith('What happened most recently:\nTurn 7:')
+
+    # The following turns reuse the same summary without calling the model
+    for turn in range(window + 1, window + 1 + compaction.SUMMARY_SLACK_TURNS):
+        add_turns(story_log, turn, turn + 1)
+        assert compaction.get_story_parts(story_log)[0] == summary
+    assert len(provider.prompts) == 1
+
+    # Only the turns since the last fold are sent to the model
+    add_turns(story_log, window + 1 + compaction.SUMMARY_SLACK_TURNS, window + 2 + compaction.SUMMARY_SLACK_TURNS)
+    compaction.get_story_parts(story_log)
+    assert len(provider.prompts) == 2
+    assert 'Turn 6:' not in provider.prompts[1] and 'Turn 7:' in provider.prompts[1]
+
+
+def test_summary_of_another_story_is_rebuilt(tmp_path, provider):
+    story_log = StoryLog(str(tmp_path / 'story-log'))
+    add_turns(story_log, 0, compaction.RECENT_TURNS + compaction.SUMMARY_SLACK_TURNS + 1)
+    compaction.get_story_parts(story_log)
+    with open(compaction.SUMMARY_PATH) as f:
+        saved = json.load(f)
+    assert saved['summarized_count'] == compaction.SUMMARY_SLACK_TURNS + 1
+
+    other_log = StoryLog(str(tmp_path / 'other-log'))
+    add_turns(other_log, 100, 100 + compaction.RECENT_TURNS + compaction.SUMMARY_SLACK_TURNS + 1)
+    summary, _ = compaction.get_story_parts(other_log)
+    assert 'Turn 100:' in provider.prompts[-1]
+    assert 'Turn 0:' not in provider.prompts[-1]
+    assert summary.startswith('The story so far:\n')
+
+
+def test_long_turns_fold_on_the_token_budget(tmp_path, provider, monkeypatch):
+    monkeypatch.setattr(compaction, 'RECENT_TOKEN_BUDGET', 20)
+    monkeypatch.setattr(compaction, 'SUMMARY_SLACK_TOKENS', 10)
+    story_log = StoryLog(str(tmp_path / 'story-log'))
+    add_turns(story_log, 0, 3)
+    assert compaction.get_story_parts(story_log)[0] == ''
+    assert provider.prompts == []
+
+    add_turns(story_log, 3, 4)
+    summary, recent = compaction.get_story_parts(story_log)
+    assert len(provider.prompts) == 1
+    assert recent == 'What happened most recently:\n' + '\n'.join(story_log.tail(2))
@@ -0,0 +1,53 @@
+"""
+Tests for the DM prompt.
+"""
+
+import pytest
+import compaction
+import dm
+from llm.fake import FakeProvider
+from llm.provider import set_provider
+from story_log import StoryLog
+
+
+class RecordingProvider(FakeProvider):
+    def __init__(self):
+        super().__init__(first_token_seconds=0, token_seconds=0)
+        self.user_prefixes = []
+
+    def stream(self, system_message, user_text, max_tokens=None, temperature=None, user_prefix=()):
+        if system_message == dm.get_system_message():
+            self.user_prefixes.append(list(user_prefix))
+        return super().stream(system_message, user_text, max_tokens, temperature, user_prefix)
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    monkeypatch.setattr(compaction, 'SUMMARY_PATH', str(tmp_path / 'story-summary.json'))
+    provider = RecordingProvider()
+    set_provider(provider)
+    yield provider
+    set_provider(None)
+
+
+def take_turn(story_log):
+    story_summary, recent_story = compaction.get_story_parts(story_log)
+    story_log.append(''.join(dm.stream_next('Andros: Human Ranger', recent_story, story_summary)))
+
+
+def test_cached_prefix_is_stable_between_summary_folds(tmp_path, provider):
+    story_log = StoryLog(str(tmp_path / 'story-log'))
+    for turn in range(compaction.RECENT_TURNS + compaction.SUMMARY_SLACK_TURNS + 1):
+        story_log.append(f"Turn {turn}: the party presses on.")
+
+    for _ in range(compaction.SUMMARY_SLACK_TURNS + 1):
+        take_turn(story_log)
+
+    prefixes = provider.user_prefixes
+    assert prefixes[0][0] == 'Andros: Human Ranger'
+    assert prefixes[0][1].startswith('The story so far:\n')
+    assert all(prefix == prefixes[0] for prefix in prefixes)
+
+    take_turn(story_log)
+    assert prefixes[-1][0] == prefixes[0][0]
+    assert prefixes[-1][1] != prefixes[0][1]
@@ -0,0 +1,86 @@
+"""
+Tests for the interactive game session.
+"""
+
+import importlib.util
+import os
+import pytest
+import compaction
+import context
+from llm.fake import FakeProvider
+from llm.provider import set_provider
+
+# dm puts webapi, which has its own main module, ahead of the repository on the path
+MAIN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+main_spec = importlib.util.spec_from_file_location('game_main', MAIN_PATH)
+main = importlib.util.module_from_spec(main_spec)
+main_spec.loader.exec_module(main)
+
+
+class FlakyProvider(FakeProvider):
+    def __init__(self, failures=0):
+        super().__init__(first_token_seconds=0, token_seconds=0)
+        self.failures = failures
+        self.user_texts = []
+
+    def stream(self, system_message, user_text, max_tokens=None, temperature=None, user_prefix=()):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('model unreachable')
+        self.user_texts.append(user_text)
+        return super().stream(system_message, user_text, max_tokens, temperature, user_prefix)
+
+
+@pytest.fixture
+def game(tmp_path, monkeypatch):
+    characters_dir = tmp_path / 'human-characters'
+    characters_dir.mkdir()
+    (characters_dir / 'andros.json').write_text('{"name": "Andros"}')
+    monkeypatch.setattr(context, 'HUMAN_CHARACTERS_DIR', str(characters_dir))
+    monkeypatch.setattr(context, 'STORY_DIR', str(tmp_path / 'story'))
+    monkeypatch.setattr(context, 'STORY_LOG_DIR', str(tmp_path / 'story-log'))
+    monkeypatch.setattr(context, '_story_log', None)
+    monkeypatch.setattr(compaction, 'SUMMARY_PATH', str(tmp_path / 'story-summary.json'))
+    yield
+    set_provider(None)
+
+
+def play(monkeypatch, inputs, provider=None):
+    provider = provider or FlakyProvider()
+    set_provider(provider)
+    inputs = iter(inputs)
+
+    def fake_input(prompt):
+        try:
+            return next(inputs)
+        except StopIteration:
+            raise EOFError
+
+    monkeypatch.setattr('builtins.input', fake_input)
+    main.session()
+    return context.get_story()
+
+
+def test_session_saves_players_and_dm_turns(game, monkeypatch, capsys):
+    story = play(monkeypatch, ['The party enters the tavern.', ''])
+
+    assert len(story) == 3
+    assert story[0] == 'The players: The party enters the tavern.'
+    assert story[1] in capsys.readouterr().out
+    assert story[2] != story[1]
+
+
+@pytest.mark.parametrize('inputs', [['quit', 'The party enters the tavern.'], ['EXIT', 'The party enters the tavern.'], []])
+def test_session_ends_on_quit_or_eof(game, monkeypatch, inputs):
+    assert play(monkeypatch, inputs) == []
+
+
+def test_failed_turn_is_reported_and_not_saved(game, monkeypatch, capsys):
+    provider = FlakyProvider(failures=1)
+    story = play(monkeypatch, ['Roll for initiative', 'Roll again'], provider)
+
+    assert "couldn't take this turn" in capsys.readouterr().out
+    assert len(story) == 2
+    assert story[0] == 'The players: Roll again'
+    assert 'Roll for initiative' not in provider.user_texts[0]
+    assert 'The players: Roll again' in provider.user_texts[0]
@@ -0,0 +1,73 @@
+"""
+Tests for the append-only story log.
+"""
+
+import os
+import pytest
+import story_log
+from story_log import INDEX_ENTRY, StoryLog, import_story_directory
+
+
+def test_append_and_read(tmp_path):
+    log = StoryLog(str(tmp_path / 'story-log'))
+    assert log.count() == 0
+    assert log.tail(3) == []
+
+    for turn in range(5):
+        assert log.append(f"Turn {turn} ✨") == turn
+
+    assert log.count() == 5
+    assert log.read(0) == "Turn 0 ✨"
+    assert log.read(-1) == "Turn 4 ✨"
+    assert log.tail(2) == ["Turn 3 ✨", "Turn 4 ✨"]
+    assert log.read_range(3, 10) == ["Turn 3 ✨", "Turn 4 ✨"]
+    assert StoryLog(str(tmp_path / 'story-log')).tail(10) == [f"Turn {turn} ✨" for turn in range(5)]
+
+
+def test_read_range_across_segments(tmp_path, monkeypatch):
+    monkeypatch.setattr(story_log, 'SEGMENT_MAX_BYTES', 20)
+    log = StoryLog(str(tmp_path / 'story-log'))
+    turns = [f"Turn number {turn}" for turn in range(6)]
+    for turn in turns:
+        log.append(turn)
+
+    assert len([name for name in os.listdir(log.path) if name.startswith('segment-')]) == 6
+    assert log.read_range(1, 5) == turns[1:5]
+    assert log.tail(6) == turns
+
+
+def test_torn_index_entry_is_dropped(tmp_path):
+    log = StoryLog(str(tmp_path / 'story-log'))
+    log.append("The party rests.")
+    log.append("Wolves howl.")
+    with open(log.index_path, "ab") as f:
+        f.write(INDEX_ENTRY.pack(0, 0, 5)[:7])
+
+    log = StoryLog(str(tmp_path / 'story-log'))
+    assert log.count() == 2
+    assert os.path.getsize(log.index_path) == 2 * INDEX_ENTRY.size
+    assert log.append("Dawn breaks.") == 2
+    assert log.tail(3) == ["The party rests.", "Wolves howl.", "Dawn breaks."]
+
+
+def test_import_story_directory(tmp_path):
+    story_dir = tmp_path / 'story'
+    story_dir.mkdir()
+    for turn in range(3):
+        (story_dir / f"{turn:04d}.txt").write_text(f"Turn {turn}")
+
+    assert import_story_directory(str(story_dir), str(tmp_path / 'story-log')) == 3
+    assert StoryLog(str(tmp_path / 'story-log')).tail(3) == ["Turn 0", "Turn 1", "Turn 2"]
+    assert sorted(os.listdir(tmp_path)) == ['story', 'story-log']
+
+
+def test_interrupted_import_leaves_no_log(tmp_path):
+    story_dir = tmp_path / 'story'
+    story_dir.mkdir()
+    (story_dir / "0000.txt").write_text("Turn 0")
+    # A directory can't be read as a turn, so the import fails partway
+    (story_dir / "0001.txt").mkdir()
+
+    with pytest.raises(OSError):
+        import_story_directory(str(story_dir), str(tmp_path / 'story-log'))
+    assert sorted(os.listdir(tmp_path)) == ['story']
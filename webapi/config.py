@@ -1,3 +1,64 @@
-BEDROCK_MODEL_ID='anthropic.claude-3-7-sonnet-20250219-v1:0'
+import os
+
 GAME_ID = 'apc-5oac4jdjaieq2a5-rc'
 DM_PLAYER_ID = 'apc-master-player-apc'
+
+AWS_REGION = 'us-west-2'
+AWS_MAX_POOL_CONNECTIONS = 25
+AWS_CONNECT_TIMEOUT = 5
+AWS_READ_TIMEOUT = 30
+
+# Model provider for the DM and the NPC and monster roles: 'bedrock', 'ollama' or 'fake'
+LLM_PROVIDER = os.environ.get('LLM_PROVIDER', 'bedrock')
+LLM_MAX_TOKENS = int(os.environ.get('LLM_MAX_TOKENS', 4096))
+LLM_TEMPERATURE = float(os.environ.get('LLM_TEMPERATURE', 0.5))
+BEDROCK_MODEL_ID = os.environ.get('BEDROCK_MODEL_ID', 'anthropic.claude-3-7-sonnet-20250219-v1:0')
+# Model responses take far longer than datastore reads
+BEDROCK_READ_TIMEOUT = 300
+# Cache the system prompt and the stable start of each prompt, such as the
+# character sheets and the story summary, between Bedrock requests
+BEDROCK_PROMPT_CACHING = os.environ.get('BEDROCK_PROMPT_CACHING', 'true').lower() == 'true'
+OLLAMA_MODEL = os.environ.get('OLLAMA_MODEL', 'llama3')
+# Simulated latency of the offline fake provider, before the first token and between tokens
+LLM_FAKE_FIRST_TOKEN_SECONDS = float(os.environ.get('LLM_FAKE_FIRST_TOKEN_SECONDS', 0.2))
+LLM_FAKE_TOKEN_SECONDS = float(os.environ.get('LLM_FAKE_TOKEN_SECONDS', 0.01))
+# Response cache for repeated identical model requests: comma separated tiers,
+# fastest first, from 'memory', 'disk' and 'datastore', or empty to disable it
+LLM_CACHE_TIERS = os.environ.get('LLM_CACHE_TIERS', 'memory')
+LLM_CACHE_MAX_ENTRIES = 256
+LLM_CACHE_TTL_SECONDS = int(os.environ.get('LLM_CACHE_TTL_SECONDS', 3600))
+LLM_CACHE_DIR = os.environ.get('LLM_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.llm-cache'))
+
+# Storage engine for the datastore: 's3' or 'local'
+DATASTORE_BACKEND = os.environ.get('DATASTORE_BACKEND', 's3')
+DATASTORE_BUCKET = 'dungeon-master-data'
+DATASTORE_LOCAL_ROOT = os.environ.get('DATASTORE_LOCAL_ROOT', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.datastore'))
+# Locks the local engine stripes conditional writes across, keys sharing a lock are serialized together
+DATASTORE_LOCAL_LOCK_STRIPES = 64
+
+# In-process read-through cache under BaseDatastore.get_data, 0 entries disables it
+DATASTORE_CACHE_MAX_ENTRIES = 512
+# Cache TTLs in seconds, matched against the table name and then the database name
+DATASTORE_CACHE_TTL_SECONDS = {
+    'game-data': 30,
+    'player-data': 30,
+    'dnd-5e-srd-2014*': 3600,
+    'default': 5,
+}
+
+# Build the datastore clients while the Lambda initializes, before the first request
+LAMBDA_PREWARM = 'AWS_LAMBDA_FUNCTION_NAME' in os.environ
+
+# Keys remembered as missing, e.g. SRD paths the API returned 404 for, and for how long
+DATASTORE_MISSING_CACHE_MAX_ENTRIES = 1024
+DND_5E_SRD_MISSING_TTL_SECONDS = 600
+
+# Attempts for an upsert that loses a compare-and-swap race before giving up
+DATASTORE_UPSERT_RETRIES = 3
+
+# Offline D&D 5e SRD snapshot, built with `python -m data.dnd_5e_srd.snapshot` and served before the datastore
+DND_5E_SRD_SNAPSHOT_PATH = os.environ.get('DND_5E_SRD_SNAPSHOT_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'dnd_5e_srd', 'srd-2014.snapshot'))
+
+# Concurrent fetches and fetches per second when crawling the D&D 5e API
+DND_5E_SRD_CRAWL_WORKERS = 8
+DND_5E_SRD_CRAWL_RATE = 20
@@ -1,34 +1,41 @@
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple, Callable
+from config import DATASTORE_UPSERT_RETRIES
+from data.cache import datastore_cache
 from data.datastore import Datastore
+from data.merge_patch import apply_merge_patch
+from data.storage import WriteConflictError
 
 
 class BaseData:
     """
-    A base data class representing data with a last_updated timestamp.
+    A base data class representing data with a last_updated timestamp and version number.
     """
     
-    def __init__(self, data: Dict[str, Any] = None, last_updated: Optional[str] = None):
+    def __init__(self, data: Dict[str, Any] = None, last_updated: Optional[str] = None, version: int = 0):
         """
-        Initialize BaseData with optional data and last_updated timestamp.
+        Initialize BaseData with optional data, last_updated timestamp and version.
         
         Args:
             data: Dictionary containing the data
             last_updated: ISO format timestamp string, defaults to current time
+            version: Number of times the data has been written, 0 if never stored
         """
         self.data = data or {}
         self.last_updated = last_updated or datetime.now(timezone.utc).isoformat()
+        self.version = version
     
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert BaseData to a dictionary for storage.
         
         Returns:
-            Dict containing the data and last_updated timestamp
+            Dict containing the data, last_updated timestamp and version
         """
         return {
             'data': self.data,
-            'last_updated': self.last_updated
+            'last_updated': self.last_updated,
+            'version': self.version
         }
     
     @classmethod
@@ -37,14 +44,15 @@ class BaseData:
         Create BaseData from a dictionary.
         
         Args:
-            data_dict: Dictionary containing data and last_updated
+            data_dict: Dictionary containing data, last_updated and version
             
         Returns:
             BaseData instance
         """
         return cls(
             data=data_dict.get('data', {}),
-            last_updated=data_dict.get('last_updated')
+            last_updated=data_dict.get('last_updated'),
+            version=data_dict.get('version', 0)
         )
 
 
@@ -64,49 +72,302 @@ class BaseDatastore:
         """
         self.entity_id = entity_id
         self.datastore = Datastore(database, table, entity_id)
+        self.written_version: Optional[int] = None
     
-    def upsert_data(self, data_obj: BaseData) -> bool:
+    def upsert_data(self, data_obj: BaseData, expected_version: Optional[int] = None) -> bool:
         """
         Upsert (insert or update) data to the data store.
-        The last_updated property is automatically set to the current time.
+        The last_updated property is automatically set to the current time and
+        the version to one more than the stored version.
+        
+        Every write is a compare-and-swap against the stored object's ETag, so
+        concurrent writers never silently overwrite each other. Without an
+        expected_version, the write builds on the cached copy when there is
+        one instead of reading the object first, and a write that loses a race
+        is retried on top of the newer version. With an expected_version, the
+        write only happens if the stored version still matches.
+        The stored version is kept in written_version.
         
         Args:
             data_obj: BaseData object to store
+            expected_version: Only write if the stored version still matches
+            
+        Returns:
+            bool: True if successful, False otherwise
+            
+        Raises:
+            WriteConflictError: If the stored version doesn't match expected_version,
+            or the write kept losing races with other writers
+        """
+        return self._write_data(lambda current_dict: data_obj, expected_version)
+    
+    def _write_data(self, build_data: Callable[[Optional[Dict[str, Any]]], BaseData],
+                    expected_version: Optional[int] = None) -> bool:
+        """
+        Write data with a compare-and-swap against the stored object's ETag,
+        retrying on top of the newer object when another writer wins the race.
+        
+        Args:
+            build_data: Builds the BaseData to store from the currently stored dictionary
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
+            
+        Raises:
+            WriteConflictError: If the stored version doesn't match expected_version,
+            or the write kept losing races with other writers
+        """
+        key = self.datastore.get_s3_key()
+        cached_dict, cached_etag = self._get_cached_write_base(key, expected_version)
+        for attempt in range(DATASTORE_UPSERT_RETRIES):
+            if attempt == 0 and cached_etag:
+                current_dict, etag = cached_dict, cached_etag
+            else:
+                current_dict, etag = self._fetch_data_dict(key)
+            data_dict = self._build_write(key, current_dict, build_data, expected_version)
+            try:
+                if etag:
+                    success = self.datastore.upsert(data_dict, if_match=etag)
+                else:
+                    success = self.datastore.upsert(data_dict, if_none_match='*')
+            except WriteConflictError:
+                datastore_cache.invalidate(key)
+                continue
+
+            datastore_cache.invalidate(key)
+            self.written_version = data_dict['version'] if success else None
+            return success
+
+        raise WriteConflictError(f"Too many concurrent writes for {key}")
+    
+    async def _awrite_data(self, build_data: Callable[[Optional[Dict[str, Any]]], BaseData],
+                           expected_version: Optional[int] = None) -> bool:
+        """
+        Coroutine version of _write_data.
+        """
+        key = self.datastore.get_s3_key()
+        cached_dict, cached_etag = self._get_cached_write_base(key, expected_version)
+        for attempt in range(DATASTORE_UPSERT_RETRIES):
+            if attempt == 0 and cached_etag:
+                current_dict, etag = cached_dict, cached_etag
+            else:
+                current_dict, etag = await self._afetch_data_dict(key)
+            data_dict = self._build_write(key, current_dict, build_data, expected_version)
+            try:
+                if etag:
+                    success = await self.datastore.aupsert(data_dict, if_match=etag)
+                else:
+                    success = await self.datastore.aupsert(data_dict, if_none_match='*')
+            except WriteConflictError:
+                datastore_cache.invalidate(key)
+                continue
+
+            datastore_cache.invalidate(key)
+            self.written_version = data_dict['version'] if success else None
+            return success
+
+        raise WriteConflictError(f"Too many concurrent writes for {key}")
+    
+    def _get_cached_write_base(self, key: str, expected_version: Optional[int]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Get the cached copy of the stored dictionary and its ETag for a write without an
+        expected_version to build on, so the write can skip reading the object first.
+        A stale copy only costs a retry, since the write is conditioned on its ETag.
+        A write with an expected_version always reads the stored version.
+        """
+        if expected_version is not None:
+            return None, None
+        return datastore_cache.get_entry(key)
+    
+    def _build_write(self, key: str, current_dict: Optional[Dict[str, Any]],
+                     build_data: Callable[[Optional[Dict[str, Any]]], BaseData],
+                     expected_version: Optional[int]) -> Dict[str, Any]:
+        """
+        Build the dictionary to write on top of the currently stored dictionary.
+        
+        Raises:
+            WriteConflictError: If the stored version doesn't match expected_version
         """
+        current_version = current_dict.get('version', 0) if current_dict else 0
+        if expected_version is not None and expected_version != current_version:
+            raise WriteConflictError(
+                f"Version conflict for {key}: expected {expected_version}, found {current_version}",
+                current_version
+            )
+
+        data_obj = build_data(current_dict)
+        data_obj.version = current_version + 1
         data_obj.last_updated = datetime.now(timezone.utc).isoformat()
-        data_dict = data_obj.to_dict()
-        return self.datastore.upsert(data_dict)
+        return data_obj.to_dict()
     
-    def upsert_data_dict(self, data: Dict[str, Any]) -> bool:
+    def upsert_data_dict(self, data: Dict[str, Any], expected_version: Optional[int] = None) -> bool:
         """
         Convenience method to upsert data directly from a dictionary.
         Creates a new BaseData object and sets last_updated automatically.
         
         Args:
             data: Dictionary containing the data
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
         data_obj = BaseData(data=data)
-        return self.upsert_data(data_obj)
+        return self.upsert_data(data_obj, expected_version)
+    
+    async def aupsert_data(self, data_obj: BaseData, expected_version: Optional[int] = None) -> bool:
+        """
+        Coroutine version of upsert_data.
+        
+        Args:
+            data_obj: BaseData object to store
+            expected_version: Only write if the stored version still matches
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return await self._awrite_data(lambda current_dict: data_obj, expected_version)
+    
+    async def aupsert_data_dict(self, data: Dict[str, Any], expected_version: Optional[int] = None) -> bool:
+        """
+        Coroutine version of upsert_data_dict.
+        
+        Args:
+            data: Dictionary containing the data
+            expected_version: Only write if the stored version still matches
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return await self.aupsert_data(BaseData(data=data), expected_version)
+    
+    def patch_data_dict(self, patch: Dict[str, Any], expected_version: Optional[int] = None) -> bool:
+        """
+        Apply a JSON Merge Patch (RFC 7386) to the stored data.
+        The patch is applied on top of the latest stored data, so concurrent
+        patches to different fields don't overwrite each other.
+        
+        Args:
+            patch: The merge patch to apply to the data dictionary
+            expected_version: Only write if the stored version still matches
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return self._write_data(self._merge_patch_builder(patch), expected_version)
+    
+    async def apatch_data_dict(self, patch: Dict[str, Any], expected_version: Optional[int] = None) -> bool:
+        """
+        Coroutine version of patch_data_dict.
+        
+        Args:
+            patch: The merge patch to apply to the data dictionary
+            expected_version: Only write if the stored version still matches
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return await self._awrite_data(self._merge_patch_builder(patch), expected_version)
+    
+    @staticmethod
+    def _merge_patch_builder(patch: Dict[str, Any]) -> Callable[[Optional[Dict[str, Any]]], BaseData]:
+        """
+        Build a write callback that applies a merge patch to the stored data.
+        """
+        def build_data(current_dict: Optional[Dict[str, Any]]) -> BaseData:
+            current_data = current_dict.get('data', {}) if current_dict else {}
+            return BaseData(data=apply_merge_patch(current_data, patch))
+
+        return build_data
     
     def get_data(self) -> Optional[BaseData]:
         """
         Retrieve data from the data store.
+        Reads are served from the in-process cache while the entry is fresh.
+        Expired entries are revalidated by ETag, so unchanged objects are not downloaded again.
+        
+        Returns:
+            Optional[BaseData]: The retrieved data, or None if not found
+        """
+        key = self.datastore.get_s3_key()
+        data_dict = datastore_cache.get(key)
+        if data_dict is None:
+            data_dict, _ = self._fetch_data_dict(key)
+
+        if data_dict is None:
+            return BaseData().from_dict({})
+        
+        return BaseData.from_dict(data_dict)
+    
+    async def aget_data(self) -> Optional[BaseData]:
+        """
+        Coroutine version of get_data, reading through the non-blocking datastore client.
         
         Returns:
             Optional[BaseData]: The retrieved data, or None if not found
         """
-        data_dict = self.datastore.get()
+        key = self.datastore.get_s3_key()
+        data_dict = datastore_cache.get(key)
+        if data_dict is None:
+            data_dict, _ = await self._afetch_data_dict(key)
+
         if data_dict is None:
             return BaseData().from_dict({})
         
         return BaseData.from_dict(data_dict)
     
+    async def aget_data_dict(self) -> Dict[str, Any]:
+        """
+        Coroutine version of get_data_dict.
+        
+        Returns:
+            Dict: The data dictionary
+        """
+        data_obj = await self.aget_data()
+        return data_obj.data
+    
+    def _fetch_data_dict(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Read data from the data store, sending the cached ETag so an unchanged
+        object is served from the cache, and store the result in the cache.
+        
+        Args:
+            key: The S3 key of the object
+            
+        Returns:
+            Tuple of the stored dictionary and its ETag, or None for both if not found
+        """
+        ttl = datastore_cache.get_ttl(self.datastore.database, self.datastore.table)
+        cached_etag = datastore_cache.get_etag(key)
+        data_dict, etag = self.datastore.get_with_etag(cached_etag)
+        if data_dict is None and etag is not None and etag == cached_etag:
+            data_dict = datastore_cache.revalidate(key, etag, ttl)
+            if data_dict is not None:
+                return data_dict, etag
+            data_dict, etag = self.datastore.get_with_etag()
+
+        if data_dict is not None:
+            datastore_cache.set(key, data_dict, ttl, etag)
+        return data_dict, etag
+    
+    async def _afetch_data_dict(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Coroutine version of _fetch_data_dict.
+        """
+        ttl = datastore_cache.get_ttl(self.datastore.database, self.datastore.table)
+        cached_etag = datastore_cache.get_etag(key)
+        data_dict, etag = await self.datastore.aget_with_etag(cached_etag)
+        if data_dict is None and etag is not None and etag == cached_etag:
+            data_dict = datastore_cache.revalidate(key, etag, ttl)
+            if data_dict is not None:
+                return data_dict, etag
+            data_dict, etag = await self.datastore.aget_with_etag()
+
+        if data_dict is not None:
+            datastore_cache.set(key, data_dict, ttl, etag)
+        return data_dict, etag
+    
     def get_data_dict(self) -> Dict[str, Any]:
         """
         Convenience method to get data as a dictionary.
@@ -136,4 +397,6 @@ class BaseDatastore:
         Returns:
             bool: True if successful, False otherwise
         """
-        return self.datastore.delete()
+        success = self.datastore.delete()
+        datastore_cache.invalidate(self.datastore.get_s3_key())
+        return success
@@ -0,0 +1,264 @@
+import copy
+import fnmatch
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+from config import DATASTORE_CACHE_MAX_ENTRIES, DATASTORE_CACHE_TTL_SECONDS, DATASTORE_MISSING_CACHE_MAX_ENTRIES
+
+
+class DatastoreCache:
+    """
+    A bounded, thread-safe LRU cache of datastore objects with per-table TTLs.
+
+    Entries are keyed by the object's S3 key. Values are deep copied on the
+    way in and out so callers can never mutate a cached object. Expired
+    entries are kept, along with the object's ETag, until evicted so they can
+    be revalidated with a conditional GET instead of downloaded again.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: Dict[str, float]):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached objects, 0 disables the cache
+            ttl_seconds: TTLs keyed by table or database name pattern, with a 'default' entry
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revalidations = 0
+
+    def get_ttl(self, database: str, table: str) -> float:
+        """
+        Get the TTL for objects in a table. The table name is matched first,
+        then the database name, then the default.
+
+        Args:
+            database: The datastore database name
+            table: The datastore table name
+
+        Returns:
+            float: The TTL in seconds
+        """
+        for name in (table, database):
+            for pattern, ttl in self.ttl_seconds.items():
+                if pattern != 'default' and fnmatch.fnmatchcase(name, pattern):
+                    return ttl
+        return self.ttl_seconds.get('default', 0)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached object if present and not expired.
+
+        Args:
+            key: The S3 key of the object
+
+        Returns:
+            Optional[Dict]: A copy of the cached object, or None on a miss
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[2] <= time.monotonic():
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            value = entry[0]
+        return copy.deepcopy(value)
+
+    def get_etag(self, key: str) -> Optional[str]:
+        """
+        Get the ETag of a cached object, whether or not it has expired.
+
+        Args:
+            key: The S3 key of the object
+
+        Returns:
+            Optional[str]: The ETag, or None if the object is not cached
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry[1] if entry else None
+
+    def get_entry(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Get a cached object and its ETag, whether or not it has expired.
+        Only objects with an ETag are returned, so a write can be conditioned on it.
+
+        Args:
+            key: The S3 key of the object
+
+        Returns:
+            Tuple of a copy of the cached object and its ETag, or (None, None) if not cached
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or not entry[1]:
+                return None, None
+            value, etag = entry[0], entry[1]
+        return copy.deepcopy(value), etag
+
+    def revalidate(self, key: str, etag: str, ttl: float) -> Optional[Dict[str, Any]]:
+        """
+        Renew an expired object after the datastore confirmed it is unchanged.
+
+        Args:
+            key: The S3 key of the object
+            etag: The ETag the datastore confirmed
+            ttl: Seconds until the entry expires again
+
+        Returns:
+            Optional[Dict]: A copy of the cached object, or None if it is no longer cached
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[1] != etag:
+                return None
+            self.entries[key] = (entry[0], etag, time.monotonic() + ttl)
+            self.entries.move_to_end(key)
+            self.revalidations += 1
+            value = entry[0]
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Dict[str, Any], ttl: float, etag: Optional[str] = None):
+        """
+        Cache an object, evicting the least recently used entries when full.
+        Objects with an ETag are kept after they expire so they can be revalidated.
+
+        Args:
+            key: The S3 key of the object
+            value: The object to cache
+            ttl: Seconds until the entry expires
+            etag: The ETag of the object in the datastore
+        """
+        if self.max_entries <= 0 or (ttl <= 0 and not etag):
+            return
+        value = copy.deepcopy(value)
+        with self.lock:
+            self.entries[key] = (value, etag, time.monotonic() + ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: str):
+        """
+        Remove an object from the cache.
+
+        Args:
+            key: The S3 key of the object
+        """
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        """
+        Remove every object from the cache and reset the counters.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.revalidations = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+
+        Returns:
+            Dict containing hits, misses, revalidations, evictions and the current size
+        """
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+                'evictions': self.evictions,
+                'size': len(self.entries),
+            }
+
+
+class MissingCache:
+    """
+    A bounded, thread-safe LRU cache of keys known not to exist, each
+    remembered until its TTL runs out, so repeated lookups of a missing
+    object don't go back to the datastore or upstream API every time.
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of remembered keys, 0 disables the cache
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+
+    def is_missing(self, key: str) -> bool:
+        """
+        Check if a key was recently found missing.
+
+        Args:
+            key: The key of the object
+
+        Returns:
+            bool: True if the key is known to be missing
+        """
+        with self.lock:
+            expires_at = self.entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return False
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True
+
+    def set_missing(self, key: str, ttl: float):
+        """
+        Remember that a key is missing, evicting the least recently used keys when full.
+
+        Args:
+            key: The key of the object
+            ttl: Seconds to remember the key
+        """
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+        with self.lock:
+            self.entries[key] = time.monotonic() + ttl
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key: str):
+        """
+        Forget that a key is missing.
+
+        Args:
+            key: The key of the object
+        """
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        """
+        Forget every missing key and reset the counter.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+
+
+datastore_cache = DatastoreCache(DATASTORE_CACHE_MAX_ENTRIES, DATASTORE_CACHE_TTL_SECONDS)
+missing_cache = MissingCache(DATASTORE_MISSING_CACHE_MAX_ENTRIES)
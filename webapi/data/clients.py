@@ -0,0 +1,115 @@
+import asyncio
+import threading
+from contextlib import AsyncExitStack
+from config import AWS_REGION, AWS_MAX_POOL_CONNECTIONS, AWS_CONNECT_TIMEOUT, AWS_READ_TIMEOUT
+
+_clients = {}
+_clients_lock = threading.Lock()
+_async_clients = {}
+_async_exit_stacks = {}
+
+
+def get_client(service_name: str, region_name: str = AWS_REGION, read_timeout: int = AWS_READ_TIMEOUT):
+    """
+    Get a process-wide boto3 client for a service and region.
+
+    Clients are built once and reused by every caller in the process, so warm
+    Lambda invocations keep the same connection pool instead of paying the
+    client construction cost on every Datastore instance.
+
+    Args:
+        service_name: The AWS service name (e.g., 's3', 'bedrock-runtime')
+        region_name: The AWS region for the client
+        read_timeout: Seconds to wait for response data, longer for model inference
+
+    Returns:
+        The shared boto3 client
+    """
+    key = (service_name, region_name, read_timeout)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            # boto3 is imported on first use so it loads with the first client,
+            # inside the init pre-warm, rather than with every module that imports this one
+            import boto3
+            from botocore.config import Config
+            client = boto3.client(
+                service_name,
+                region_name=region_name,
+                config=Config(
+                    max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+                    connect_timeout=AWS_CONNECT_TIMEOUT,
+                    read_timeout=read_timeout,
+                    tcp_keepalive=True,
+                )
+            )
+            _clients[key] = client
+    return client
+
+
+def clear_clients():
+    """
+    Drop every cached client. The next get_client call builds a new one.
+    """
+    with _clients_lock:
+        _clients.clear()
+
+
+async def get_async_client(service_name: str, region_name: str = AWS_REGION):
+    """
+    Get a non-blocking aiobotocore client for a service and region, bound to the running event loop.
+
+    Clients are built once per event loop and reused, so every coroutine on
+    the loop shares one connection pool.
+
+    Args:
+        service_name: The AWS service name (e.g., 's3')
+        region_name: The AWS region for the client
+
+    Returns:
+        The shared aiobotocore client, or None if aiobotocore is not installed
+    """
+    # aiobotocore is imported on first use, like boto3 in get_client, so it stays out of the cold start import graph
+    try:
+        import aiobotocore.session
+    except ImportError:
+        return None
+
+    loop = asyncio.get_running_loop()
+    key = (loop, service_name, region_name)
+    client_future = _async_clients.get(key)
+    if client_future is None:
+        client_future = loop.create_task(_create_async_client(loop, service_name, region_name))
+        _async_clients[key] = client_future
+    return await client_future
+
+
+async def _create_async_client(loop, service_name: str, region_name: str):
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import get_session
+    exit_stack = _async_exit_stacks.setdefault(loop, AsyncExitStack())
+    return await exit_stack.enter_async_context(get_session().create_client(
+        service_name,
+        region_name=region_name,
+        config=AioConfig(
+            max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+            connect_timeout=AWS_CONNECT_TIMEOUT,
+            read_timeout=AWS_READ_TIMEOUT,
+        )
+    ))
+
+
+async def close_async_clients():
+    """
+    Close every async client bound to the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _async_clients if key[0] is loop]:
+        del _async_clients[key]
+    exit_stack = _async_exit_stacks.pop(loop, None)
+    if exit_stack is not None:
+        await exit_stack.aclose()
@@ -1,31 +1,28 @@
 import json
 import re
-import boto3
-from botocore.exceptions import ClientError
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+from data.storage import StorageBackend, get_backend
 
-bucket_name = 'dungeon-master-data'
-aws_region = 'us-west-2'
 
 class Datastore:
     """
-    A datastore class that handles upsert and get requests with S3 backing.
+    A datastore class that handles upsert and get requests with a pluggable storage backing.
     
-    Objects are stored in S3 at the path: /datastore/{database}/{table}/{id}/data.json
+    Objects are stored at the path: datastore/{database}/{table}/{id}/data.json
     where database, table, and id are provided during class initialization.
+    The storage engine (S3 or local disk) is selected by DATASTORE_BACKEND in config.py.
     """
     
-    def __init__(self, database: str, table: str, id: str):
+    def __init__(self, database: str, table: str, id: str, backend: Optional[StorageBackend] = None):
         """
-        Initialize the Datastore with S3 configuration and object path.
+        Initialize the Datastore with the storage engine and object path.
         
         Args:
             database: The database name for the object path
             table: The table name for the object path
             id: The object ID for the object path
+            backend: The storage engine to use, defaults to the one configured in config.py
         """
-        self.bucket_name = bucket_name
-
         if not re.match(r'^[a-z0-9-]+$', database):
             raise ValueError(f"Database name must contain only lowercase letters, numbers, and hyphens: {database}")
         self.database = database
@@ -40,101 +37,135 @@ class Datastore:
         
         self.s3_key = f"datastore/{database}/{table}/{id}/data.json"
         
-        self.s3_client = boto3.client('s3', region_name=aws_region)
+        self.backend = backend or get_backend()
     
-    def upsert(self, data: Dict[str, Any]) -> bool:
+    def upsert(self, data: Dict[str, Any], if_match: Optional[str] = None, if_none_match: Optional[str] = None) -> bool:
         """
-        Upsert (insert or update) data to the S3 object.
+        Upsert (insert or update) data to the stored object.
         
         Args:
             data: Dictionary containing the data to store
+            if_match: Only write if the stored object still has this ETag
+            if_none_match: '*' to only write if the object doesn't exist yet
             
         Returns:
             bool: True if successful, False otherwise
+            
+        Raises:
+            WriteConflictError: If a write condition is not met
         """
         try:
             json_data = json.dumps(data, indent=2, default=str)
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=self.s3_key,
-                Body=json_data,
-                ContentType='application/json'
-            )
-            return True
-            
-        except ClientError as e:
-            print(f"Error upserting data to S3: {e}")
-            return False
         except Exception as e:
-            print(f"Unexpected error during upsert: {e}")
+            print(f"Unexpected error during upsert {self.s3_key}: {e}")
             return False
+        return self.backend.put(self.s3_key, json_data.encode('utf-8'), if_match=if_match, if_none_match=if_none_match)
     
     def get(self) -> Optional[Dict[str, Any]]:
         """
-        Retrieve data from the S3 object.
+        Retrieve data from the stored object.
         
         Returns:
             Optional[Dict[str, Any]]: The retrieved data as a dictionary, 
             or None if the object doesn't exist or an error occurs
         """
+        data, _ = self.get_with_etag()
+        return data
+
+    def get_with_etag(self, if_none_match: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Retrieve data and its ETag from the stored object.
+        When if_none_match still matches, the object is not transferred or parsed.
+        
+        Args:
+            if_none_match: The ETag of a previously retrieved copy of the data
+            
+        Returns:
+            Tuple of the retrieved data and its ETag. The data is None with an
+            ETag when the object is unchanged, and both are None if the object
+            doesn't exist or an error occurs.
+        """
+        body, etag = self.backend.get_with_etag(self.s3_key, if_none_match)
+        return self._parse(body, etag)
+    
+    async def aupsert(self, data: Dict[str, Any], if_match: Optional[str] = None, if_none_match: Optional[str] = None) -> bool:
+        """
+        Coroutine version of upsert.
+        
+        Args:
+            data: Dictionary containing the data to store
+            if_match: Only write if the stored object still has this ETag
+            if_none_match: '*' to only write if the object doesn't exist yet
+            
+        Returns:
+            bool: True if successful, False otherwise
+            
+        Raises:
+            WriteConflictError: If a write condition is not met
+        """
         try:
-            response = self.s3_client.get_object(
-                Bucket=self.bucket_name,
-                Key=self.s3_key
-            )
-            json_data = response['Body'].read().decode('utf-8')
-            data = json.loads(json_data)
+            json_data = json.dumps(data, indent=2, default=str)
+        except Exception as e:
+            print(f"Unexpected error during upsert {self.s3_key}: {e}")
+            return False
+        return await self.backend.aput(self.s3_key, json_data.encode('utf-8'), if_match=if_match, if_none_match=if_none_match)
+    
+    async def aget(self) -> Optional[Dict[str, Any]]:
+        """
+        Coroutine version of get.
+        
+        Returns:
+            Optional[Dict[str, Any]]: The retrieved data as a dictionary, 
+            or None if the object doesn't exist or an error occurs
+        """
+        data, _ = await self.aget_with_etag()
+        return data
+    
+    async def aget_with_etag(self, if_none_match: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Coroutine version of get_with_etag.
+        
+        Args:
+            if_none_match: The ETag of a previously retrieved copy of the data
             
-            return data
+        Returns:
+            Tuple of the retrieved data and its ETag, as for get_with_etag
+        """
+        body, etag = await self.backend.aget_with_etag(self.s3_key, if_none_match)
+        return self._parse(body, etag)
+    
+    def _parse(self, body: Optional[bytes], etag: Optional[str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        if body is None:
+            return None, etag
 
-        except ClientError as e:
-            print(f"Error retrieving data from S3 {self.s3_key}: {e}")
-            return None
+        try:
+            return json.loads(body), etag
         except Exception as e:
             print(f"Unexpected error during get {self.s3_key}: {e}")
-            return None
+            return None, None
     
     def exists(self) -> bool:
         """
-        Check if the S3 object exists.
+        Check if the stored object exists.
         
         Returns:
             bool: True if the object exists, False otherwise
         """
-        try:
-            self.s3_client.head_object(
-                Bucket=self.bucket_name,
-                Key=self.s3_key
-            )
-            return True
-        except NoSuchKey:
-            return False
-        except ClientError:
-            return False
+        return self.backend.exists(self.s3_key)
     
     def delete(self) -> bool:
         """
-        Delete the S3 object.
+        Delete the stored object.
         
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            self.s3_client.delete_object(
-                Bucket=self.bucket_name,
-                Key=self.s3_key
-            )
-            return True
-        except ClientError as e:
-            print(f"Error deleting object from S3: {e}")
-            return False
-        except Exception as e:
-            print(f"Unexpected error during delete: {e}")
-            return False
+        return self.backend.delete(self.s3_key)
     
     def get_s3_key(self) -> str:
         """
         Get the S3 key path for this datastore object.
+        The local engine uses the same path relative to its root directory.
         
         Returns:
             str: The S3 key path
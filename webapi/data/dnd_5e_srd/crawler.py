@@ -0,0 +1,251 @@
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Optional, Dict, Any, Callable, Iterator
+from config import DND_5E_SRD_CRAWL_RATE, DND_5E_SRD_CRAWL_WORKERS
+
+API_PREFIX = '/api/2014'
+# Completed fetches between progress file saves
+PROGRESS_SAVE_INTERVAL = 50
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket limiting how often callers may proceed.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Most tokens the bucket holds, i.e. the largest burst, defaults to rate
+        """
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take a token, waiting until one is available.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_seconds = (1 - self.tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+def get_referenced_paths(value: Any) -> Iterator[str]:
+    """
+    Find every API path referenced by an API response, e.g. the 'url' of each result.
+
+    Args:
+        value: A decoded API response, or any value inside one
+
+    Returns:
+        Iterator of paths below the API root
+    """
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from get_referenced_paths(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from get_referenced_paths(item)
+    elif isinstance(value, str) and value.startswith(API_PREFIX + '/'):
+        yield value[len(API_PREFIX) + 1:].strip('/')
+
+
+class Crawler:
+    """
+    A breadth-first crawler of the D&D 5e API.
+
+    Starts at the base index and follows every path referenced by a
+    response, running a bounded number of fetches at once. With a progress
+    file, the fetched and pending paths are saved as the crawl goes, so an
+    interrupted crawl resumes where it stopped.
+    """
+
+    def __init__(self, fetch_json: Callable[[str], Optional[Dict[str, Any]]],
+                 workers: int = DND_5E_SRD_CRAWL_WORKERS, rate: float = DND_5E_SRD_CRAWL_RATE,
+                 progress_path: Optional[str] = None):
+        """
+        Initialize the crawler.
+
+        Args:
+            fetch_json: Fetches the response for a path below the API root, or returns None on failure
+            workers: Most fetches running at once
+            rate: Most fetches started per second, None for no limit
+            progress_path: File to save progress to and resume from
+        """
+        self.fetch_json = fetch_json
+        self.workers = workers
+        self.token_bucket = TokenBucket(rate) if rate else None
+        self.progress_path = progress_path
+
+    def load_progress(self):
+        if self.progress_path and os.path.exists(self.progress_path):
+            with open(self.progress_path) as file:
+                progress = json.load(file)
+            return set(progress['done']), deque(progress['pending'] + progress['failed'])
+        return set(), deque([''])
+
+    def save_progress(self, done: set, pending: list, failed: list):
+        if not self.progress_path:
+            return
+        temp_path = f'{self.progress_path}.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump({'done': sorted(done), 'pending': pending, 'failed': failed}, file)
+        os.replace(temp_path, self.progress_path)
+
+    def fetch(self, api_path: str, on_resource: Callable[[str, Dict[str, Any]], None]) -> Optional[Dict[str, Any]]:
+        if self.token_bucket is not None:
+            self.token_bucket.acquire()
+        data = self.fetch_json(api_path)
+        if data is not None:
+            on_resource(api_path, data)
+        return data
+
+    def crawl(self, on_resource: Callable[[str, Dict[str, Any]], None]) -> int:
+        """
+        Crawl the API, calling on_resource from a worker thread for every response.
+
+        Args:
+            on_resource: Called with the path and response of each fetched resource
+
+        Returns:
+            int: Number of resources fetched by this run
+        """
+        done, pending = self.load_progress()
+        seen = done | set(pending)
+        failed = []
+        fetched = 0
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                while pending or running:
+                    while pending and len(running) < self.workers:
+                        api_path = pending.popleft()
+                        running[executor.submit(self.fetch, api_path, on_resource)] = api_path
+
+                    completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in completed:
+                        # Read the result before dropping the path from running, so a
+                        # failing fetch stays in the saved progress
+                        data = future.result()
+                        api_path = running.pop(future)
+                        if data is None:
+                            failed.append(api_path)
+                            continue
+                        done.add(api_path)
+                        fetched += 1
+                        for referenced_path in get_referenced_paths(data):
+                            if referenced_path not in seen:
+                                seen.add(referenced_path)
+                                pending.append(referenced_path)
+
+                        if fetched % PROGRESS_SAVE_INTERVAL == 0:
+                            self.save_progress(done, list(pending) + list(running.values()), failed)
+            except BaseException:
+                for future in running:
+                    future.cancel()
+                self.save_progress(done, list(pending) + list(running.values()), failed)
+                raise
+
+        if failed:
+            self.save_progress(done, [], failed)
+            print(f"Failed to fetch {len(failed)} resources, run again to retry them")
+        elif self.progress_path and os.path.exists(self.progress_path):
+            os.remove(self.progress_path)
+        return fetched
+
+
+def get_api_fetcher(workers: int = DND_5E_SRD_CRAWL_WORKERS) -> Callable[[str], Optional[Dict[str, Any]]]:
+    """
+    Build a fetch function for the D&D 5e API sharing one pooled HTTP session
+    between worker threads, retrying rate limited and failed requests with backoff.
+
+    Args:
+        workers: Number of worker threads, which sets the connection pool size
+
+    Returns:
+        Function fetching the response for a path below the API root, or None on failure
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    from data.dnd_5e_srd.resource import dnd_5e_src_api_url
+
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=workers,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+    ))
+
+    def fetch_json(api_path: str) -> Optional[Dict[str, Any]]:
+        api_url = '/'.join(filter(None, [dnd_5e_src_api_url, api_path]))
+        try:
+            response = session.get(api_url, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError) as e:
+            print(f"Error fetching data from API {api_url}: {e}")
+            return None
+
+    return fetch_json
+
+
+def store_resource(api_path: str, data: Dict[str, Any]):
+    """
+    Store a crawled resource in its dnd-5e-srd-2014-* datastore table.
+
+    Raises:
+        RuntimeError: If the write fails, so the crawl stops with the path still pending
+    """
+    from data.dnd_5e_srd.resource import Dnd5eResource
+
+    resource = Dnd5eResource.from_api_path(api_path)
+    if resource is not None and not resource.upsert_data_dict(data):
+        raise RuntimeError(f"Failed to store {api_path} in the datastore")
+
+
+def prefetch_resources(workers: int = DND_5E_SRD_CRAWL_WORKERS, rate: float = DND_5E_SRD_CRAWL_RATE,
+                       progress_path: Optional[str] = None) -> int:
+    """
+    Crawl every SRD resource into the dnd-5e-srd-2014-* datastore tables.
+
+    Args:
+        workers: Most fetches running at once
+        rate: Most fetches started per second
+        progress_path: File to save progress to and resume from
+
+    Returns:
+        int: Number of resources fetched
+    """
+    crawler = Crawler(get_api_fetcher(workers), workers, rate, progress_path)
+    fetched = crawler.crawl(store_resource)
+    print(f"Prefetched {fetched} resources into the datastore")
+    return fetched
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Prefetch every D&D 5e SRD resource into the datastore.')
+    parser.add_argument('--workers', type=int, default=DND_5E_SRD_CRAWL_WORKERS, help='concurrent fetches')
+    parser.add_argument('--rate', type=float, default=DND_5E_SRD_CRAWL_RATE, help='fetches per second')
+    parser.add_argument('--progress', default='dnd-5e-srd-prefetch.json', help='progress file to resume from')
+    args = parser.parse_args()
+    prefetch_resources(args.workers, args.rate, args.progress)
@@ -1,9 +1,17 @@
-import requests
-from typing import Optional, Dict, Any
+import copy
+from typing import Optional, Dict, Any, Callable
+from config import DND_5E_SRD_MISSING_TTL_SECONDS
 from data.base_datastore import BaseDatastore, BaseData
+from data.cache import missing_cache
+from data.dnd_5e_srd.snapshot import get_snapshot
+from data.single_flight import SingleFlight
 
 dnd_5e_src_api_url = 'https://www.dnd5eapi.co/api/2014'
 
+# Concurrent lookups of one resource share a single datastore read and API fetch.
+# Every caller gets the same result object, so it is copied before being handed out
+_resource_flights = SingleFlight()
+
 
 class Dnd5eResource(BaseDatastore):
     """
@@ -27,9 +35,88 @@ class Dnd5eResource(BaseDatastore):
         self.entity_path = f'{database_with_prefix}/{table}/{resource}'
         super().__init__(entity_id=resource, database=database_with_prefix, table=table)
     
+    @classmethod
+    def from_api_path(cls, api_path: str) -> Optional['Dnd5eResource']:
+        """
+        Build the resource for a path below the API root, e.g. 'subclasses/hunter/features'.
+        
+        Args:
+            api_path: The API path, or '' for the base index
+            
+        Returns:
+            The resource, or None if the path is nested deeper than database/table/resource
+        """
+        path_parts = api_path.split('/') if api_path else []
+        if len(path_parts) > 3:
+            return None
+        try:
+            return cls(*path_parts)
+        except ValueError:
+            return None
+    
+    def get_api_path(self) -> str:
+        """
+        Get the path of the resource below the API root, e.g. 'subclasses/hunter/features'.
+        
+        Returns:
+            The API path, or '' for the base index
+        """
+        path_parts = []
+        
+        if self.database != 'index':
+            path_parts.append(self.database)
+        
+        if self.database != 'index' and self.table != 'index':
+            path_parts.append(self.table)
+        
+        if self.database != 'index' and self.table != 'index' and self.resource != 'index':
+            path_parts.append(self.resource)
+        
+        return '/'.join(path_parts)
+    
     def get_resource_data(self) -> Dict[str, Any]:
         """
-        Get resource data, first trying the datastore, then falling back to API.
+        Get resource data, first trying the bundled SRD snapshot, then the datastore, then falling back to API.
+        Resources the API doesn't have are remembered as missing for a while, and
+        concurrent lookups of the same resource share one datastore read and API fetch.
+        
+        Returns:
+            Dict containing the resource data
+        """
+        snapshot = get_snapshot()
+        if snapshot is not None:
+            snapshot_data = snapshot.get(self.get_api_path())
+            if snapshot_data is not None:
+                return snapshot_data
+        
+        if missing_cache.is_missing(self.entity_path):
+            return {}
+        
+        return copy.deepcopy(_resource_flights.do(self.entity_path, self._load_resource_data))
+    
+    def _write_data(self, build_data: Callable[[Optional[Dict[str, Any]]], BaseData],
+                    expected_version: Optional[int] = None) -> bool:
+        """
+        Write the resource, and forget that it was missing, e.g. once the crawler stores it.
+        """
+        success = super()._write_data(build_data, expected_version)
+        if success:
+            missing_cache.invalidate(self.entity_path)
+        return success
+    
+    async def _awrite_data(self, build_data: Callable[[Optional[Dict[str, Any]]], BaseData],
+                           expected_version: Optional[int] = None) -> bool:
+        """
+        Coroutine version of _write_data.
+        """
+        success = await super()._awrite_data(build_data, expected_version)
+        if success:
+            missing_cache.invalidate(self.entity_path)
+        return success
+    
+    def _load_resource_data(self) -> Dict[str, Any]:
+        """
+        Load resource data from the datastore, or from the API and store it in the datastore.
         
         Returns:
             Dict containing the resource data
@@ -45,6 +132,8 @@ class Dnd5eResource(BaseDatastore):
             self.upsert_data_dict(api_data)
             return api_data
         
+        if api_data is not None:
+            missing_cache.set_missing(self.entity_path, DND_5E_SRD_MISSING_TTL_SECONDS)
         return {}
     
     def _fetch_from_api(self) -> Optional[Dict[str, Any]]:
@@ -52,23 +141,19 @@ class Dnd5eResource(BaseDatastore):
         Fetch data from the D&D 5e API based on the current parameters.
         
         Returns:
-            Optional[Dict] containing the API response data, or None if failed
+            Optional[Dict] containing the API response data, an empty dict if the API
+            has no such resource, or None if failed
         """
+        # requests is only needed on a datastore miss, so it stays out of the Lambda cold start
+        import requests
+
         try:
-            url_parts = [dnd_5e_src_api_url]
-            
-            if self.database != 'index':
-                url_parts.append(self.database)
-            
-            if self.database != 'index' and self.table != 'index':
-                url_parts.append(self.table)
-            
-            if self.database != 'index' and self.table != 'index' and self.resource != 'index':
-                url_parts.append(self.resource)
-            
-            api_url = '/'.join(url_parts)
+            api_url = '/'.join(filter(None, [dnd_5e_src_api_url, self.get_api_path()]))
             print(f"Fetching data from API {api_url}")
             response = requests.get(api_url, timeout=30)
+            if response.status_code == 404:
+                print(f"Resource not found in API {api_url}")
+                return {}
             response.raise_for_status()
             
             return response.json()
@@ -0,0 +1,230 @@
+import bisect
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Optional, Dict, Any, List, Iterator, Tuple
+from data.dnd_5e_srd.snapshot import Snapshot, get_snapshot
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+# Matches in the name count this many times more than matches in the rest of the document
+NAME_WEIGHT = 3
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+# Keys holding links or identifiers rather than text
+SKIPPED_TEXT_KEYS = {'url', 'index', 'image'}
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def get_text(value: Any) -> Iterator[str]:
+    """
+    Find every text value in a document, skipping links and identifiers.
+    """
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key not in SKIPPED_TEXT_KEYS:
+                yield from get_text(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from get_text(item)
+    elif isinstance(value, str):
+        yield value
+
+
+def get_term_value(value: Any) -> Optional[str]:
+    """
+    Get the filterable value of a string or of a reference like {'index': 'evocation', 'name': ..., 'url': ...}.
+    """
+    if isinstance(value, str):
+        return value.lower()
+    if isinstance(value, dict) and isinstance(value.get('index'), str):
+        return value['index'].lower()
+    return None
+
+
+class SearchIndex:
+    """
+    An in-memory search index over SRD documents.
+
+    Keeps an inverted index of text tokens for ranked full-text search,
+    a term index of each top-level string, reference or list attribute
+    (e.g. damage_immunities, size, school), and a sorted index of each
+    top-level numeric attribute (e.g. challenge_rating, level) for range filters.
+    """
+
+    def __init__(self, documents: Dict[str, Dict[str, Any]]):
+        """
+        Build the index.
+
+        Args:
+            documents: Documents keyed by their API path, e.g. 'monsters/adult-red-dragon'
+        """
+        self.documents = {}
+        self.postings = defaultdict(dict)
+        self.terms = defaultdict(lambda: defaultdict(set))
+        self.numbers = defaultdict(list)
+
+        for path, document in documents.items():
+            self.add(path, document)
+
+        for values in self.numbers.values():
+            values.sort()
+
+    def add(self, path: str, document: Dict[str, Any]):
+        database = path.split('/', 1)[0]
+        self.documents[path] = {
+            'path': path,
+            'database': database,
+            'index': document.get('index', ''),
+            'name': document.get('name', ''),
+        }
+
+        frequencies = defaultdict(int)
+        for token in tokenize(document.get('name', '')):
+            frequencies[token] += NAME_WEIGHT
+        for key, value in document.items():
+            if key != 'name' and key not in SKIPPED_TEXT_KEYS:
+                for text in get_text(value):
+                    for token in tokenize(text):
+                        frequencies[token] += 1
+        for token, frequency in frequencies.items():
+            self.postings[token][path] = frequency
+
+        self.terms['database'][database].add(path)
+        for key, value in document.items():
+            if isinstance(value, bool):
+                continue
+            if isinstance(value, (int, float)):
+                self.numbers[key].append((value, path))
+                continue
+            for item in value if isinstance(value, list) else [value]:
+                term_value = get_term_value(item)
+                if term_value is not None:
+                    self.terms[key][term_value].add(path)
+
+    def match_range(self, attribute: str, minimum: Optional[float] = None, maximum: Optional[float] = None) -> set:
+        """
+        Get the documents whose numeric attribute is within [minimum, maximum].
+        """
+        values = self.numbers.get(attribute, [])
+        start = 0 if minimum is None else bisect.bisect_left(values, (minimum,))
+        end = len(values) if maximum is None else bisect.bisect_right(values, (maximum, '\uffff'))
+        return {path for _, path in values[start:end]}
+
+    def match_value(self, attribute: str, value: str) -> set:
+        """
+        Get the documents whose attribute has the value. Numeric attributes
+        compare as numbers, so 'level=3' matches a level of 3.
+        """
+        matches = self.terms.get(attribute, {}).get(value.lower(), set())
+        if attribute in self.numbers:
+            try:
+                number = float(value)
+            except ValueError:
+                return matches
+            matches = matches | self.match_range(attribute, number, number)
+        return matches
+
+    def score(self, tokens: List[str]) -> Dict[str, float]:
+        """
+        Score the documents containing every token with TF-IDF.
+        """
+        scores = None
+        for token in tokens:
+            postings = self.postings.get(token, {})
+            idf = math.log(1 + len(self.documents) / (1 + len(postings)))
+            token_scores = {path: (1 + math.log(frequency)) * idf for path, frequency in postings.items()}
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {path: score + token_scores[path] for path, score in scores.items() if path in token_scores}
+        return scores or {}
+
+    def search(self, query: str = '', filters: Dict[str, str] = None,
+               ranges: Dict[str, Tuple[Optional[float], Optional[float]]] = None,
+               limit: int = SEARCH_DEFAULT_LIMIT, offset: int = 0) -> Dict[str, Any]:
+        """
+        Search the documents.
+
+        Args:
+            query: Free text, every token must match
+            filters: Attribute values every result must have, e.g. {'damage_immunities': 'fire'}
+            ranges: Inclusive (minimum, maximum) bounds for numeric attributes, either may be None
+            limit: Maximum number of results to return
+            offset: Number of results to skip
+
+        Returns:
+            Dict with the total number of matches and the requested page of results,
+            best match first, or ordered by name without a query
+        """
+        tokens = tokenize(query)
+        candidates = None
+        scores = {}
+        if tokens:
+            scores = self.score(tokens)
+            candidates = set(scores)
+
+        for attribute, value in (filters or {}).items():
+            matches = self.match_value(attribute, value)
+            candidates = matches if candidates is None else candidates & matches
+
+        for attribute, (minimum, maximum) in (ranges or {}).items():
+            matches = self.match_range(attribute, minimum, maximum)
+            candidates = matches if candidates is None else candidates & matches
+
+        if candidates is None:
+            candidates = set(self.documents)
+
+        ordered = sorted(candidates, key=lambda path: (-scores.get(path, 0), self.documents[path]['name'], path))
+        results = []
+        for path in ordered[offset:offset + limit]:
+            result = dict(self.documents[path])
+            if tokens:
+                result['score'] = round(scores[path], 4)
+            results.append(result)
+
+        return {
+            'total': len(ordered),
+            'offset': offset,
+            'limit': limit,
+            'results': results,
+        }
+
+
+def get_searchable_documents(snapshot: Snapshot) -> Dict[str, Dict[str, Any]]:
+    """
+    Get the individual resources of a snapshot, e.g. 'spells/fireball', skipping
+    the indexes that list them and the sub-resources below them.
+    """
+    documents = {}
+    for path in snapshot:
+        if path.count('/') == 1:
+            document = snapshot.get(path)
+            if isinstance(document, dict):
+                documents[path] = document
+    return documents
+
+
+_search_index = None
+_search_index_snapshot = None
+_search_index_lock = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    """
+    Get the process-wide search index over the SRD snapshot, building it on first use.
+
+    Returns:
+        The search index, empty if no snapshot has been built
+    """
+    global _search_index, _search_index_snapshot
+    snapshot = get_snapshot()
+    if _search_index is None or _search_index_snapshot is not snapshot:
+        with _search_index_lock:
+            if _search_index is None or _search_index_snapshot is not snapshot:
+                _search_index = SearchIndex(get_searchable_documents(snapshot) if snapshot is not None else {})
+                _search_index_snapshot = snapshot
+    return _search_index
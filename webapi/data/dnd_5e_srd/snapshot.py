@@ -0,0 +1,176 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import zlib
+from typing import Optional, Dict, Any, Callable, Iterator
+from config import DND_5E_SRD_CRAWL_RATE, DND_5E_SRD_CRAWL_WORKERS, DND_5E_SRD_SNAPSHOT_PATH
+from data.dnd_5e_srd.crawler import Crawler, get_api_fetcher
+
+SNAPSHOT_MAGIC = b'DMSRD001'
+# Magic, then the offset and length of the compressed index
+SNAPSHOT_HEADER = struct.Struct('<8sQQ')
+
+
+class Snapshot:
+    """
+    A read-only, memory-mapped snapshot of the D&D 5e SRD API.
+
+    The file holds one zlib-compressed JSON record per API path, followed by a
+    compressed index of {path: [offset, length]}. Opening the snapshot only
+    reads the index; each lookup decompresses a single record from the map.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a snapshot file.
+
+        Args:
+            path: Path of the snapshot file
+
+        Raises:
+            ValueError: If the file is not a snapshot
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_length = SNAPSHOT_HEADER.unpack_from(self.map, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self.map.close()
+            raise ValueError(f"Not a D&D 5e SRD snapshot: {path}")
+        self.index = json.loads(zlib.decompress(self.map[index_offset:index_offset + index_length]))
+
+    def get(self, api_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the API response stored for a path.
+
+        Args:
+            api_path: Path below the API root, e.g. 'ability-scores/con', or '' for the base index
+
+        Returns:
+            The stored response, or None if the path is not in the snapshot
+        """
+        entry = self.index.get(api_path)
+        if entry is None:
+            return None
+        offset, length = entry
+        return json.loads(zlib.decompress(self.map[offset:offset + length]))
+
+    def __contains__(self, api_path: str) -> bool:
+        return api_path in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def close(self):
+        self.map.close()
+
+
+def write_snapshot(path: str, resources: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Write resources to a snapshot file, replacing any existing snapshot atomically.
+
+    Args:
+        path: Path of the snapshot file
+        resources: API responses keyed by their path below the API root
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, 0, 0))
+            index = {}
+            for api_path in sorted(resources):
+                record = zlib.compress(json.dumps(resources[api_path], separators=(',', ':')).encode('utf-8'), 9)
+                index[api_path] = [file.tell(), len(record)]
+                file.write(record)
+
+            index_record = zlib.compress(json.dumps(index, separators=(',', ':')).encode('utf-8'), 9)
+            index_offset = file.tell()
+            file.write(index_record)
+            file.seek(0)
+            file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, index_offset, len(index_record)))
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def crawl_resources(fetch_json: Callable[[str], Optional[Dict[str, Any]]],
+                    workers: int = DND_5E_SRD_CRAWL_WORKERS, rate: float = DND_5E_SRD_CRAWL_RATE) -> Dict[str, Dict[str, Any]]:
+    """
+    Crawl every resource of the API from the base index.
+
+    Args:
+        fetch_json: Fetches the response for a path below the API root, or returns None on failure
+        workers: Most fetches running at once
+        rate: Most fetches started per second
+
+    Returns:
+        API responses keyed by their path below the API root
+    """
+    resources = {}
+    Crawler(fetch_json, workers, rate).crawl(resources.__setitem__)
+    return resources
+
+
+def build_snapshot(path: str = DND_5E_SRD_SNAPSHOT_PATH) -> int:
+    """
+    Crawl every SRD resource from the D&D 5e API into a snapshot file.
+
+    Args:
+        path: Path of the snapshot file
+
+    Returns:
+        int: Number of resources in the snapshot
+    """
+    resources = crawl_resources(get_api_fetcher())
+    write_snapshot(path, resources)
+    print(f"Wrote {len(resources)} resources to {path}")
+    return len(resources)
+
+
+_snapshot = None
+_snapshot_loaded = False
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot() -> Optional[Snapshot]:
+    """
+    Get the process-wide SRD snapshot, opening it on first use.
+
+    Returns:
+        The snapshot, or None if no snapshot file has been built
+    """
+    global _snapshot, _snapshot_loaded
+    if not _snapshot_loaded:
+        with _snapshot_lock:
+            if not _snapshot_loaded:
+                if os.path.exists(DND_5E_SRD_SNAPSHOT_PATH):
+                    _snapshot = Snapshot(DND_5E_SRD_SNAPSHOT_PATH)
+                _snapshot_loaded = True
+    return _snapshot
+
+
+def set_snapshot(snapshot: Optional[Snapshot]) -> None:
+    """
+    Replace the process-wide SRD snapshot. Passing None reopens the configured snapshot on next use.
+
+    Args:
+        snapshot: The snapshot to use, or None
+    """
+    global _snapshot, _snapshot_loaded
+    with _snapshot_lock:
+        _snapshot = snapshot
+        _snapshot_loaded = snapshot is not None
+
+
+if __name__ == "__main__":
+    build_snapshot(sys.argv[1] if len(sys.argv) > 1 else DND_5E_SRD_SNAPSHOT_PATH)
@@ -1,3 +1,4 @@
+from typing import Optional
 from data.base_datastore import BaseData, BaseDatastore
 
 
@@ -24,32 +25,34 @@ class Events(BaseDatastore):
         """
         super().__init__(game_id, database, table)
     
-    def upsert_events_data(self, events_data: EventsData) -> bool:
+    def upsert_events_data(self, events_data: EventsData, expected_version: Optional[int] = None) -> bool:
         """
         Upsert (insert or update) Events data to the data store.
         The last_updated property is automatically set to the current time.
         
         Args:
             events_data: EventsData object to store
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
-        return self.upsert_data(events_data)
+        return self.upsert_data(events_data, expected_version)
     
-    def upsert_events_data_dict(self, data: dict) -> bool:
+    def upsert_events_data_dict(self, data: dict, expected_version: Optional[int] = None) -> bool:
         """
         Convenience method to upsert Events data directly from a dictionary.
         Creates a new EventsData object and sets last_updated automatically.
         
         Args:
             data: Dictionary containing the Events data
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
         events_data = EventsData(data=data)
-        return self.upsert_events_data(events_data)
+        return self.upsert_events_data(events_data, expected_version)
     
     def get_events_data(self) -> EventsData:
         """
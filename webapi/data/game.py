@@ -1,3 +1,4 @@
+from typing import Optional
 from data.base_datastore import BaseData, BaseDatastore
 
 
@@ -24,32 +25,34 @@ class Game(BaseDatastore):
         """
         super().__init__(game_id, database, table)
     
-    def upsert_game_data(self, game_data: GameData) -> bool:
+    def upsert_game_data(self, game_data: GameData, expected_version: Optional[int] = None) -> bool:
         """
         Upsert (insert or update) game data to the data store.
         The last_updated property is automatically set to the current time.
         
         Args:
             game_data: GameData object to store
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
-        return self.upsert_data(game_data)
+        return self.upsert_data(game_data, expected_version)
     
-    def upsert_game_data_dict(self, data: dict) -> bool:
+    def upsert_game_data_dict(self, data: dict, expected_version: Optional[int] = None) -> bool:
         """
         Convenience method to upsert game data directly from a dictionary.
         Creates a new GameData object and sets last_updated automatically.
         
         Args:
             data: Dictionary containing the game data
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
         game_data = GameData(data=data)
-        return self.upsert_game_data(game_data)
+        return self.upsert_game_data(game_data, expected_version)
     
     def get_game_data(self) -> GameData:
         """
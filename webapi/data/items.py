@@ -1,3 +1,4 @@
+from typing import Optional
 from data.base_datastore import BaseData, BaseDatastore
 
 
@@ -10,12 +11,12 @@ class Items(BaseDatastore):
     def __init__(self, game_id: str, database: str = 'items', table: str = 'items-data'):
         super().__init__(game_id, database, table)
     
-    def upsert_items_data(self, items_data: ItemsData) -> bool:
-        return self.upsert_data(items_data)
+    def upsert_items_data(self, items_data: ItemsData, expected_version: Optional[int] = None) -> bool:
+        return self.upsert_data(items_data, expected_version)
     
-    def upsert_items_data_dict(self, data: dict) -> bool:
+    def upsert_items_data_dict(self, data: dict, expected_version: Optional[int] = None) -> bool:
         items_data = ItemsData(data=data)
-        return self.upsert_items_data(items_data)
+        return self.upsert_items_data(items_data, expected_version)
     
     def get_items_data(self) -> ItemsData:
         return self.get_data()
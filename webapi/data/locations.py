@@ -1,3 +1,4 @@
+from typing import Optional
 from data.base_datastore import BaseData, BaseDatastore
 
 
@@ -24,32 +25,34 @@ class Locations(BaseDatastore):
         """
         super().__init__(game_id, database, table)
     
-    def upsert_locations_data(self, locations_data: LocationsData) -> bool:
+    def upsert_locations_data(self, locations_data: LocationsData, expected_version: Optional[int] = None) -> bool:
         """
         Upsert (insert or update) locations data to the data store.
         The last_updated property is automatically set to the current time.
         
         Args:
             locations_data: LocationsData object to store
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
-        return self.upsert_data(locations_data)
+        return self.upsert_data(locations_data, expected_version)
     
-    def upsert_locations_data_dict(self, data: dict) -> bool:
+    def upsert_locations_data_dict(self, data: dict, expected_version: Optional[int] = None) -> bool:
         """
         Convenience method to upsert locations data directly from a dictionary.
         Creates a new LocationsData object and sets last_updated automatically.
         
         Args:
             data: Dictionary containing the locations data
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
         locations_data = LocationsData(data=data)
-        return self.upsert_locations_data(locations_data)
+        return self.upsert_locations_data(locations_data, expected_version)
     
     def get_locations_data(self) -> LocationsData:
         """
@@ -0,0 +1,30 @@
+import copy
+from typing import Any
+
+
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    """
+    Apply a JSON Merge Patch (RFC 7386) to a document.
+
+    Object members in the patch replace the matching members of the target,
+    nested objects are merged recursively, and null members remove the
+    matching member. Any other patch value replaces the target outright.
+    The target is not modified.
+
+    Args:
+        target: The document to patch
+        patch: The merge patch
+
+    Returns:
+        The patched document
+    """
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
@@ -1,3 +1,4 @@
+from typing import Optional
 from data.base_datastore import BaseData, BaseDatastore
 
 
@@ -24,32 +25,34 @@ class Monster(BaseDatastore):
         """
         super().__init__(monster_id, database, table)
     
-    def upsert_monster_data(self, monster_data: MonsterData) -> bool:
+    def upsert_monster_data(self, monster_data: MonsterData, expected_version: Optional[int] = None) -> bool:
         """
         Upsert (insert or update) monster data to the data store.
         The last_updated property is automatically set to the current time.
         
         Args:
             monster_data: MonsterData object to store
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
-        return self.upsert_data(monster_data)
+        return self.upsert_data(monster_data, expected_version)
     
-    def upsert_monster_data_dict(self, data: dict) -> bool:
+    def upsert_monster_data_dict(self, data: dict, expected_version: Optional[int] = None) -> bool:
         """
         Convenience method to upsert monster data directly from a dictionary.
         Creates a new MonsterData object and sets last_updated automatically.
         
         Args:
             data: Dictionary containing the monster data
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
         monster_data = MonsterData(data=data)
-        return self.upsert_monster_data(monster_data)
+        return self.upsert_monster_data(monster_data, expected_version)
     
     def get_monster_data(self) -> MonsterData:
         """
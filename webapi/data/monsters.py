@@ -1,3 +1,4 @@
+from typing import Optional
 from data.base_datastore import BaseData, BaseDatastore
 
 
@@ -10,12 +11,12 @@ class Monsters(BaseDatastore):
     def __init__(self, game_id: str, database: str = 'monsters', table: str = 'monsters-data'):
         super().__init__(game_id, database, table)
     
-    def upsert_monsters_data(self, monsters_data: MonstersData) -> bool:
-        return self.upsert_data(monsters_data)
+    def upsert_monsters_data(self, monsters_data: MonstersData, expected_version: Optional[int] = None) -> bool:
+        return self.upsert_data(monsters_data, expected_version)
     
-    def upsert_monsters_data_dict(self, data: dict) -> bool:
+    def upsert_monsters_data_dict(self, data: dict, expected_version: Optional[int] = None) -> bool:
         monsters_data = MonstersData(data=data)
-        return self.upsert_monsters_data(monsters_data)
+        return self.upsert_monsters_data(monsters_data, expected_version)
     
     def get_monsters_data(self) -> MonstersData:
         return self.get_data()
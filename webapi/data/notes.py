@@ -1,3 +1,4 @@
+from typing import Optional
 from data.base_datastore import BaseData, BaseDatastore
 
 
@@ -24,32 +25,34 @@ class Notes(BaseDatastore):
         """
         super().__init__(game_id, database, table)
     
-    def upsert_notes_data(self, notes_data: NotesData) -> bool:
+    def upsert_notes_data(self, notes_data: NotesData, expected_version: Optional[int] = None) -> bool:
         """
         Upsert (insert or update) Notes data to the data store.
         The last_updated property is automatically set to the current time.
         
         Args:
             notes_data: NotesData object to store
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
-        return self.upsert_data(notes_data)
+        return self.upsert_data(notes_data, expected_version)
     
-    def upsert_notes_data_dict(self, data: dict) -> bool:
+    def upsert_notes_data_dict(self, data: dict, expected_version: Optional[int] = None) -> bool:
         """
         Convenience method to upsert Notes data directly from a dictionary.
         Creates a new NotesData object and sets last_updated automatically.
         
         Args:
             data: Dictionary containing the Notes data
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
         notes_data = NotesData(data=data)
-        return self.upsert_notes_data(notes_data)
+        return self.upsert_notes_data(notes_data, expected_version)
     
     def get_notes_data(self) -> NotesData:
         """
@@ -1,3 +1,4 @@
+from typing import Optional
 from data.base_datastore import BaseData, BaseDatastore
 
 
@@ -24,32 +25,34 @@ class NPC(BaseDatastore):
         """
         super().__init__(npc_id, database, table)
     
-    def upsert_npc_data(self, npc_data: NPCData) -> bool:
+    def upsert_npc_data(self, npc_data: NPCData, expected_version: Optional[int] = None) -> bool:
         """
         Upsert (insert or update) NPC data to the data store.
         The last_updated property is automatically set to the current time.
         
         Args:
             npc_data: NPCData object to store
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
-        return self.upsert_data(npc_data)
+        return self.upsert_data(npc_data, expected_version)
     
-    def upsert_npc_data_dict(self, data: dict) -> bool:
+    def upsert_npc_data_dict(self, data: dict, expected_version: Optional[int] = None) -> bool:
         """
         Convenience method to upsert NPC data directly from a dictionary.
         Creates a new NPCData object and sets last_updated automatically.
         
         Args:
             data: Dictionary containing the NPC data
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
         npc_data = NPCData(data=data)
-        return self.upsert_npc_data(npc_data)
+        return self.upsert_npc_data(npc_data, expected_version)
     
     def get_npc_data(self) -> NPCData:
         """
@@ -1,3 +1,4 @@
+from typing import Optional
 from data.base_datastore import BaseData, BaseDatastore
 
 
@@ -24,32 +25,34 @@ class NPCs(BaseDatastore):
         """
         super().__init__(game_id, database, table)
     
-    def upsert_npcs_data(self, npcs_data: NPCsData) -> bool:
+    def upsert_npcs_data(self, npcs_data: NPCsData, expected_version: Optional[int] = None) -> bool:
         """
         Upsert (insert or update) NPCs data to the data store.
         The last_updated property is automatically set to the current time.
         
         Args:
             npcs_data: NPCsData object to store
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
-        return self.upsert_data(npcs_data)
+        return self.upsert_data(npcs_data, expected_version)
     
-    def upsert_npcs_data_dict(self, data: dict) -> bool:
+    def upsert_npcs_data_dict(self, data: dict, expected_version: Optional[int] = None) -> bool:
         """
         Convenience method to upsert NPCs data directly from a dictionary.
         Creates a new NPCsData object and sets last_updated automatically.
         
         Args:
             data: Dictionary containing the NPCs data
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
         npcs_data = NPCsData(data=data)
-        return self.upsert_npcs_data(npcs_data)
+        return self.upsert_npcs_data(npcs_data, expected_version)
     
     def get_npcs_data(self) -> NPCsData:
         """
@@ -1,3 +1,4 @@
+from typing import Optional
 from data.base_datastore import BaseData, BaseDatastore
 
 
@@ -24,32 +25,34 @@ class Player(BaseDatastore):
         """
         super().__init__(player_id, database, table)
     
-    def upsert_player_data(self, player_data: PlayerData) -> bool:
+    def upsert_player_data(self, player_data: PlayerData, expected_version: Optional[int] = None) -> bool:
         """
         Upsert (insert or update) player data to the data store.
         The last_updated property is automatically set to the current time.
         
         Args:
             player_data: PlayerData object to store
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
-        return self.upsert_data(player_data)
+        return self.upsert_data(player_data, expected_version)
     
-    def upsert_player_data_dict(self, data: dict) -> bool:
+    def upsert_player_data_dict(self, data: dict, expected_version: Optional[int] = None) -> bool:
         """
         Convenience method to upsert player data directly from a dictionary.
         Creates a new PlayerData object and sets last_updated automatically.
         
         Args:
             data: Dictionary containing the player data
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
         player_data = PlayerData(data=data)
-        return self.upsert_player_data(player_data)
+        return self.upsert_player_data(player_data, expected_version)
     
     def get_player_data(self) -> PlayerData:
         """
@@ -1,3 +1,4 @@
+from typing import Optional
 from data.base_datastore import BaseData, BaseDatastore
 
 
@@ -24,32 +25,34 @@ class Players(BaseDatastore):
         """
         super().__init__(game_id, database, table)
     
-    def upsert_players_data(self, players_data: PlayersData) -> bool:
+    def upsert_players_data(self, players_data: PlayersData, expected_version: Optional[int] = None) -> bool:
         """
         Upsert (insert or update) Players data to the data store.
         The last_updated property is automatically set to the current time.
         
         Args:
             players_data: PlayersData object to store
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
-        return self.upsert_data(players_data)
+        return self.upsert_data(players_data, expected_version)
     
-    def upsert_players_data_dict(self, data: dict) -> bool:
+    def upsert_players_data_dict(self, data: dict, expected_version: Optional[int] = None) -> bool:
         """
         Convenience method to upsert Players data directly from a dictionary.
         Creates a new PlayersData object and sets last_updated automatically.
         
         Args:
             data: Dictionary containing the Players data
+            expected_version: Only write if the stored version still matches
             
         Returns:
             bool: True if successful, False otherwise
         """
         players_data = PlayersData(data=data)
-        return self.upsert_players_data(players_data)
+        return self.upsert_players_data(players_data, expected_version)
     
     def get_players_data(self) -> PlayersData:
         """
@@ -1,3 +1,4 @@
+from typing import Optional
 from data.base_datastore import BaseData, BaseDatastore
 
 
@@ -10,12 +11,12 @@ class Quests(BaseDatastore):
     def __init__(self, game_id: str, database: str = 'quests', table: str = 'quests-data'):
         super().__init__(game_id, database, table)
     
-    def upsert_quests_data(self, quests_data: QuestsData) -> bool:
-        return self.upsert_data(quests_data)
+    def upsert_quests_data(self, quests_data: QuestsData, expected_version: Optional[int] = None) -> bool:
+        return self.upsert_data(quests_data, expected_version)
     
-    def upsert_quests_data_dict(self, data: dict) -> bool:
+    def upsert_quests_data_dict(self, data: dict, expected_version: Optional[int] = None) -> bool:
         quests_data = QuestsData(data=data)
-        return self.upsert_quests_data(quests_data)
+        return self.upsert_quests_data(quests_data, expected_version)
     
     def get_quests_data(self) -> QuestsData:
         return self.get_data()
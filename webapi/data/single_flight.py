@@ -0,0 +1,58 @@
+import threading
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one.
+
+    While a call for a key is running, other threads asking for the same key
+    wait for it and share its result or exception instead of repeating the work.
+    Every caller gets the same result object, so treat it as read-only or copy it.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        Run function for a key, or wait for the call already running for it.
+
+        Args:
+            key: Identifies the work, e.g. the path of the resource being loaded
+            function: Does the work
+
+        Returns:
+            The result of the call that ran for the key
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self.calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
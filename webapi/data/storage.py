@@ -0,0 +1,423 @@
+import asyncio
+import mmap
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from botocore.exceptions import ClientError
+from typing import Optional, Tuple
+from config import AWS_REGION, DATASTORE_BACKEND, DATASTORE_BUCKET, DATASTORE_LOCAL_LOCK_STRIPES, DATASTORE_LOCAL_ROOT
+from data.clients import get_client, get_async_client
+
+
+class WriteConflictError(Exception):
+    """
+    Raised when a conditional write finds the stored object has changed.
+    """
+
+    def __init__(self, message: str, current_version: Optional[int] = None):
+        super().__init__(message)
+        self.current_version = current_version
+
+
+class StorageBackend(ABC):
+    """
+    The interface every datastore storage engine implements.
+
+    Objects are addressed by key, e.g. datastore/{database}/{table}/{id}/data.json,
+    and stored as raw bytes. Serialization is left to the Datastore.
+    """
+
+    @abstractmethod
+    def put(self, key: str, body: bytes, content_type: str = 'application/json',
+            if_match: Optional[str] = None, if_none_match: Optional[str] = None) -> bool:
+        """
+        Write an object, replacing any existing object at the key.
+        With if_match the write only succeeds if the stored object still has that ETag,
+        and with if_none_match='*' it only succeeds if no object exists yet.
+
+        Args:
+            key: The object key
+            body: The object contents
+            content_type: The MIME type of the contents
+            if_match: The ETag the stored object must have
+            if_none_match: '*' to require that the object doesn't exist
+
+        Returns:
+            bool: True if successful, False otherwise
+
+        Raises:
+            WriteConflictError: If a write condition is not met
+        """
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Read an object.
+
+        Args:
+            key: The object key
+
+        Returns:
+            Optional[bytes]: The object contents, or None if the object doesn't exist or an error occurs
+        """
+        body, _ = self.get_with_etag(key)
+        return body
+
+    @abstractmethod
+    def get_with_etag(self, key: str, if_none_match: Optional[str] = None) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Read an object along with its ETag, skipping the transfer if it is unchanged.
+
+        Args:
+            key: The object key
+            if_none_match: The ETag of a previously read copy of the object
+
+        Returns:
+            Tuple of the object contents and its ETag. The contents are None with
+            an ETag when the object still matches if_none_match, and both are None
+            if the object doesn't exist or an error occurs.
+        """
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """
+        Check if an object exists.
+
+        Args:
+            key: The object key
+
+        Returns:
+            bool: True if the object exists, False otherwise
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """
+        Delete an object.
+
+        Args:
+            key: The object key
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+
+    async def aput(self, key: str, body: bytes, content_type: str = 'application/json',
+                   if_match: Optional[str] = None, if_none_match: Optional[str] = None) -> bool:
+        """
+        Coroutine version of put. Engines without a native async client run put in a worker thread.
+        """
+        return await asyncio.to_thread(self.put, key, body, content_type, if_match, if_none_match)
+
+    async def aget_with_etag(self, key: str, if_none_match: Optional[str] = None) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Coroutine version of get_with_etag. Engines without a native async client run it in a worker thread.
+        """
+        return await asyncio.to_thread(self.get_with_etag, key, if_none_match)
+
+    async def awarm(self) -> None:
+        """
+        Build any clients the engine needs ahead of the first request.
+        """
+        return None
+
+
+class S3Backend(StorageBackend):
+    """
+    A storage engine backed by an S3 bucket.
+    """
+
+    def __init__(self, bucket_name: str = DATASTORE_BUCKET, region_name: str = AWS_REGION):
+        """
+        Initialize the S3 engine.
+
+        Args:
+            bucket_name: The S3 bucket holding the datastore objects
+            region_name: The AWS region of the bucket
+        """
+        self.bucket_name = bucket_name
+        self.region_name = region_name
+        self.s3_client = get_client('s3', region_name)
+
+    def put(self, key: str, body: bytes, content_type: str = 'application/json',
+            if_match: Optional[str] = None, if_none_match: Optional[str] = None) -> bool:
+        try:
+            params = {
+                'Bucket': self.bucket_name,
+                'Key': key,
+                'Body': body,
+                'ContentType': content_type
+            }
+            if if_match:
+                params['IfMatch'] = if_match
+            if if_none_match:
+                params['IfNoneMatch'] = if_none_match
+            self.s3_client.put_object(**params)
+            return True
+        except ClientError as e:
+            if e.response.get('ResponseMetadata', {}).get('HTTPStatusCode') in (409, 412):
+                raise WriteConflictError(f"Conditional write failed for S3 {key}")
+            print(f"Error upserting data to S3 {key}: {e}")
+            return False
+        except Exception as e:
+            print(f"Unexpected error during upsert {key}: {e}")
+            return False
+
+    def get_with_etag(self, key: str, if_none_match: Optional[str] = None) -> Tuple[Optional[bytes], Optional[str]]:
+        try:
+            params = {
+                'Bucket': self.bucket_name,
+                'Key': key
+            }
+            if if_none_match:
+                params['IfNoneMatch'] = if_none_match
+            response = self.s3_client.get_object(**params)
+            return response['Body'].read(), response.get('ETag')
+        except ClientError as e:
+            if e.response.get('ResponseMetadata', {}).get('HTTPStatusCode') == 304:
+                return None, if_none_match
+            print(f"Error retrieving data from S3 {key}: {e}")
+            return None, None
+        except Exception as e:
+            print(f"Unexpected error during get {key}: {e}")
+            return None, None
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.s3_client.head_object(
+                Bucket=self.bucket_name,
+                Key=key
+            )
+            return True
+        except ClientError:
+            return False
+
+    def delete(self, key: str) -> bool:
+        try:
+            self.s3_client.delete_object(
+                Bucket=self.bucket_name,
+                Key=key
+            )
+            return True
+        except ClientError as e:
+            print(f"Error deleting object from S3 {key}: {e}")
+            return False
+        except Exception as e:
+            print(f"Unexpected error during delete {key}: {e}")
+            return False
+
+    async def awarm(self) -> None:
+        await get_async_client('s3', self.region_name)
+
+    async def aput(self, key: str, body: bytes, content_type: str = 'application/json',
+                   if_match: Optional[str] = None, if_none_match: Optional[str] = None) -> bool:
+        s3_client = await get_async_client('s3', self.region_name)
+        if s3_client is None:
+            return await super().aput(key, body, content_type, if_match, if_none_match)
+
+        try:
+            params = {
+                'Bucket': self.bucket_name,
+                'Key': key,
+                'Body': body,
+                'ContentType': content_type
+            }
+            if if_match:
+                params['IfMatch'] = if_match
+            if if_none_match:
+                params['IfNoneMatch'] = if_none_match
+            await s3_client.put_object(**params)
+            return True
+        except ClientError as e:
+            if e.response.get('ResponseMetadata', {}).get('HTTPStatusCode') in (409, 412):
+                raise WriteConflictError(f"Conditional write failed for S3 {key}")
+            print(f"Error upserting data to S3 {key}: {e}")
+            return False
+        except Exception as e:
+            print(f"Unexpected error during upsert {key}: {e}")
+            return False
+
+    async def aget_with_etag(self, key: str, if_none_match: Optional[str] = None) -> Tuple[Optional[bytes], Optional[str]]:
+        s3_client = await get_async_client('s3', self.region_name)
+        if s3_client is None:
+            return await super().aget_with_etag(key, if_none_match)
+
+        try:
+            params = {
+                'Bucket': self.bucket_name,
+                'Key': key
+            }
+            if if_none_match:
+                params['IfNoneMatch'] = if_none_match
+            response = await s3_client.get_object(**params)
+            async with response['Body'] as stream:
+                body = await stream.read()
+            return body, response.get('ETag')
+        except ClientError as e:
+            if e.response.get('ResponseMetadata', {}).get('HTTPStatusCode') == 304:
+                return None, if_none_match
+            print(f"Error retrieving data from S3 {key}: {e}")
+            return None, None
+        except Exception as e:
+            print(f"Unexpected error during get {key}: {e}")
+            return None, None
+
+
+class LocalBackend(StorageBackend):
+    """
+    A storage engine backed by the local filesystem.
+
+    Objects use the same key layout as S3 under a root directory. Writes go to
+    a temporary file that is renamed into place, so readers never see a
+    partially written object. Reads map the file into memory. Conditional
+    writes are serialized through a fixed table of in-process locks striped by key.
+    """
+
+    def __init__(self, root: str = DATASTORE_LOCAL_ROOT):
+        """
+        Initialize the local engine.
+
+        Args:
+            root: The directory holding the datastore objects
+        """
+        self.root = root
+        self.locks = [threading.Lock() for _ in range(DATASTORE_LOCAL_LOCK_STRIPES)]
+
+    def get_path(self, key: str) -> str:
+        """
+        Get the filesystem path for an object key.
+
+        Args:
+            key: The object key
+
+        Returns:
+            str: The filesystem path
+        """
+        return os.path.join(self.root, *key.split('/'))
+
+    def get_etag(self, stat: os.stat_result) -> str:
+        """
+        Build an ETag from a file's metadata. Every write renames a new file into place,
+        so the inode changes along with the modification time.
+
+        Args:
+            stat: The file's stat result
+
+        Returns:
+            str: The ETag
+        """
+        return f'"{stat.st_ino:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+    def put(self, key: str, body: bytes, content_type: str = 'application/json',
+            if_match: Optional[str] = None, if_none_match: Optional[str] = None) -> bool:
+        with self.locks[hash(key) % len(self.locks)]:
+            if if_match or if_none_match:
+                try:
+                    etag = self.get_etag(os.stat(self.get_path(key)))
+                except FileNotFoundError:
+                    etag = None
+                if if_match and if_match != etag:
+                    raise WriteConflictError(f"Conditional write failed for {key}")
+                if if_none_match == '*' and etag is not None:
+                    raise WriteConflictError(f"Conditional write failed for {key}")
+            return self._write(key, body)
+
+    def _write(self, key: str, body: bytes) -> bool:
+        path = self.get_path(key)
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        tmp_path = None
+        try:
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            print(f"Error upserting data to {path}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    def get_with_etag(self, key: str, if_none_match: Optional[str] = None) -> Tuple[Optional[bytes], Optional[str]]:
+        path = self.get_path(key)
+        try:
+            with open(path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                etag = self.get_etag(stat)
+                if if_none_match == etag:
+                    return None, etag
+                if stat.st_size == 0:
+                    return b'', etag
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return mapped[:], etag
+        except FileNotFoundError:
+            return None, None
+        except OSError as e:
+            print(f"Error retrieving data from {path}: {e}")
+            return None, None
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self.get_path(key))
+
+    def delete(self, key: str) -> bool:
+        path = self.get_path(key)
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return True
+        except OSError as e:
+            print(f"Error deleting {path}: {e}")
+            return False
+
+    async def aput(self, key: str, body: bytes, content_type: str = 'application/json',
+                   if_match: Optional[str] = None, if_none_match: Optional[str] = None) -> bool:
+        # Local writes are a small file write and rename, cheaper than a thread hop.
+        return self.put(key, body, content_type, if_match, if_none_match)
+
+    async def aget_with_etag(self, key: str, if_none_match: Optional[str] = None) -> Tuple[Optional[bytes], Optional[str]]:
+        # Local reads are served from the page cache through mmap, cheaper than a thread hop.
+        return self.get_with_etag(key, if_none_match)
+
+
+_backends = {
+    's3': S3Backend,
+    'local': LocalBackend,
+}
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> StorageBackend:
+    """
+    Get the process-wide storage engine selected by DATASTORE_BACKEND in config.py.
+
+    Returns:
+        StorageBackend: The shared storage engine
+    """
+    global _backend
+    if _backend is not None:
+        return _backend
+
+    with _backend_lock:
+        if _backend is None:
+            if DATASTORE_BACKEND not in _backends:
+                raise ValueError(f"Unknown datastore backend: {DATASTORE_BACKEND}")
+            _backend = _backends[DATASTORE_BACKEND]()
+    return _backend
+
+
+def set_backend(backend: Optional[StorageBackend]):
+    """
+    Replace the process-wide storage engine, e.g. to point tests at a local directory.
+    Passing None resets to the engine selected in config.py.
+
+    Args:
+        backend: The storage engine to use
+    """
+    global _backend
+    with _backend_lock:
+        _backend = backend
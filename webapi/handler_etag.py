@@ -0,0 +1,52 @@
+import json
+import hashlib
+
+
+def get_etag(body) -> str:
+    """
+    Build a strong ETag from a response body's content hash.
+    Dictionaries are serialized with sorted keys so equal content always hashes the same.
+    """
+    if isinstance(body, (dict, list)):
+        serialized = json.dumps(body, sort_keys=True, separators=(',', ':'), default=str)
+    else:
+        serialized = str(body)
+    return f'"{hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """
+    Check an ETag against an If-None-Match header, which may list several ETags or '*'.
+    """
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == '*' or candidate == etag:
+            return True
+    return False
+
+
+def apply_etag(event, response):
+    """
+    Add an ETag to a successful GET response, and replace the response with a
+    bodyless 304 when the client already holds the same content.
+    """
+    if response.get('statusCode') != 200:
+        return response
+
+    etag = get_etag(response.get('body'))
+    headers = dict(response.get('headers', {}))
+    headers['ETag'] = etag
+    headers['Cache-Control'] = 'private, no-cache'
+
+    if_none_match = event.get('headers', {}).get('if-none-match', '')
+    if if_none_match and etag_matches(etag, if_none_match):
+        return {
+            'statusCode': 304,
+            'headers': headers
+        }
+
+    response = dict(response)
+    response['headers'] = headers
+    return response
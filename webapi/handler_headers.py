@@ -12,3 +12,19 @@ def get_data_from_headers(headers):
         'player_id': headers.get('player_id', ''),
         'dm_data_id': headers.get('dm_data_id', ''),
     }
+
+def get_body(event):
+    if event.get('isBase64Encoded', False):
+        body = event.get('body', '')
+        return json.loads(base64.b64decode(body).decode('utf-8'))
+
+    body = event.get('body', {})
+    if isinstance(body, str):
+        return json.loads(body)
+    return body
+
+def get_invalid_json_response():
+    return {
+        'statusCode': 400,
+        'body': 'Bad Request: invalid JSON'
+    }
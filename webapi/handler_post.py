@@ -1,25 +1,26 @@
-import json
-import base64
+import asyncio
 from data.game import Game
 from data.player import Player
+from data.storage import WriteConflictError
+from handler_headers import get_body, get_invalid_json_response
+from routes import Request, get_route
 
-def get_body(event):
-    if event.get('isBase64Encoded', False):
-        body = event.get('body', '')
-        return json.loads(base64.b64decode(body).decode('utf-8'))
+def get_expected_version(request_headers):
+    expected_version = request_headers.get('expected_version', '')
+    if expected_version == '':
+        return None
+    return int(expected_version)
 
-    body = event.get('body', {})
-    if isinstance(body, str):
-        return json.loads(body)
-    return body
-
-def handle_post(event, context):
+async def handle_write(event, method, write):
     raw_path = event.get('rawPath', '')
     request_headers = event.get('headers', {})
     game_id = request_headers.get('game_id', '')
     player_id = request_headers.get('player_id', '')
     dm_data_id = request_headers.get('dm_data_id', '')
-    body = get_body(event)
+    try:
+        body = get_body(event)
+    except ValueError:
+        return get_invalid_json_response()
 
     if not game_id or not player_id:
         return {
@@ -27,7 +28,18 @@ def handle_post(event, context):
             'body': 'Bad Request: invalid request'
         }
 
-    game = Game(game_id).get_game_data()
+    try:
+        expected_version = get_expected_version(request_headers)
+    except ValueError:
+        return {
+            'statusCode': 400,
+            'body': 'Bad Request: invalid expected_version'
+        }
+
+    game, player = await asyncio.gather(
+        Game(game_id).aget_data(),
+        Player(player_id).aget_data_dict()
+    )
 
     if not game:
         return {
@@ -42,86 +54,45 @@ def handle_post(event, context):
             'body': 'Bad Request: player not in game'
         }
 
-    player = Player(player_id).get_player_data_dict()
     is_dm = player.get('dungeon_master', False)
 
-    if is_dm and raw_path == '/game/settings':
-        return {
-            'statusCode': 200,
-            'body': Game(game_id).upsert_game_data_dict(body)
-        }
-
-    if is_dm and raw_path == '/game/npcs':
-        from data.npcs import NPCs
+    route = get_route(method, raw_path, is_dm)
+    if route is None or route.entity is None:
         return {
-            'statusCode': 200,
-            'body': NPCs(game_id).upsert_npcs_data_dict(body)
-        }
-
-    if is_dm and raw_path == '/game/quests':
-        from data.quests import Quests
-        return {
-            'statusCode': 200,
-            'body': Quests(game_id).upsert_quests_data_dict(body)
-        }
-
-    if is_dm and raw_path == '/game/events':
-        from data.events import Events
-        return {
-            'statusCode': 200,
-            'body': Events(game_id).upsert_events_data_dict(body)
+            'statusCode': 400,
+            'body': 'Bad Request: Request not supported'
         }
+    entity = route.entity(Request(game_id, player_id, dm_data_id, game, is_dm))
 
-    if is_dm and raw_path == '/game/locations':
-        from data.locations import Locations
+    try:
+        success = await write(entity, body, expected_version)
         return {
             'statusCode': 200,
-            'body': Locations(game_id).upsert_locations_data_dict(body)
+            'body': {
+                'success': success,
+                'version': entity.written_version
+            }
         }
-
-    if is_dm and raw_path == '/game/items':
-        from data.items import Items
+    except WriteConflictError as e:
         return {
-            'statusCode': 200,
-            'body': Items(game_id).upsert_items_data_dict(body)
+            'statusCode': 409,
+            'body': {
+                'error': f'Conflict: {e}',
+                'version': e.current_version
+            }
         }
 
-    if is_dm and raw_path == '/game/monsters':
-        if dm_data_id and is_dm:
-            from data.monster import Monster
-            response = Monster(dm_data_id).upsert_monster_data_dict(body)
-        else:
-            from data.monsters import Monsters
-            response = Monsters(game_id).upsert_monsters_data_dict(body)
-        return {
-            'statusCode': 200,
-            'body': response
-        }
+async def handle_post(event, context):
+    return await handle_write(event, 'POST', lambda entity, body, expected_version: entity.aupsert_data_dict(body, expected_version))
 
-    if is_dm and raw_path == '/game/players':
-        from data.players import Players
+async def handle_patch(event, context):
+    try:
+        patch = get_body(event)
+    except ValueError:
+        return get_invalid_json_response()
+    if not isinstance(patch, dict):
         return {
-            'statusCode': 200,
-            'body': Players(game_id).upsert_players_data_dict(body)
-        }
-
-    if is_dm and raw_path == '/game/notes':
-        from data.notes import Notes
-        return {
-            'statusCode': 200,
-            'body': Notes(game_id).upsert_notes_data_dict(body)
-        }
-
-    if raw_path == '/game/player':
-        player_id_to_target = player_id
-        if dm_data_id and is_dm:
-            player_id_to_target = dm_data_id
-        return {
-            'statusCode': 200,
-            'body': Player(player_id_to_target).upsert_player_data_dict(body)
+            'statusCode': 400,
+            'body': 'Bad Request: merge patch must be a JSON object'
         }
-
-    return {
-        'statusCode': 400,
-        'body': 'Bad Request: Request not supported'
-    }
+    return await handle_write(event, 'PATCH', lambda entity, patch, expected_version: entity.apatch_data_dict(patch, expected_version))
@@ -0,0 +1,46 @@
+import asyncio
+import json
+
+_end_of_stream = object()
+
+async def iterate_in_thread(iterator):
+    """
+    Consume a blocking iterator, such as a model response stream, without
+    blocking the event loop, pulling each item in a worker thread.
+    """
+    iterator = iter(iterator)
+    while True:
+        item = await asyncio.to_thread(next, iterator, _end_of_stream)
+        if item is _end_of_stream:
+            return
+        yield item
+
+def format_event(data):
+    return f"data: {json.dumps(data)}\n\n"
+
+async def get_event_stream_response(deltas):
+    """
+    Build a text/event-stream response with one event per text delta and a final done event.
+
+    Python Lambda function URLs buffer the response, so the events reach the
+    client together once generation finishes. Clients read the body as a
+    stream either way, so they render deltas as they arrive on any host that
+    streams responses.
+    """
+    events = []
+    try:
+        async for delta in deltas:
+            events.append(format_event({'delta': delta}))
+        events.append(format_event({'done': True}))
+    except Exception as e:
+        print(f"Error streaming response: {e}")
+        events.append(format_event({'error': 'The model response was interrupted'}))
+
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+        },
+        'body': ''.join(events)
+    }
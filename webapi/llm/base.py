@@ -0,0 +1,88 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional, Sequence
+from config import LLM_MAX_TOKENS, LLM_TEMPERATURE
+
+class LLMProvider(ABC):
+  """
+  Interface of a language model provider.
+
+  Providers build their clients on first use, so importing or selecting
+  a provider never opens a connection.
+  """
+
+  name = 'base'
+
+  def __init__(self, model_id: str, max_tokens: int = LLM_MAX_TOKENS, temperature: float = LLM_TEMPERATURE):
+    """
+    Initialize the provider.
+
+    Args:
+      model_id: The model to run
+      max_tokens: Default cap on generated tokens
+      temperature: Default sampling temperature
+    """
+    self.model_id = model_id
+    self.max_tokens = max_tokens
+    self.temperature = temperature
+
+  def complete(self, system_message: str, user_text: str,
+               max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+               user_prefix: Sequence[str] = ()) -> str:
+    """
+    Generate the whole response to a prompt.
+
+    Args:
+      system_message: The system prompt
+      user_text: The user message
+      max_tokens: Cap on generated tokens, defaults to the provider's
+      temperature: Sampling temperature, defaults to the provider's
+      user_prefix: Stable leading parts of the user message, least often changing first,
+        which providers with prompt caching reuse between requests
+
+    Returns:
+      str: The response text
+    """
+    return ''.join(self.stream(system_message, user_text, max_tokens, temperature, user_prefix))
+
+  @abstractmethod
+  def stream(self, system_message: str, user_text: str,
+             max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+             user_prefix: Sequence[str] = ()) -> Iterator[str]:
+    """
+    Generate the response to a prompt, yielding text deltas as they are produced.
+
+    Args:
+      system_message: The system prompt
+      user_text: The user message
+      max_tokens: Cap on generated tokens, defaults to the provider's
+      temperature: Sampling temperature, defaults to the provider's
+      user_prefix: Stable leading parts of the user message, least often changing first,
+        which providers with prompt caching reuse between requests
+
+    Returns:
+      Iterator of text deltas
+    """
+
+  def warm(self):
+    """
+    Build the provider's client ahead of the first request.
+    """
+    return None
+
+  def get_stats(self) -> dict:
+    """
+    Get the provider's usage metrics since it was built.
+    """
+    return {}
+
+  def get_max_tokens(self, max_tokens: Optional[int]) -> int:
+    return self.max_tokens if max_tokens is None else max_tokens
+
+  def get_temperature(self, temperature: Optional[float]) -> float:
+    return self.temperature if temperature is None else temperature
+
+def join_user_text(user_prefix: Sequence[str], user_text: str) -> str:
+  """
+  Get the whole user message, for providers that take it as one text.
+  """
+  return '\n'.join([*user_prefix, user_text])
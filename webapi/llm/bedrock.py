@@ -1,33 +1,127 @@
-import boto3
 import json
-from config import BEDROCK_MODEL_ID
-
-bedrock_client = boto3.client('bedrock-runtime', region_name='us-west-2')
-
-def get_inference_bedrock(system_message: str, user_text: str) -> str:
-  json_prompt = json.dumps({
-    'anthropic_version': 'bedrock-2023-05-31',
-    'max_tokens': 4096,
-    'system': system_message,
-    'temperature': 0.5,
-    'messages': [
-      {
-        'role': 'user',
-        'content': [
-          {
-            'type': 'text',
-            'text': user_text
-          }
-        ]
-      }
-    ]
-  })
-  response = bedrock_client.invoke_model(
-    body=json_prompt,
-    modelId=BEDROCK_MODEL_ID,
-    accept='application/json',
-    contentType='application/json'
-  )
-  response_body = json.loads(response['body'].read())
-  response_text = response_body['content'][0]['text']
-  return response_text
+import threading
+from typing import Iterator, Optional, Sequence
+from config import AWS_REGION, BEDROCK_MODEL_ID, BEDROCK_PROMPT_CACHING, BEDROCK_READ_TIMEOUT
+from data.clients import get_client
+from llm.base import LLMProvider
+
+# Bedrock accepts at most four cache breakpoints in a request
+MAX_CACHE_BREAKPOINTS = 4
+USAGE_KEYS = ('input_tokens', 'cache_read_input_tokens', 'cache_creation_input_tokens', 'output_tokens')
+
+class BedrockProvider(LLMProvider):
+  """
+  Anthropic models on Amazon Bedrock, through the process-wide pooled bedrock-runtime client.
+
+  With prompt caching, each stable part of the user message ends with a
+  cache breakpoint, or the system prompt does when there are none, so a
+  request starting with the same parts as a recent one only pays for the
+  parts after them. Callers should only pass parts that stay the same over
+  several requests, since each new part pays the cache write premium.
+  """
+
+  name = 'bedrock'
+
+  def __init__(self, model_id: str = BEDROCK_MODEL_ID, region_name: str = AWS_REGION,
+               prompt_caching: bool = BEDROCK_PROMPT_CACHING, **kwargs):
+    super().__init__(model_id, **kwargs)
+    self.region_name = region_name
+    self.prompt_caching = prompt_caching
+    self.usage = dict.fromkeys(USAGE_KEYS, 0)
+    self.requests = 0
+    self.usage_lock = threading.Lock()
+
+  @property
+  def client(self):
+    return get_client('bedrock-runtime', self.region_name, BEDROCK_READ_TIMEOUT)
+
+  def warm(self):
+    _ = self.client
+
+  def get_content(self, texts: Sequence[str], breakpoints: int) -> list[dict]:
+    """
+    Build text blocks, marking the last breakpoints of them as cache breakpoints.
+    """
+    content = [{'type': 'text', 'text': text} for text in texts]
+    for block in content[len(content) - breakpoints:]:
+      block['cache_control'] = {'type': 'ephemeral'}
+    return content
+
+  def get_request_body(self, system_message: str, user_text: str,
+                       max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+                       user_prefix: Sequence[str] = ()) -> str:
+    user_prefix = [text for text in user_prefix if text]
+    # A breakpoint caches everything before it, so the system prompt only
+    # needs its own when there is no stable user prefix after it
+    prefix_breakpoints = min(len(user_prefix), MAX_CACHE_BREAKPOINTS) if self.prompt_caching else 0
+    system_breakpoints = 1 if self.prompt_caching and not user_prefix else 0
+    return json.dumps({
+      'anthropic_version': 'bedrock-2023-05-31',
+      'max_tokens': self.get_max_tokens(max_tokens),
+      'system': self.get_content([system_message], system_breakpoints),
+      'temperature': self.get_temperature(temperature),
+      'messages': [
+        {
+          'role': 'user',
+          'content': self.get_content(user_prefix, prefix_breakpoints) + self.get_content([user_text], 0)
+        }
+      ]
+    })
+
+  def record_usage(self, usage: dict):
+    with self.usage_lock:
+      self.requests += 1
+      for key in USAGE_KEYS:
+        self.usage[key] += usage.get(key) or 0
+
+  def get_stats(self) -> dict:
+    """
+    Get the token usage of every request so far, and the share of prompt
+    tokens read from the prompt cache.
+    """
+    with self.usage_lock:
+      stats = dict(self.usage, requests=self.requests)
+    prompt_tokens = stats['input_tokens'] + stats['cache_read_input_tokens'] + stats['cache_creation_input_tokens']
+    stats['cache_hit_rate'] = round(stats['cache_read_input_tokens'] / prompt_tokens, 4) if prompt_tokens else 0.0
+    return stats
+
+  def complete(self, system_message: str, user_text: str,
+               max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+               user_prefix: Sequence[str] = ()) -> str:
+    response = self.client.invoke_model(
+      body=self.get_request_body(system_message, user_text, max_tokens, temperature, user_prefix),
+      modelId=self.model_id,
+      accept='application/json',
+      contentType='application/json'
+    )
+    response_body = json.loads(response['body'].read())
+    self.record_usage(response_body.get('usage', {}))
+    response_text = response_body['content'][0]['text']
+    return response_text
+
+  def stream(self, system_message: str, user_text: str,
+             max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+             user_prefix: Sequence[str] = ()) -> Iterator[str]:
+    response = self.client.invoke_model_with_response_stream(
+      body=self.get_request_body(system_message, user_text, max_tokens, temperature, user_prefix),
+      modelId=self.model_id,
+      accept='application/json',
+      contentType='application/json'
+    )
+    # Prompt usage arrives with message_start, and the output tokens with message_delta
+    # Usage is recorded even when the caller closes the stream early
+    usage = {}
+    try:
+      for event in response['body']:
+        chunk = event.get('chunk')
+        if chunk is None:
+          continue
+        payload = json.loads(chunk['bytes'])
+        if payload.get('type') == 'message_start':
+          usage.update(payload.get('message', {}).get('usage', {}))
+        elif payload.get('type') == 'message_delta':
+          usage.update(payload.get('usage', {}))
+        elif payload.get('type') == 'content_block_delta' and payload['delta'].get('type') == 'text_delta':
+          yield payload['delta']['text']
+    finally:
+      self.record_usage(usage)
@@ -0,0 +1,63 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from llm.provider import create_provider
+
+def run_request(provider, system_message: str, user_text: str) -> tuple[float, float, int]:
+  started_at = time.perf_counter()
+  first_token_seconds = None
+  characters = 0
+  for delta in provider.stream(system_message, user_text):
+    if first_token_seconds is None:
+      first_token_seconds = time.perf_counter() - started_at
+    characters += len(delta)
+  return first_token_seconds or 0.0, time.perf_counter() - started_at, characters
+
+def percentile(values: list[float], fraction: float) -> float:
+  ordered = sorted(values)
+  return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def run_benchmark(provider_name: str, requests: int, concurrency: int, **provider_kwargs) -> dict:
+  """
+  Send concurrent streaming requests to a provider and measure time to first token and throughput.
+
+  Args:
+    provider_name: 'bedrock', 'ollama' or 'fake'
+    requests: Number of requests to send
+    concurrency: Requests in flight at once
+    provider_kwargs: Passed to the provider
+
+  Returns:
+    Dict of the measurements
+  """
+  provider = create_provider(provider_name, **provider_kwargs)
+  system_message = 'You are a DnD 5e dungeon master.'
+  started_at = time.perf_counter()
+  with ThreadPoolExecutor(max_workers=concurrency) as executor:
+    results = list(executor.map(
+      lambda i: run_request(provider, system_message, f'Scene {i}: the party enters the tavern. What happens next?'),
+      range(requests)
+    ))
+  elapsed = time.perf_counter() - started_at
+  first_token_seconds = [result[0] for result in results]
+  total_seconds = [result[1] for result in results]
+  return {
+    'provider': provider_name,
+    'requests': requests,
+    'concurrency': concurrency,
+    'requests_per_second': requests / elapsed,
+    'characters_per_second': sum(result[2] for result in results) / elapsed,
+    'first_token_p50': percentile(first_token_seconds, 0.5),
+    'first_token_p99': percentile(first_token_seconds, 0.99),
+    'total_p50': percentile(total_seconds, 0.5),
+    'total_p99': percentile(total_seconds, 0.99),
+  }
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description='Load test a language model provider.')
+  parser.add_argument('--provider', default='fake', help="'bedrock', 'ollama' or 'fake'")
+  parser.add_argument('--requests', type=int, default=32)
+  parser.add_argument('--concurrency', type=int, default=8)
+  args = parser.parse_args()
+  for name, value in run_benchmark(args.provider, args.requests, args.concurrency).items():
+    print(f"{name}: {value:.3f}" if isinstance(value, float) else f"{name}: {value}")
@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterator, Optional, Sequence
+from llm.base import LLMProvider, join_user_text
+
+def get_cache_key(model_id: str, system_message: str, user_text: str, temperature: float, max_tokens: int) -> str:
+  """
+  Get the content address of a model request.
+  """
+  request = json.dumps([model_id, system_message, user_text, temperature, max_tokens], separators=(',', ':'))
+  return hashlib.sha256(request.encode('utf-8')).hexdigest()
+
+class MemoryTier:
+  """
+  An in-process LRU cache of responses with a TTL.
+  """
+
+  def __init__(self, max_entries: int, ttl_seconds: float):
+    self.max_entries = max_entries
+    self.ttl_seconds = ttl_seconds
+    self.entries = OrderedDict()
+    self.lock = threading.Lock()
+
+  def get(self, key: str) -> Optional[str]:
+    with self.lock:
+      entry = self.entries.get(key)
+      if entry is None:
+        return None
+      if entry[1] <= time.monotonic():
+        del self.entries[key]
+        return None
+      self.entries.move_to_end(key)
+      return entry[0]
+
+  def set(self, key: str, response: str):
+    with self.lock:
+      self.entries[key] = (response, time.monotonic() + self.ttl_seconds)
+      self.entries.move_to_end(key)
+      while len(self.entries) > self.max_entries:
+        self.entries.popitem(last=False)
+
+class DiskTier:
+  """
+  Responses stored as files under a directory, expired by TTL and pruned
+  to the least recently used max_entries.
+  """
+
+  def __init__(self, root: str, max_entries: int, ttl_seconds: float):
+    self.root = root
+    self.max_entries = max_entries
+    self.ttl_seconds = ttl_seconds
+    self.lock = threading.Lock()
+    os.makedirs(root, exist_ok=True)
+
+  def get_path(self, key: str) -> str:
+    return os.path.join(self.root, f"{key}.json")
+
+  def get(self, key: str) -> Optional[str]:
+    path = self.get_path(key)
+    try:
+      with open(path, 'r') as f:
+        entry = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+      return None
+    if entry['stored_at'] + self.ttl_seconds <= time.time():
+      try:
+        os.remove(path)
+      except FileNotFoundError:
+        pass
+      return None
+    # The access time drives LRU pruning
+    os.utime(path)
+    return entry['response']
+
+  def set(self, key: str, response: str):
+    fd, temp_path = tempfile.mkstemp(dir=self.root, prefix='.tmp-')
+    with os.fdopen(fd, 'w') as f:
+      json.dump({'response': response, 'stored_at': time.time()}, f)
+    os.replace(temp_path, self.get_path(key))
+    self.prune()
+
+  def prune(self):
+    with self.lock:
+      entries = [entry for entry in os.scandir(self.root) if entry.name.endswith('.json')]
+      if len(entries) <= self.max_entries:
+        return
+      entries.sort(key=lambda entry: entry.stat().st_mtime)
+      for entry in entries[:len(entries) - self.max_entries]:
+        try:
+          os.remove(entry.path)
+        except FileNotFoundError:
+          pass
+
+class DatastoreTier:
+  """
+  Responses shared by every process through the datastore, expired by TTL.
+  """
+
+  def __init__(self, ttl_seconds: float, database: str = 'llm-cache', table: str = 'responses'):
+    self.ttl_seconds = ttl_seconds
+    self.database = database
+    self.table = table
+
+  def get_datastore(self, key: str):
+    from data.datastore import Datastore
+    return Datastore(self.database, self.table, key)
+
+  def get(self, key: str) -> Optional[str]:
+    # The cache is an optimization, so a datastore error is a miss rather than a failed request
+    try:
+      entry = self.get_datastore(key).get()
+    except Exception as e:
+      print(f"Error reading LLM cache entry {key}: {e}")
+      return None
+    if not entry or entry.get('stored_at', 0) + self.ttl_seconds <= time.time():
+      return None
+    return entry.get('response')
+
+  def set(self, key: str, response: str):
+    try:
+      self.get_datastore(key).upsert({'response': response, 'stored_at': time.time()})
+    except Exception as e:
+      print(f"Error storing LLM cache entry {key}: {e}")
+
+class ResponseCache:
+  """
+  A content-addressed cache of model responses over one or more tiers,
+  fastest first. A hit in a slower tier is copied into the faster ones.
+  """
+
+  def __init__(self, tiers: list):
+    self.tiers = tiers
+    self.lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+
+  def get(self, key: str) -> Optional[str]:
+    for i, tier in enumerate(self.tiers):
+      response = tier.get(key)
+      if response is not None:
+        for faster_tier in self.tiers[:i]:
+          faster_tier.set(key, response)
+        with self.lock:
+          self.hits += 1
+        return response
+    with self.lock:
+      self.misses += 1
+    return None
+
+  def set(self, key: str, response: str):
+    for tier in self.tiers:
+      tier.set(key, response)
+
+  def get_stats(self) -> dict:
+    with self.lock:
+      return {'hits': self.hits, 'misses': self.misses}
+
+class CachingProvider(LLMProvider):
+  """
+  Serves repeated identical requests to a provider from a response cache.
+  Streams are stored once they complete, and a cached response is streamed as a single delta.
+  Only requests at temperature 0 are cached, since sampled responses are meant to differ.
+  """
+
+  def __init__(self, provider: LLMProvider, cache: ResponseCache):
+    super().__init__(provider.model_id, provider.max_tokens, provider.temperature)
+    self.name = provider.name
+    self.provider = provider
+    self.cache = cache
+
+  def warm(self):
+    self.provider.warm()
+
+  def get_stats(self) -> dict:
+    return dict(self.provider.get_stats(), response_cache=self.cache.get_stats())
+
+  def get_key(self, system_message: str, user_text: str, max_tokens: Optional[int],
+              temperature: Optional[float], user_prefix: Sequence[str]) -> str:
+    return get_cache_key(self.provider.model_id, system_message, join_user_text(user_prefix, user_text),
+                         self.provider.get_temperature(temperature), self.provider.get_max_tokens(max_tokens))
+
+  def is_cacheable(self, temperature: Optional[float]) -> bool:
+    return self.provider.get_temperature(temperature) == 0
+
+  def complete(self, system_message: str, user_text: str,
+               max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+               user_prefix: Sequence[str] = ()) -> str:
+    if not self.is_cacheable(temperature):
+      return self.provider.complete(system_message, user_text, max_tokens, temperature, user_prefix)
+    key = self.get_key(system_message, user_text, max_tokens, temperature, user_prefix)
+    response = self.cache.get(key)
+    if response is None:
+      response = self.provider.complete(system_message, user_text, max_tokens, temperature, user_prefix)
+      self.cache.set(key, response)
+    return response
+
+  def stream(self, system_message: str, user_text: str,
+             max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+             user_prefix: Sequence[str] = ()) -> Iterator[str]:
+    if not self.is_cacheable(temperature):
+      yield from self.provider.stream(system_message, user_text, max_tokens, temperature, user_prefix)
+      return
+    key = self.get_key(system_message, user_text, max_tokens, temperature, user_prefix)
+    response = self.cache.get(key)
+    if response is not None:
+      yield response
+      return
+    deltas = []
+    for delta in self.provider.stream(system_message, user_text, max_tokens, temperature, user_prefix):
+      deltas.append(delta)
+      yield delta
+    self.cache.set(key, ''.join(deltas))
+
+def create_response_cache(tier_names: list[str], max_entries: int, ttl_seconds: float, directory: str) -> ResponseCache:
+  """
+  Build a response cache from tier names, in the order given.
+
+  Args:
+    tier_names: Any of 'memory', 'disk' and 'datastore'
+    max_entries: Most responses kept by the memory and disk tiers
+    ttl_seconds: Seconds a response is served for
+    directory: Directory of the disk tier
+
+  Returns:
+    The response cache
+  """
+  tiers = []
+  for name in tier_names:
+    if name == 'memory':
+      tiers.append(MemoryTier(max_entries, ttl_seconds))
+    elif name == 'disk':
+      tiers.append(DiskTier(directory, max_entries, ttl_seconds))
+    elif name == 'datastore':
+      tiers.append(DatastoreTier(ttl_seconds))
+    else:
+      raise ValueError(f"Unknown LLM cache tier: {name}")
+  return ResponseCache(tiers)
@@ -0,0 +1,43 @@
+import hashlib
+import time
+from typing import Iterator, Optional, Sequence
+from config import LLM_FAKE_FIRST_TOKEN_SECONDS, LLM_FAKE_TOKEN_SECONDS
+from llm.base import LLMProvider, join_user_text
+
+WORDS = [
+  'the', 'tavern', 'falls', 'silent', 'as', 'a', 'hooded', 'stranger', 'steps', 'inside',
+  'rain', 'drips', 'from', 'her', 'cloak', 'and', 'she', 'asks', 'for', 'the', 'ranger',
+  'by', 'name', 'somewhere', 'below', 'the', 'floorboards', 'something', 'stirs',
+]
+
+class FakeProvider(LLMProvider):
+  """
+  An offline provider for tests and load tests.
+
+  Responses are deterministic for a prompt and streamed word by word,
+  after a configurable time to first token and with a delay between tokens.
+  """
+
+  name = 'fake'
+
+  def __init__(self, model_id: str = 'fake', first_token_seconds: float = LLM_FAKE_FIRST_TOKEN_SECONDS,
+               token_seconds: float = LLM_FAKE_TOKEN_SECONDS, **kwargs):
+    super().__init__(model_id, **kwargs)
+    self.first_token_seconds = first_token_seconds
+    self.token_seconds = token_seconds
+
+  def get_words(self, system_message: str, user_text: str, max_tokens: Optional[int]) -> list[str]:
+    digest = hashlib.sha256(f'{self.model_id}\n{system_message}\n{user_text}'.encode('utf-8')).digest()
+    word_count = min(self.get_max_tokens(max_tokens), 8 + digest[0] % 24)
+    return [WORDS[(digest[i % len(digest)] + i) % len(WORDS)] for i in range(word_count)]
+
+  def stream(self, system_message: str, user_text: str,
+             max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+             user_prefix: Sequence[str] = ()) -> Iterator[str]:
+    time.sleep(self.first_token_seconds)
+    for i, word in enumerate(self.get_words(system_message, join_user_text(user_prefix, user_text), max_tokens)):
+      if i:
+        time.sleep(self.token_seconds)
+        yield ' ' + word
+      else:
+        yield word.capitalize()
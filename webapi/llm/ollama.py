@@ -0,0 +1,72 @@
+import threading
+from typing import Iterator, Optional, Sequence
+from config import OLLAMA_MODEL
+from llm.base import LLMProvider, join_user_text
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_ollama_client(host: Optional[str] = None):
+  """
+  Get a process-wide Ollama client for a host, importing the ollama package on first use.
+  """
+  client = _clients.get(host)
+  if client is None:
+    with _clients_lock:
+      client = _clients.get(host)
+      if client is None:
+        import ollama
+        client = ollama.Client(host=host)
+        _clients[host] = client
+  return client
+
+class OllamaProvider(LLMProvider):
+  """
+  Models served by a local or remote Ollama server.
+  """
+
+  name = 'ollama'
+
+  def __init__(self, model_id: str = OLLAMA_MODEL, host: Optional[str] = None, **kwargs):
+    super().__init__(model_id, **kwargs)
+    self.host = host
+
+  @property
+  def client(self):
+    return get_ollama_client(self.host)
+
+  def warm(self):
+    _ = self.client
+
+  def get_messages(self, system_message: str, user_text: str) -> list[dict]:
+    return [
+      {'role': 'system', 'content': system_message},
+      {'role': 'user', 'content': user_text},
+    ]
+
+  def get_options(self, max_tokens: Optional[int], temperature: Optional[float]) -> dict:
+    return {
+      'num_predict': self.get_max_tokens(max_tokens),
+      'temperature': self.get_temperature(temperature),
+    }
+
+  def complete(self, system_message: str, user_text: str,
+               max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+               user_prefix: Sequence[str] = ()) -> str:
+    response = self.client.chat(
+      model=self.model_id,
+      messages=self.get_messages(system_message, join_user_text(user_prefix, user_text)),
+      options=self.get_options(max_tokens, temperature)
+    )
+    return response['message']['content']
+
+  def stream(self, system_message: str, user_text: str,
+             max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+             user_prefix: Sequence[str] = ()) -> Iterator[str]:
+    for chunk in self.client.chat(
+      model=self.model_id,
+      messages=self.get_messages(system_message, join_user_text(user_prefix, user_text)),
+      options=self.get_options(max_tokens, temperature),
+      stream=True
+    ):
+      yield chunk['message']['content']
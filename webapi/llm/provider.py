@@ -0,0 +1,61 @@
+import threading
+from typing import Iterator, Optional, Sequence
+from config import LLM_CACHE_DIR, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TIERS, LLM_CACHE_TTL_SECONDS, LLM_PROVIDER
+from llm.base import LLMProvider
+
+_provider = None
+_provider_lock = threading.Lock()
+
+def create_provider(name: str, **kwargs) -> LLMProvider:
+  """
+  Build a provider by name.
+
+  Args:
+    name: 'bedrock', 'ollama' or 'fake'
+    kwargs: Passed to the provider, e.g. model_id, max_tokens or temperature
+
+  Returns:
+    The provider
+  """
+  if name == 'bedrock':
+    from llm.bedrock import BedrockProvider
+    return BedrockProvider(**kwargs)
+  if name == 'ollama':
+    from llm.ollama import OllamaProvider
+    return OllamaProvider(**kwargs)
+  if name == 'fake':
+    from llm.fake import FakeProvider
+    return FakeProvider(**kwargs)
+  raise ValueError(f"Unknown LLM provider: {name}")
+
+def get_provider() -> LLMProvider:
+  """
+  Get the process-wide provider selected by LLM_PROVIDER, behind the
+  response cache when LLM_CACHE_TIERS lists any tiers.
+  """
+  global _provider
+  if _provider is None:
+    with _provider_lock:
+      if _provider is None:
+        provider = create_provider(LLM_PROVIDER)
+        tier_names = [name.strip() for name in LLM_CACHE_TIERS.split(',') if name.strip()]
+        if tier_names:
+          from llm.cache import CachingProvider, create_response_cache
+          cache = create_response_cache(tier_names, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_SECONDS, LLM_CACHE_DIR)
+          provider = CachingProvider(provider, cache)
+        _provider = provider
+  return _provider
+
+def set_provider(provider: Optional[LLMProvider]):
+  """
+  Replace the process-wide provider. Passing None restores the configured provider on next use.
+  """
+  global _provider
+  with _provider_lock:
+    _provider = provider
+
+def get_inference(system_message: str, user_text: str, user_prefix: Sequence[str] = ()) -> str:
+  return get_provider().complete(system_message, user_text, user_prefix=user_prefix)
+
+def stream_inference(system_message: str, user_text: str, user_prefix: Sequence[str] = ()) -> Iterator[str]:
+  return get_provider().stream(system_message, user_text, user_prefix=user_prefix)
@@ -1,16 +1,46 @@
 import asyncio
-from handler_get import handle_get
-from handler_post import handle_post
-from utility import upsert_player
+from config import LAMBDA_PREWARM
+from data.storage import get_backend
+from handler_get import handle_get, get_method, get_raw_path
+from handler_etag import apply_etag
+from routes import is_read_route
+
+write_methods = ('POST', 'PATCH')
+
+# One event loop for the lifetime of the execution environment, so the async
+# clients bound to it keep their connection pools across warm invocations.
+event_loop = asyncio.new_event_loop()
+asyncio.set_event_loop(event_loop)
+
+def run(coroutine):
+    return event_loop.run_until_complete(coroutine)
+
+def get_write_handler(method):
+    # Writes are the rare path, so their handlers load on first use
+    from handler_post import handle_post, handle_patch
+    return {
+        'POST': handle_post,
+        'PATCH': handle_patch,
+    }[method]
+
+def prewarm():
+    """
+    Build the datastore clients during Lambda init, so the first request
+    doesn't pay for importing boto3 and opening the connection pools.
+    """
+    run(get_backend().awarm())
 
 def lambda_handler(event, context):
     print(f"Event: {event}")
     print(f"Context: {context}")
 
-    if event.get('requestContext', {}).get('http', {}).get('method') == 'GET':
-        return asyncio.run(handle_get(event, context))
-    elif event.get('requestContext', {}).get('http', {}).get('method') == 'POST':
-        return handle_post(event, context)
+    method = get_method(event)
+    if method == 'GET':
+        return apply_etag(event, run(handle_get(event, context)))
+    elif is_read_route(method, get_raw_path(event)):
+        return run(handle_get(event, context))
+    elif method in write_methods:
+        return run(get_write_handler(method)(event, context))
     else:
         return {
             'statusCode': 400,
@@ -18,7 +48,12 @@ def lambda_handler(event, context):
         }
 
 
+if LAMBDA_PREWARM:
+    prewarm()
+
+
 if __name__ == "__main__":
+    from utility import upsert_player
     ret = upsert_player('test')
     print(ret)
     print("Done")
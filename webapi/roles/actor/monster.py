@@ -1,16 +1,26 @@
-from llm.bedrock import get_inference_bedrock
+from typing import Iterator
+from llm.provider import get_inference, stream_inference
 from data.monster import Monster
 
 def get_monster_dialogue(monster_info: str, story_string: str) -> str:
   system_message = get_system_message()
-  user_message = get_user_message(monster_info, story_string)
-  return get_inference_bedrock(system_message, user_message)
+  user_message = get_user_message(story_string)
+  return get_inference(system_message, user_message, get_user_prefix(monster_info))
+
+def stream_monster_dialogue(monster_info: str, story_string: str) -> Iterator[str]:
+  system_message = get_system_message()
+  user_message = get_user_message(story_string)
+  return stream_inference(system_message, user_message, get_user_prefix(monster_info))
 
 def get_system_message() -> str:
   return "You are a monster. You are playing the role of a monster in a game of Dungeons & Dragons."
 
-def get_user_message(monster_info: str, story_string: str) -> str:
-  return f"Monster info: {monster_info}\nStory: {story_string}\n\nWhat do you say?"
+def get_user_prefix(monster_info: str) -> list[str]:
+  # The monster info is the same every time it speaks, so it is cached as a prompt prefix
+  return [f"Monster info: {monster_info}"]
+
+def get_user_message(story_string: str) -> str:
+  return f"Story: {story_string}\n\nWhat do you say?"
 
 def get_monster(monster_id: str) -> dict:
     monster = Monster(monster_id)
@@ -1,16 +1,26 @@
-from llm.bedrock import get_inference_bedrock
+from typing import Iterator
+from llm.provider import get_inference, stream_inference
 from data.npc import NPC
 
 def get_npc_dialogue(npc_info: str, story_string: str) -> str:
   system_message = get_system_message()
-  user_message = get_user_message(npc_info, story_string)
-  return get_inference_bedrock(system_message, user_message)
+  user_message = get_user_message(story_string)
+  return get_inference(system_message, user_message, get_user_prefix(npc_info))
+
+def stream_npc_dialogue(npc_info: str, story_string: str) -> Iterator[str]:
+  system_message = get_system_message()
+  user_message = get_user_message(story_string)
+  return stream_inference(system_message, user_message, get_user_prefix(npc_info))
 
 def get_system_message() -> str:
   return "You are an NPC (Non-Player Character). You are playing the role of a character in a game of Dungeons & Dragons."
 
-def get_user_message(npc_info: str, story_string: str) -> str:
-  return f"NPC info: {npc_info}\nStory: {story_string}\n\nWhat do you say?"
+def get_user_prefix(npc_info: str) -> list[str]:
+  # The NPC info is the same every time it speaks, so it is cached as a prompt prefix
+  return [f"NPC info: {npc_info}"]
+
+def get_user_message(story_string: str) -> str:
+  return f"Story: {story_string}\n\nWhat do you say?"
 
 def get_npc(npc_id: str) -> dict:
     npc = NPC(npc_id)
@@ -0,0 +1,402 @@
+import asyncio
+import json
+from urllib.parse import parse_qs, urlsplit
+from data.game import Game
+from data.player import Player
+from data.events import Events
+from data.items import Items
+from data.locations import Locations
+from data.monster import Monster
+from data.monsters import Monsters
+from data.notes import Notes
+from data.npc import NPC
+from data.npcs import NPCs
+from data.players import Players
+from data.quests import Quests
+from ui.navigation import get_navigation
+
+BATCH_MAX_PATHS = 20
+
+
+class Request:
+    """
+    A request passed to every route handler.
+
+    The game and the player's role may still be loading when a handler
+    starts, so handlers await get_game and get_is_dm only when they need them.
+    """
+
+    def __init__(self, game_id: str, player_id: str, dm_data_id: str, game=None, is_dm: bool = False,
+                 game_task=None, player_task=None, query_string_parameters: dict = None,
+                 raw_query_string: str = '', body=None):
+        self.game_id = game_id
+        self.player_id = player_id
+        self.dm_data_id = dm_data_id
+        self.game = game
+        self.is_dm = is_dm
+        self.game_task = game_task
+        self.player_task = player_task
+        self.query_string_parameters = query_string_parameters or {}
+        self.raw_query_string = raw_query_string
+        self.body = body
+
+    async def get_game(self):
+        if self.game_task is not None:
+            self.game = await self.game_task
+        return self.game
+
+    async def get_is_in_game(self) -> bool:
+        game = await self.get_game()
+        return bool(game) and self.player_id in game.data.get('players', [])
+
+    async def get_is_dm(self) -> bool:
+        if self.player_task is not None:
+            player = await self.player_task
+            self.is_dm = player.get('dungeon_master', False)
+        return self.is_dm
+
+    def for_path(self, query_string_parameters: dict) -> 'Request':
+        """
+        Copy the request for another path of a batch, with that path's query parameters.
+        """
+        return Request(
+            self.game_id, self.player_id, self.dm_data_id, self.game, self.is_dm,
+            self.game_task, self.player_task, query_string_parameters
+        )
+
+    def as_dm(self) -> 'Request':
+        """
+        Copy the request assuming the player is the dungeon master, to start
+        fetching a DM-only route before the player's role is known.
+        """
+        return Request(
+            self.game_id, self.player_id, self.dm_data_id, self.game, True,
+            self.game_task, None, self.query_string_parameters,
+            self.raw_query_string, self.body
+        )
+
+
+class Route:
+    """
+    A route in the web API.
+
+    Routes with an entity serve GET by reading the entity, and POST and PATCH
+    by writing it. Routes with a custom get handler only serve GET, unless
+    other methods are listed. Routes with a navigation entry appear in the
+    website navigation for the players allowed to use them. Prefetched routes
+    only read the datastore, so they may start before the player is known
+    to be in the game.
+    """
+
+    def __init__(self, path: str, entity=None, get=None, dm_only: bool = False, navigation: dict = None, methods: tuple = None,
+                 prefetch: bool = None):
+        """
+        Initialize the route.
+
+        Args:
+            path: The request path, e.g. '/game/npcs'
+            entity: Builds the BaseDatastore for a Request
+            get: Async handler returning the response for a Request, defaults to reading the entity
+            dm_only: Whether only the dungeon master may use the route
+            navigation: Website navigation entry with 'name' and 'path'
+            methods: HTTP methods served, defaults to GET, POST and PATCH for entity routes and GET otherwise
+            prefetch: Whether reads may start alongside the authorization lookups, defaults to True for entity routes
+        """
+        self.path = path
+        self.entity = entity
+        self.get = get
+        self.dm_only = dm_only
+        self.navigation = navigation
+        self.methods = methods or (('GET', 'POST', 'PATCH') if entity else ('GET',))
+        self.prefetch = entity is not None if prefetch is None else prefetch
+
+    def is_allowed(self, is_dm: bool) -> bool:
+        return is_dm or not self.dm_only
+
+    async def handle_get(self, request: Request):
+        if self.get:
+            return await self.get(request)
+        if request.dm_data_id:
+            await request.get_is_dm()
+        entity_data = await self.entity(request).aget_data()
+        return {
+            'statusCode': 200,
+            'body': entity_data.to_dict()
+        }
+
+
+def get_current_data(data_dict):
+    """
+    Extract current data from a data dictionary.
+    Filters data to only include items marked as 'current: True'.
+    
+    Args:
+        data_dict: Dictionary containing data with 'current' flags
+        
+    Returns:
+        Dictionary with only current data
+    """
+    if 'data' in data_dict and isinstance(data_dict['data'], dict):
+        filtered_data = {}
+        for key, value in data_dict['data'].items():
+            if isinstance(value, dict) and value.get('current', False):
+                filtered_data[key] = value
+        data_dict['data'] = filtered_data
+    return data_dict
+
+
+def split_path(path):
+    parsed_path = urlsplit(path)
+    query_string_parameters = {key: values[-1] for key, values in parse_qs(parsed_path.query).items()}
+    return '/' + parsed_path.path.lstrip('/'), query_string_parameters
+
+
+async def get_loadgame(request):
+    locations, players, events, game, is_dm = await asyncio.gather(
+        Locations(request.game_id).aget_data(),
+        Players(request.game_id).aget_data(),
+        Events(request.game_id).aget_data(),
+        request.get_game(),
+        request.get_is_dm()
+    )
+
+    body_response = {
+        'game': game.to_dict(),
+        'navigation': get_navigation(is_dm),
+        'locations': get_current_data(locations.to_dict()),
+        'players': get_current_data(players.to_dict()),
+        'events': get_current_data(events.to_dict()),
+    }
+
+    if is_dm == True:
+        body_response['is_dm'] = is_dm
+
+    return {
+        'statusCode': 200,
+        'body': body_response
+    }
+
+
+async def get_game(request):
+    game = await request.get_game()
+    return {
+        'statusCode': 200,
+        'body': game.to_dict()
+    }
+
+
+async def get_navigation_response(request):
+    return {
+        'statusCode': 200,
+        'body': get_navigation(await request.get_is_dm())
+    }
+
+
+async def get_reference(request):
+    from data.dnd_5e_srd.resource import get_resource_data
+
+    reference_database = request.query_string_parameters.get('database', 'index')
+    reference_table = request.query_string_parameters.get('table', 'index')
+    reference_resource = request.query_string_parameters.get('resource', 'index')
+    reference_data = await asyncio.to_thread(get_resource_data, reference_database, reference_table, reference_resource)
+    return {
+        'statusCode': 200,
+        'body': {
+            'data': reference_data
+        }
+    }
+
+
+async def get_reference_search(request):
+    from data.dnd_5e_srd.search import SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT, get_search_index
+
+    query = ''
+    filters = {}
+    ranges = {}
+    try:
+        limit = min(int(request.query_string_parameters.get('limit', SEARCH_DEFAULT_LIMIT)), SEARCH_MAX_LIMIT)
+        offset = int(request.query_string_parameters.get('offset', 0))
+        for key, value in request.query_string_parameters.items():
+            if key == 'q':
+                query = value
+            elif key.endswith('_min'):
+                ranges.setdefault(key[:-len('_min')], [None, None])[0] = float(value)
+            elif key.endswith('_max'):
+                ranges.setdefault(key[:-len('_max')], [None, None])[1] = float(value)
+            elif key not in ('limit', 'offset'):
+                filters[key] = value
+    except ValueError:
+        return {
+            'statusCode': 400,
+            'body': 'Bad Request: limit, offset and _min/_max filters must be numbers'
+        }
+
+    if limit < 1 or offset < 0:
+        return {
+            'statusCode': 400,
+            'body': 'Bad Request: invalid limit or offset'
+        }
+
+    search_index = await asyncio.to_thread(get_search_index)
+    return {
+        'statusCode': 200,
+        'body': search_index.search(query, filters, ranges, limit, offset)
+    }
+
+
+async def get_dialogue(request):
+    # The DM and game membership checks happen here rather than through
+    # dm_only, so a model call is never started speculatively for a player who
+    # turns out not to be the DM of this game
+    if not await request.get_is_in_game() or not await request.get_is_dm():
+        return get_not_supported_response()
+
+    body = request.body if isinstance(request.body, dict) else {}
+    role = body.get('role')
+    character_id = body.get('id', '')
+    story = body.get('story', '')
+    if role not in ('npc', 'monster') or not character_id or not isinstance(story, str):
+        return {
+            'statusCode': 400,
+            'body': "Bad Request: dialogue requires a role of 'npc' or 'monster', an id and a story"
+        }
+
+    from handler_stream import get_event_stream_response, iterate_in_thread
+    if role == 'npc':
+        from roles.actor.npc import stream_npc_dialogue as stream_dialogue
+        character = NPC(character_id)
+    else:
+        from roles.actor.monster import stream_monster_dialogue as stream_dialogue
+        character = Monster(character_id)
+
+    character_info = json.dumps(await character.aget_data_dict())
+    return await get_event_stream_response(iterate_in_thread(stream_dialogue(character_info, story)))
+
+
+async def get_batch(request):
+    if isinstance(request.body, dict):
+        paths = request.body.get('paths', [])
+    elif request.body is not None:
+        paths = request.body
+    else:
+        paths = parse_qs(request.raw_query_string).get('path', [])
+
+    if not isinstance(paths, list) or not paths or len(paths) > BATCH_MAX_PATHS:
+        return {
+            'statusCode': 400,
+            'body': f'Bad Request: batch requires 1 to {BATCH_MAX_PATHS} paths'
+        }
+
+    async def get_batch_response(path):
+        raw_path, query_string_parameters = split_path(path)
+        if raw_path == '/batch':
+            return get_not_supported_response()
+        return await get_response('GET', raw_path, request.for_path(query_string_parameters))
+
+    responses = await asyncio.gather(*[get_batch_response(path) for path in paths])
+    return {
+        'statusCode': 200,
+        'body': {
+            'responses': dict(zip(paths, responses))
+        }
+    }
+
+
+def get_monsters_entity(request):
+    if request.dm_data_id and request.is_dm:
+        return Monster(request.dm_data_id)
+    return Monsters(request.game_id)
+
+
+def get_player_entity(request):
+    if request.dm_data_id and request.is_dm:
+        return Player(request.dm_data_id)
+    return Player(request.player_id)
+
+
+# Navigation entries are listed in the order they appear on the website.
+ROUTES = [
+    Route('/loadgame', get=get_loadgame, prefetch=True),
+    Route('/batch', get=get_batch, methods=('GET', 'POST')),
+    Route('/navigation', get=get_navigation_response, prefetch=True),
+    Route('/game', get=get_game, prefetch=True, navigation={'name': 'Game', 'path': '/game/index.html'}),
+    Route('/game/player', entity=get_player_entity, navigation={'name': 'Player', 'path': '/game/player.html'}),
+    Route('/reference', get=get_reference, navigation={'name': 'Reference', 'path': '/reference/index.html'}),
+    Route('/reference/search', get=get_reference_search),
+    Route('/game/players', entity=lambda request: Players(request.game_id), dm_only=True, navigation={'name': 'Players', 'path': '/game/players.html'}),
+    Route('/game/monsters', entity=get_monsters_entity, dm_only=True, navigation={'name': 'Monsters', 'path': '/game/monsters.html'}),
+    Route('/game/items', entity=lambda request: Items(request.game_id), dm_only=True, navigation={'name': 'Items', 'path': '/game/items.html'}),
+    Route('/game/locations', entity=lambda request: Locations(request.game_id), dm_only=True, navigation={'name': 'Locations', 'path': '/game/locations.html'}),
+    Route('/game/events', entity=lambda request: Events(request.game_id), dm_only=True, navigation={'name': 'Events', 'path': '/game/events.html'}),
+    Route('/game/quests', entity=lambda request: Quests(request.game_id), dm_only=True, navigation={'name': 'Quests', 'path': '/game/quests.html'}),
+    Route('/game/npcs', entity=lambda request: NPCs(request.game_id), dm_only=True, navigation={'name': 'NPCs', 'path': '/game/npcs.html'}),
+    Route('/game/settings', entity=lambda request: Game(request.game_id), dm_only=True, navigation={'name': 'Settings', 'path': '/game/settings.html'}),
+    Route('/game/notes', entity=lambda request: Notes(request.game_id), dm_only=True, navigation={'name': 'Notes', 'path': '/game/notes.html'}),
+    Route('/game/dialogue', get=get_dialogue, methods=('POST',)),
+]
+
+routes = {(method, route.path): route for route in ROUTES for method in route.methods}
+
+
+def get_route(method: str, raw_path: str, is_dm: bool):
+    """
+    Look up the route for a request.
+
+    Returns:
+        The Route, or None if there is no such route or the player may not use it
+    """
+    route = routes.get((method, raw_path))
+    if route is None or not route.is_allowed(is_dm):
+        return None
+    return route
+
+
+def discard_task(task):
+    """
+    Cancel a speculative task whose result is no longer wanted, without
+    leaving an unretrieved exception behind if it already failed.
+    """
+    task.cancel()
+    task.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+
+def get_not_supported_response():
+    return {
+        'statusCode': 400,
+        'body': 'Bad Request: Request not supported'
+    }
+
+
+def is_prefetch_route(method: str, raw_path: str) -> bool:
+    """
+    Check if a read request may start before the player is known to be in the game.
+    """
+    route = routes.get((method, raw_path))
+    return route is not None and route.prefetch
+
+
+def is_read_route(method: str, raw_path: str) -> bool:
+    """
+    Check if a request reads data, so it is served by handle_get whatever its method.
+    """
+    route = routes.get((method, raw_path))
+    return method == 'GET' or (route is not None and route.entity is None)
+
+
+async def get_response(method: str, raw_path: str, request: Request):
+    """
+    Serve a read request. DM-only routes start fetching their data while the
+    player's role is still loading, and the result is discarded if the player
+    turns out not to be the dungeon master.
+    """
+    route = routes.get((method, raw_path))
+    if route is None:
+        return get_not_supported_response()
+    if not route.dm_only:
+        return await route.handle_get(request)
+
+    response_task = asyncio.ensure_future(route.handle_get(request.as_dm()))
+    if not await request.get_is_dm():
+        discard_task(response_task)
+        return get_not_supported_response()
+    return await response_task
@@ -0,0 +1,57 @@
+"""
+Tests for the asyncio datastore API.
+"""
+
+import asyncio
+import pytest
+from data.cache import datastore_cache
+from data.player import Player
+from data.storage import LocalBackend, WriteConflictError, set_backend
+
+
+@pytest.fixture
+def local_backend(tmp_path):
+    backend = LocalBackend(str(tmp_path))
+    set_backend(backend)
+    datastore_cache.clear()
+    yield backend
+    set_backend(None)
+    datastore_cache.clear()
+
+
+def test_async_round_trip_matches_sync_api(local_backend):
+    player = Player('async-player')
+
+    async def write_and_read():
+        assert await player.aupsert_data_dict({'name': 'Remmie'})
+        return await player.aget_data()
+
+    data = asyncio.run(write_and_read())
+    assert data.data == {'name': 'Remmie'}
+    assert data.version == 1
+    assert player.get_player_data_dict() == {'name': 'Remmie'}
+
+
+def test_async_read_of_missing_data(local_backend):
+    assert asyncio.run(Player('missing-player').aget_data_dict()) == {}
+
+
+def test_async_expected_version_conflict(local_backend):
+    player = Player('async-player')
+    player.upsert_player_data_dict({'name': 'Remmie'})
+
+    with pytest.raises(WriteConflictError) as conflict:
+        asyncio.run(player.aupsert_data_dict({'hit_points': 4}, expected_version=0))
+
+    assert conflict.value.current_version == 1
+
+
+def test_concurrent_async_reads(local_backend):
+    for player_id in ('one', 'two', 'three'):
+        Player(player_id).upsert_player_data_dict({'name': player_id})
+    datastore_cache.clear()
+
+    async def read_all():
+        return await asyncio.gather(*(Player(player_id).aget_data_dict() for player_id in ('one', 'two', 'three')))
+
+    assert [data['name'] for data in asyncio.run(read_all())] == ['one', 'two', 'three']
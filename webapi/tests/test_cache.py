@@ -0,0 +1,80 @@
+"""
+Tests for the in-process datastore cache.
+"""
+
+import time
+from data.cache import DatastoreCache, datastore_cache
+from data.game import Game
+from data.storage import LocalBackend, set_backend
+
+
+def test_cache_returns_copies():
+    cache = DatastoreCache(4, {'default': 60})
+    cache.set('a', {'data': {'hp': 10}}, 60)
+
+    value = cache.get('a')
+    value['data']['hp'] = 0
+
+    assert cache.get('a') == {'data': {'hp': 10}}
+    assert cache.get_stats()['hits'] == 2
+
+
+def test_cache_lru_eviction_and_ttl():
+    cache = DatastoreCache(2, {'default': 60})
+    cache.set('a', {'v': 1}, 60)
+    cache.set('b', {'v': 2}, 60)
+    cache.get('a')
+    cache.set('c', {'v': 3}, 60)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == {'v': 1}
+    assert cache.get_stats()['evictions'] == 1
+
+    cache.set('d', {'v': 4}, 0.01)
+    time.sleep(0.02)
+    assert cache.get('d') is None
+
+
+def test_cache_ttl_patterns():
+    cache = DatastoreCache(2, {'game-data': 30, 'dnd-5e-srd-2014*': 3600, 'default': 5})
+
+    assert cache.get_ttl('games', 'game-data') == 30
+    assert cache.get_ttl('dnd-5e-srd-2014-classes', 'ranger') == 3600
+    assert cache.get_ttl('notes', 'notes-data') == 5
+
+
+def test_base_datastore_invalidates_on_upsert(tmp_path):
+    set_backend(LocalBackend(str(tmp_path)))
+    datastore_cache.clear()
+    try:
+        game = Game('cache-test')
+        game.upsert_game_data_dict({'name': 'Fand'})
+        assert game.get_game_data_dict() == {'name': 'Fand'}
+        assert game.get_game_data_dict() == {'name': 'Fand'}
+        assert datastore_cache.get_stats()['hits'] == 1
+
+        game.upsert_game_data_dict({'name': 'Munster'})
+        assert game.get_game_data_dict() == {'name': 'Munster'}
+    finally:
+        set_backend(None)
+        datastore_cache.clear()
+
+
+def test_base_datastore_revalidates_expired_entries(tmp_path):
+    set_backend(LocalBackend(str(tmp_path)))
+    datastore_cache.clear()
+    original_ttls = datastore_cache.ttl_seconds
+    datastore_cache.ttl_seconds = {'default': 0}
+    try:
+        game = Game('etag-test')
+        game.upsert_game_data_dict({'name': 'Fand'})
+        assert game.get_game_data_dict() == {'name': 'Fand'}
+        assert game.get_game_data_dict() == {'name': 'Fand'}
+
+        stats = datastore_cache.get_stats()
+        assert stats['hits'] == 0
+        assert stats['revalidations'] == 1
+    finally:
+        datastore_cache.ttl_seconds = original_ttls
+        set_backend(None)
+        datastore_cache.clear()
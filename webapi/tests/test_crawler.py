@@ -0,0 +1,89 @@
+"""
+Tests for the concurrent SRD crawler.
+"""
+
+import json
+import os
+import time
+import pytest
+from data.cache import datastore_cache
+from data.dnd_5e_srd.crawler import Crawler, TokenBucket, store_resource
+from data.dnd_5e_srd.resource import Dnd5eResource
+from data.storage import LocalBackend, set_backend
+
+API = {
+    '': {'classes': '/api/2014/classes', 'spells': '/api/2014/spells'},
+    'classes': {'results': [{'index': 'ranger', 'url': '/api/2014/classes/ranger'}]},
+    'classes/ranger': {'index': 'ranger', 'class_levels': '/api/2014/classes/ranger/levels'},
+    'classes/ranger/levels': [{'level': 1, 'url': '/api/2014/classes/ranger/levels/1'}],
+    'classes/ranger/levels/1': {'level': 1},
+    'spells': {'results': [{'index': 'fireball', 'url': '/api/2014/spells/fireball'}]},
+    'spells/fireball': {'index': 'fireball', 'level': 3},
+}
+
+
+def test_token_bucket_limits_the_rate():
+    token_bucket = TokenBucket(rate=50, capacity=1)
+    started_at = time.monotonic()
+    for _ in range(6):
+        token_bucket.acquire()
+    assert time.monotonic() - started_at >= 0.09
+
+
+def test_interrupted_crawl_resumes_from_progress(tmp_path):
+    progress_path = str(tmp_path / 'progress.json')
+    resources = {}
+
+    def failing_fetch_json(api_path):
+        if api_path.startswith('spells'):
+            raise KeyboardInterrupt
+        return API.get(api_path)
+
+    with pytest.raises(KeyboardInterrupt):
+        Crawler(failing_fetch_json, workers=1, rate=None, progress_path=progress_path).crawl(resources.__setitem__)
+    assert os.path.exists(progress_path)
+    fetched_before = set(resources)
+
+    fetched = []
+
+    def fetch_json(api_path):
+        fetched.append(api_path)
+        return API.get(api_path)
+
+    Crawler(fetch_json, workers=4, rate=None, progress_path=progress_path).crawl(resources.__setitem__)
+    assert resources == API
+    assert not set(fetched) & fetched_before
+    assert not os.path.exists(progress_path)
+
+
+def test_prefetched_resources_land_in_the_datastore(tmp_path):
+    set_backend(LocalBackend(str(tmp_path)))
+    datastore_cache.clear()
+    try:
+        Crawler(API.get, workers=4, rate=None).crawl(store_resource)
+        assert Dnd5eResource('spells', 'fireball').get_data_dict() == {'index': 'fireball', 'level': 3}
+        assert Dnd5eResource('classes', 'ranger', 'levels').get_data_dict() == API['classes/ranger/levels']
+        assert Dnd5eResource.from_api_path('classes/ranger/levels/1') is None
+    finally:
+        set_backend(None)
+        datastore_cache.clear()
+
+
+def test_failed_datastore_writes_stay_pending(tmp_path, monkeypatch):
+    set_backend(LocalBackend(str(tmp_path / 'datastore')))
+    datastore_cache.clear()
+    progress_path = str(tmp_path / 'progress.json')
+    try:
+        upsert_data_dict = Dnd5eResource.upsert_data_dict
+        monkeypatch.setattr(Dnd5eResource, 'upsert_data_dict',
+                            lambda resource, data: resource.table != 'fireball' and upsert_data_dict(resource, data))
+
+        with pytest.raises(RuntimeError):
+            Crawler(API.get, workers=1, rate=None, progress_path=progress_path).crawl(store_resource)
+        with open(progress_path) as file:
+            progress = json.load(file)
+        assert 'spells/fireball' not in progress['done']
+        assert 'spells/fireball' in progress['pending']
+    finally:
+        set_backend(None)
+        datastore_cache.clear()
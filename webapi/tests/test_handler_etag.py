@@ -0,0 +1,33 @@
+"""
+Tests for ETag handling on GET responses.
+"""
+
+from handler_etag import apply_etag, get_etag
+
+
+def test_etag_is_stable_across_key_order():
+    assert get_etag({'a': 1, 'b': 2}) == get_etag({'b': 2, 'a': 1})
+    assert get_etag({'a': 1}) != get_etag({'a': 2})
+
+
+def test_apply_etag_adds_header():
+    response = apply_etag({'headers': {}}, {'statusCode': 200, 'body': {'a': 1}})
+
+    assert response['statusCode'] == 200
+    assert response['body'] == {'a': 1}
+    assert response['headers']['ETag'] == get_etag({'a': 1})
+
+
+def test_apply_etag_not_modified():
+    etag = get_etag({'a': 1})
+    event = {'headers': {'if-none-match': f'W/"other", {etag}'}}
+    response = apply_etag(event, {'statusCode': 200, 'body': {'a': 1}})
+
+    assert response['statusCode'] == 304
+    assert 'body' not in response
+    assert response['headers']['ETag'] == etag
+
+
+def test_apply_etag_ignores_errors():
+    response = {'statusCode': 400, 'body': 'Bad Request: invalid request'}
+    assert apply_etag({'headers': {'if-none-match': '*'}}, response) is response
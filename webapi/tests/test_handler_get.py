@@ -0,0 +1,67 @@
+"""
+Tests for the GET handler.
+"""
+
+import asyncio
+import pytest
+from data.cache import datastore_cache
+from data.game import Game
+from data.notes import Notes
+from data.player import Player
+from data.storage import LocalBackend, set_backend
+from handler_get import handle_get
+
+
+@pytest.fixture
+def game(tmp_path):
+    set_backend(LocalBackend(str(tmp_path)))
+    datastore_cache.clear()
+    Game('get-game').upsert_game_data_dict({'name': 'Fand', 'players': ['get-dm', 'get-player']})
+    Player('get-dm').upsert_player_data_dict({'name': 'Manannan', 'dungeon_master': True})
+    Player('get-player').upsert_player_data_dict({'name': 'Remmie'})
+    Notes('get-game').upsert_notes_data_dict({'secret': 'The tavern keeper is a selkie'})
+    yield 'get-game'
+    set_backend(None)
+    datastore_cache.clear()
+
+
+def get(path, player_id, query_string='', game_id='get-game'):
+    return asyncio.run(handle_get({
+        'rawPath': path,
+        'rawQueryString': query_string,
+        'headers': {'game_id': game_id, 'player_id': player_id},
+        'requestContext': {'http': {'method': 'GET'}},
+    }, None))
+
+
+def test_dm_only_routes(game):
+    assert get('/game/notes', 'get-dm')['body']['data'] == {'secret': 'The tavern keeper is a selkie'}
+    assert get('/game/notes', 'get-player')['statusCode'] == 400
+
+
+def test_batch(game):
+    response = get('/batch', 'get-player', 'path=game&path=/game/player&path=/game/notes&path=/batch')
+
+    assert response['statusCode'] == 200
+    responses = response['body']['responses']
+    assert responses['game']['body']['data']['name'] == 'Fand'
+    assert responses['/game/player']['body']['data'] == {'name': 'Remmie'}
+    assert responses['/game/notes']['statusCode'] == 400
+    assert responses['/batch']['statusCode'] == 400
+
+
+def test_batch_requires_paths(game):
+    assert get('/batch', 'get-player')['statusCode'] == 400
+
+
+def test_reference_waits_for_authorization(game, monkeypatch):
+    lookups = []
+    monkeypatch.setattr('data.dnd_5e_srd.resource.get_resource_data', lambda *args: lookups.append(args) or {})
+    Game('other-game').upsert_game_data_dict({'name': 'Emain Ablach', 'players': ['get-dm']})
+
+    assert get('/reference', 'get-player', game_id='other-game')['statusCode'] == 400
+    assert get('/batch', 'get-player', 'path=/reference', game_id='other-game')['statusCode'] == 400
+    assert lookups == []
+
+    assert get('/reference', 'get-player')['statusCode'] == 200
+    assert len(lookups) == 1
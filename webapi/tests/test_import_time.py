@@ -0,0 +1,53 @@
+"""
+Cold start benchmark for the Lambda entry point.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter and checks
+that modules only needed by rare routes stay out of the import graph.
+Run with `pytest -s` to print the slowest imports.
+"""
+
+import os
+import subprocess
+import sys
+
+WEBAPI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LAZY_MODULES = [
+    'boto3',
+    'aiobotocore',
+    'requests',
+    'data.dnd_5e_srd.resource',
+    'handler_post',
+    'utility',
+]
+
+
+def get_import_times(module):
+    """
+    Import a module in a fresh interpreter and return {module name: cumulative microseconds}.
+    """
+    env = dict(os.environ)
+    env.pop('AWS_LAMBDA_FUNCTION_NAME', None)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=WEBAPI_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        import_times[name.strip()] = int(cumulative)
+    return import_times
+
+
+def test_main_import_keeps_rare_dependencies_lazy():
+    import_times = get_import_times('main')
+
+    slowest = sorted(import_times.items(), key=lambda item: item[1], reverse=True)[:10]
+    print('\nSlowest imports for main (cumulative us):')
+    for name, cumulative in slowest:
+        print(f'{cumulative:>10} {name}')
+
+    assert 'main' in import_times
+    assert [module for module in LAZY_MODULES if module in import_times] == []
@@ -0,0 +1,124 @@
+"""
+Tests for the provider-agnostic LLM layer.
+"""
+
+import io
+import json
+import time
+import pytest
+from llm.base import LLMProvider
+from llm.bedrock import BedrockProvider
+from llm.fake import FakeProvider
+from llm.provider import create_provider, get_inference, set_provider, stream_inference
+
+
+@pytest.fixture
+def fake_provider():
+    provider = FakeProvider(first_token_seconds=0, token_seconds=0)
+    set_provider(provider)
+    yield provider
+    set_provider(None)
+
+
+def test_fake_provider_is_deterministic(fake_provider):
+    response = get_inference('You are a DM.', 'The party enters the tavern.')
+    assert response == get_inference('You are a DM.', 'The party enters the tavern.')
+    assert response != get_inference('You are a DM.', 'The party leaves the tavern.')
+    assert ''.join(stream_inference('You are a DM.', 'The party enters the tavern.')) == response
+
+
+def test_fake_provider_honours_max_tokens(fake_provider):
+    assert len(list(fake_provider.stream('system', 'user', max_tokens=3))) == 3
+
+
+def test_fake_provider_latency():
+    provider = FakeProvider(first_token_seconds=0.05, token_seconds=0)
+    started_at = time.monotonic()
+    next(provider.stream('system', 'user'))
+    assert time.monotonic() - started_at >= 0.05
+
+
+def test_providers_must_implement_stream():
+    class SilentProvider(LLMProvider):
+        name = 'silent'
+
+    with pytest.raises(TypeError):
+        SilentProvider('silent-model')
+
+
+def test_create_provider():
+    provider = create_provider('ollama', model_id='mistral', temperature=0.9)
+    assert (provider.name, provider.model_id, provider.temperature) == ('ollama', 'mistral', 0.9)
+    assert create_provider('bedrock').name == 'bedrock'
+    with pytest.raises(ValueError):
+        create_provider('oracle')
+
+
+class StubBedrockClient:
+    def __init__(self, usage):
+        self.usage = usage
+        self.bodies = []
+
+    def invoke_model(self, body, **kwargs):
+        self.bodies.append(json.loads(body))
+        response = {'content': [{'type': 'text', 'text': 'The door creaks open.'}], 'usage': self.usage}
+        return {'body': io.BytesIO(json.dumps(response).encode('utf-8'))}
+
+    def invoke_model_with_response_stream(self, body, **kwargs):
+        self.bodies.append(json.loads(body))
+        payloads = [
+            {'type': 'message_start', 'message': {'usage': dict(self.usage, output_tokens=1)}},
+            {'type': 'content_block_delta', 'delta': {'type': 'text_delta', 'text': 'The door'}},
+            {'type': 'content_block_delta', 'delta': {'type': 'text_delta', 'text': ' creaks open.'}},
+            {'type': 'message_delta', 'usage': {'output_tokens': 5}},
+        ]
+        return {'body': [{'chunk': {'bytes': json.dumps(payload).encode('utf-8')}} for payload in payloads]}
+
+
+@pytest.fixture
+def stub_bedrock(monkeypatch):
+    client = StubBedrockClient({'input_tokens': 100, 'cache_read_input_tokens': 2900, 'cache_creation_input_tokens': 0})
+    monkeypatch.setattr('llm.bedrock.get_client', lambda *args: client)
+    return client
+
+
+def test_bedrock_marks_the_stable_prefix_for_caching(stub_bedrock):
+    provider = BedrockProvider(model_id='model', prompt_caching=True)
+    provider.complete('You are a DM.', 'What happens next?', user_prefix=['Sheets', 'Summary'])
+
+    body = stub_bedrock.bodies[0]
+    assert body['system'] == [{'type': 'text', 'text': 'You are a DM.'}]
+    assert body['messages'][0]['content'] == [
+        {'type': 'text', 'text': 'Sheets', 'cache_control': {'type': 'ephemeral'}},
+        {'type': 'text', 'text': 'Summary', 'cache_control': {'type': 'ephemeral'}},
+        {'type': 'text', 'text': 'What happens next?'},
+    ]
+
+    provider.complete('You are an NPC.', 'What do you say?')
+    assert stub_bedrock.bodies[1]['system'][0]['cache_control'] == {'type': 'ephemeral'}
+
+    BedrockProvider(model_id='model', prompt_caching=False).complete('You are a DM.', 'What happens next?', user_prefix=['Sheets'])
+    assert 'cache_control' not in json.dumps(stub_bedrock.bodies[2])
+
+
+def test_bedrock_reports_prompt_cache_hit_rate(stub_bedrock):
+    provider = BedrockProvider(model_id='model')
+    assert provider.complete('system', 'user') == 'The door creaks open.'
+    assert ''.join(provider.stream('system', 'user')) == 'The door creaks open.'
+
+    stats = provider.get_stats()
+    assert stats['requests'] == 2
+    assert stats['cache_read_input_tokens'] == 5800
+    assert stats['output_tokens'] == 5
+    assert stats['cache_hit_rate'] == 0.9667
+
+
+def test_bedrock_records_usage_of_streams_closed_early(stub_bedrock):
+    provider = BedrockProvider(model_id='model')
+    stream = provider.stream('system', 'user')
+    assert next(stream) == 'The door'
+    stream.close()
+
+    stats = provider.get_stats()
+    assert stats['requests'] == 1
+    assert stats['cache_read_input_tokens'] == 2900
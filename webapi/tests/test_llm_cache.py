@@ -0,0 +1,118 @@
+"""
+Tests for the content-addressed LLM response cache.
+"""
+
+import time
+import pytest
+from data.cache import datastore_cache
+from data.storage import LocalBackend, set_backend
+from llm.cache import CachingProvider, DatastoreTier, DiskTier, MemoryTier, ResponseCache, create_response_cache
+from llm.fake import FakeProvider
+
+
+class CountingProvider(FakeProvider):
+    def __init__(self):
+        super().__init__(first_token_seconds=0, token_seconds=0, temperature=0)
+        self.calls = 0
+
+    def stream(self, *args, **kwargs):
+        self.calls += 1
+        yield from super().stream(*args, **kwargs)
+
+
+@pytest.fixture
+def local_backend(tmp_path):
+    set_backend(LocalBackend(str(tmp_path / 'datastore')))
+    datastore_cache.clear()
+    yield
+    set_backend(None)
+    datastore_cache.clear()
+
+
+def test_identical_requests_are_served_from_the_cache():
+    provider = CountingProvider()
+    cached = CachingProvider(provider, ResponseCache([MemoryTier(16, 60)]))
+
+    response = cached.complete('You are a DM.', 'The party enters the tavern.')
+    assert cached.complete('You are a DM.', 'The party enters the tavern.') == response
+    assert ''.join(cached.stream('You are a DM.', 'The party enters the tavern.')) == response
+    assert provider.calls == 1
+
+    cached.complete('You are a DM.', 'The party leaves the tavern.')
+    assert provider.calls == 2
+    assert cached.cache.get_stats() == {'hits': 2, 'misses': 2}
+
+
+def test_sampled_requests_bypass_the_cache():
+    provider = CountingProvider()
+    cached = CachingProvider(provider, ResponseCache([MemoryTier(16, 60)]))
+
+    for _ in range(2):
+        cached.complete('You are a DM.', 'The party enters the tavern.', temperature=0.9)
+        ''.join(cached.stream('You are a DM.', 'The party enters the tavern.', temperature=0.9))
+    assert provider.calls == 4
+    assert cached.cache.get_stats() == {'hits': 0, 'misses': 0}
+
+
+def test_streams_are_cached_once_complete():
+    provider = CountingProvider()
+    cached = CachingProvider(provider, ResponseCache([MemoryTier(16, 60)]))
+
+    stream = cached.stream('system', 'user')
+    next(stream)
+    stream.close()
+    response = ''.join(cached.stream('system', 'user'))
+    assert provider.calls == 2
+
+    assert list(cached.stream('system', 'user')) == [response]
+    assert provider.calls == 2
+
+
+def test_memory_tier_evicts_least_recently_used_and_expired(monkeypatch):
+    tier = MemoryTier(2, 60)
+    tier.set('a', 'A')
+    tier.set('b', 'B')
+    tier.get('a')
+    tier.set('c', 'C')
+    assert tier.get('b') is None
+    assert tier.get('a') == 'A'
+
+    now = time.monotonic()
+    monkeypatch.setattr('llm.cache.time.monotonic', lambda: now + 61)
+    assert tier.get('a') is None
+
+
+def test_disk_tier_prunes_to_max_entries(tmp_path):
+    tier = DiskTier(str(tmp_path), 2, 60)
+    for key in ('a', 'b', 'c'):
+        tier.set(key, key.upper())
+    assert len(list(tmp_path.glob('*.json'))) == 2
+    assert DiskTier(str(tmp_path), 2, 60).get('c') == 'C'
+    assert DiskTier(str(tmp_path), 2, 0).get('c') is None
+
+
+def test_slower_tier_hits_fill_faster_tiers(local_backend):
+    memory = MemoryTier(16, 60)
+    CachingProvider(CountingProvider(), ResponseCache([DatastoreTier(60)])).complete('system', 'user')
+
+    provider = CountingProvider()
+    cached = CachingProvider(provider, ResponseCache([memory, DatastoreTier(60)]))
+    response = cached.complete('system', 'user')
+    assert provider.calls == 0
+    assert list(memory.entries.values())[0][0] == response
+
+
+def test_datastore_tier_errors_are_misses(monkeypatch):
+    def fail(*args, **kwargs):
+        raise ConnectionError('datastore unreachable')
+
+    monkeypatch.setattr(DatastoreTier, 'get_datastore', fail)
+    provider = CountingProvider()
+    cached = CachingProvider(provider, ResponseCache([DatastoreTier(60)]))
+    assert cached.complete('system', 'user') == cached.complete('system', 'user')
+    assert provider.calls == 2
+
+
+def test_unknown_tier_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        create_response_cache(['memory', 'redis'], 16, 60, str(tmp_path))
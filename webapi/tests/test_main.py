@@ -0,0 +1,49 @@
+"""
+Tests for the Lambda entry point.
+"""
+
+import asyncio
+import json
+import pytest
+import main
+from data.cache import datastore_cache
+from data.game import Game
+from data.player import Player
+from data.storage import LocalBackend, set_backend
+
+
+@pytest.fixture
+def game(tmp_path):
+    set_backend(LocalBackend(str(tmp_path)))
+    datastore_cache.clear()
+    Game('main-game').upsert_game_data_dict({'name': 'Fand', 'players': ['main-player']})
+    Player('main-player').upsert_player_data_dict({'name': 'Remmie'})
+    yield 'main-game'
+    set_backend(None)
+    datastore_cache.clear()
+
+
+def invoke(method, path, body=None):
+    event = {
+        'rawPath': path,
+        'headers': {'game_id': 'main-game', 'player_id': 'main-player'},
+        'requestContext': {'http': {'method': method}},
+    }
+    if body is not None:
+        event['body'] = json.dumps(body)
+    return main.lambda_handler(event, None)
+
+
+def test_invocations_share_one_event_loop(game):
+    async def get_loop():
+        return asyncio.get_running_loop()
+
+    assert main.run(get_loop()) is main.run(get_loop()) is main.event_loop
+    assert invoke('GET', '/game/player')['statusCode'] == 200
+    assert not main.event_loop.is_closed()
+
+
+def test_writes_run_on_the_event_loop(game):
+    assert invoke('POST', '/game/player', {'name': 'Remmie', 'level': 2})['statusCode'] == 200
+    assert invoke('PATCH', '/game/player', {'level': 3})['statusCode'] == 200
+    assert invoke('GET', '/game/player')['body']['data'] == {'name': 'Remmie', 'level': 3}
@@ -0,0 +1,74 @@
+"""
+Tests for JSON Merge Patch support.
+"""
+
+import asyncio
+import json
+import pytest
+from data.cache import datastore_cache
+from data.game import Game
+from data.merge_patch import apply_merge_patch
+from data.npcs import NPCs
+from data.player import Player
+from data.storage import LocalBackend, set_backend
+from handler_post import handle_patch
+
+
+@pytest.mark.parametrize('target, patch, expected', [
+    ({'a': 'b'}, {'a': 'c'}, {'a': 'c'}),
+    ({'a': 'b'}, {'b': 'c'}, {'a': 'b', 'b': 'c'}),
+    ({'a': 'b'}, {'a': None}, {}),
+    ({'a': 'b', 'b': 'c'}, {'a': None}, {'b': 'c'}),
+    ({'a': ['b']}, {'a': 'c'}, {'a': 'c'}),
+    ({'a': 'c'}, {'a': ['b']}, {'a': ['b']}),
+    ({'a': {'b': 'c'}}, {'a': {'b': 'd', 'c': None}}, {'a': {'b': 'd'}}),
+    ({'a': [{'b': 'c'}]}, {'a': [1]}, {'a': [1]}),
+    (['a', 'b'], ['c', 'd'], ['c', 'd']),
+    ({'a': 'b'}, ['c'], ['c']),
+    ({'e': None}, {'a': 1}, {'e': None, 'a': 1}),
+    ([1, 2], {'a': 'b', 'c': None}, {'a': 'b'}),
+    ({}, {'a': {'bb': {'ccc': None}}}, {'a': {'bb': {}}}),
+])
+def test_rfc_7386_examples(target, patch, expected):
+    assert apply_merge_patch(target, patch) == expected
+
+
+def test_handle_patch_merges_into_stored_data(tmp_path):
+    set_backend(LocalBackend(str(tmp_path)))
+    datastore_cache.clear()
+    try:
+        Game('patch-game').upsert_game_data_dict({'players': ['patch-dm']})
+        Player('patch-dm').upsert_player_data_dict({'dungeon_master': True})
+        NPCs('patch-game').upsert_npcs_data_dict({
+            'brigid': {'name': 'Brigid', 'hit_points': 12},
+            'fergus': {'name': 'Fergus'},
+        })
+
+        response = asyncio.run(handle_patch({
+            'rawPath': '/game/npcs',
+            'headers': {'game_id': 'patch-game', 'player_id': 'patch-dm'},
+            'body': json.dumps({'brigid': {'hit_points': 7}, 'fergus': None}),
+        }, None))
+
+        assert response['statusCode'] == 200
+        assert response['body'] == {'success': True, 'version': 2}
+        npcs = NPCs('patch-game').get_npcs_data()
+        assert npcs.data == {'brigid': {'name': 'Brigid', 'hit_points': 7}}
+        assert npcs.version == 2
+    finally:
+        set_backend(None)
+        datastore_cache.clear()
+
+
+@pytest.mark.parametrize('body, expected_body', [
+    ('{"brigid": ', 'Bad Request: invalid JSON'),
+    ('', 'Bad Request: invalid JSON'),
+    ('["brigid"]', 'Bad Request: merge patch must be a JSON object'),
+])
+def test_handle_patch_rejects_invalid_bodies(body, expected_body):
+    response = asyncio.run(handle_patch({
+        'rawPath': '/game/npcs',
+        'headers': {'game_id': 'patch-game', 'player_id': 'patch-dm'},
+        'body': body,
+    }, None))
+    assert response == {'statusCode': 400, 'body': expected_body}
@@ -0,0 +1,98 @@
+"""
+Tests for negative caching and request coalescing of SRD reference lookups.
+"""
+
+import threading
+import time
+import pytest
+from data.cache import datastore_cache, missing_cache
+from data.dnd_5e_srd.resource import Dnd5eResource, get_resource_data
+from data.single_flight import SingleFlight
+from data.storage import LocalBackend, set_backend
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    set_backend(LocalBackend(str(tmp_path)))
+    datastore_cache.clear()
+    missing_cache.clear()
+    fetches = []
+    responses = {'spells/fireball': {'index': 'fireball', 'level': 3}}
+
+    def fetch_from_api(resource):
+        fetches.append(resource.get_api_path())
+        time.sleep(0.05)
+        return responses.get(resource.get_api_path(), {})
+
+    monkeypatch.setattr(Dnd5eResource, '_fetch_from_api', fetch_from_api)
+    yield fetches
+    set_backend(None)
+    datastore_cache.clear()
+    missing_cache.clear()
+
+
+def get_concurrently(*args):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(get_resource_data(*args))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_lookups_share_one_fetch(api):
+    results = get_concurrently('spells', 'fireball')
+    assert results == [{'index': 'fireball', 'level': 3}] * 8
+    assert api == ['spells/fireball']
+    assert Dnd5eResource('spells', 'fireball').get_data().version == 1
+
+
+def test_missing_resources_are_remembered(api):
+    assert get_concurrently('spells', 'wish-upon-a-star') == [{}] * 8
+    assert get_resource_data('spells', 'wish-upon-a-star') == {}
+    assert api == ['spells/wish-upon-a-star']
+    assert missing_cache.hits >= 1
+
+
+def test_concurrent_lookups_get_their_own_copy(api):
+    results = get_concurrently('spells', 'fireball')
+    results[0]['level'] = 9
+    assert results[1:] == [{'index': 'fireball', 'level': 3}] * 7
+    assert get_resource_data('spells', 'fireball') == {'index': 'fireball', 'level': 3}
+
+
+def test_stored_resources_are_no_longer_missing(api):
+    assert get_resource_data('spells', 'wish') == {}
+    assert missing_cache.is_missing('dnd-5e-srd-2014-spells/wish/index')
+
+    assert Dnd5eResource('spells', 'wish').upsert_data_dict({'index': 'wish', 'level': 9})
+    assert get_resource_data('spells', 'wish') == {'index': 'wish', 'level': 9}
+    assert api == ['spells/wish']
+
+
+def test_single_flight_shares_exceptions():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def fail():
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError('upstream down')
+
+    def call():
+        try:
+            single_flight.do('key', fail)
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=call)
+    follower.start()
+    leader.join()
+    follower.join()
+    assert len(errors) == 2 and errors[0] is errors[1]
+    assert single_flight.calls == {}
@@ -0,0 +1,41 @@
+"""
+Tests for the route table.
+"""
+
+from routes import ROUTES, get_route, is_prefetch_route, is_read_route
+from ui.navigation import get_navigation
+
+
+def test_entity_routes_serve_reads_and_writes():
+    for method in ('GET', 'POST', 'PATCH'):
+        assert get_route(method, '/game/npcs', True) is not None
+    assert get_route('POST', '/game', True) is None
+    assert get_route('DELETE', '/game/npcs', True) is None
+
+
+def test_dm_only_routes():
+    assert get_route('GET', '/game/notes', False) is None
+    assert get_route('GET', '/game/player', False) is not None
+
+
+def test_read_routes():
+    assert is_read_route('GET', '/game/npcs')
+    assert is_read_route('POST', '/batch')
+    assert not is_read_route('POST', '/game/npcs')
+
+
+def test_prefetch_routes():
+    assert is_prefetch_route('GET', '/game/npcs')
+    assert is_prefetch_route('GET', '/loadgame')
+    assert not is_prefetch_route('GET', '/reference')
+    assert not is_prefetch_route('GET', '/batch')
+    assert not is_prefetch_route('POST', '/game/dialogue')
+
+
+def test_navigation_follows_routes():
+    dm_paths = [item['path'] for item in get_navigation(True)['navigation']]
+    player_paths = [item['path'] for item in get_navigation(False)['navigation']]
+
+    assert dm_paths[0] == '/'
+    assert dm_paths[1:] == [route.navigation['path'] for route in ROUTES if route.navigation]
+    assert player_paths == ['/', '/game/index.html', '/game/player.html', '/reference/index.html']
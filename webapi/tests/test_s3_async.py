@@ -0,0 +1,72 @@
+"""
+Tests for the non-blocking aiobotocore path of the S3 storage engine, against
+a moto server. Install requirements-test.txt to run them. Locally they are
+skipped without aiobotocore and moto[server], but with CI set they fail instead.
+"""
+
+import asyncio
+import os
+import socket
+import pytest
+
+if os.environ.get('CI'):
+    import aiobotocore
+    from moto import server as moto_server
+else:
+    pytest.importorskip('aiobotocore')
+    moto_server = pytest.importorskip('moto.server')
+
+from data.clients import clear_clients, close_async_clients, get_async_client, get_client
+from data.storage import S3Backend, StorageBackend
+
+BUCKET = 'dungeon-master-test'
+REGION = 'us-east-1'
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def s3_server(monkeypatch):
+    port = get_free_port()
+    server = moto_server.ThreadedMotoServer(ip_address='127.0.0.1', port=port)
+    server.start()
+    monkeypatch.setenv('AWS_ENDPOINT_URL', f'http://127.0.0.1:{port}')
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    monkeypatch.setenv('AWS_SESSION_TOKEN', 'testing')
+    clear_clients()
+    get_client('s3', REGION).create_bucket(Bucket=BUCKET)
+    yield
+    clear_clients()
+    server.stop()
+
+
+def test_async_round_trip_does_not_use_threads(s3_server, monkeypatch):
+    async def fail_to_thread(*args, **kwargs):
+        raise AssertionError('the aiobotocore path should not fall back to a thread')
+
+    monkeypatch.setattr(StorageBackend, 'aput', fail_to_thread)
+    monkeypatch.setattr(StorageBackend, 'aget_with_etag', fail_to_thread)
+    backend = S3Backend(BUCKET, REGION)
+    key = 'datastore/games/game-data/async-game/data.json'
+
+    async def round_trip():
+        try:
+            assert await get_async_client('s3', REGION) is not None
+            assert await backend.aput(key, b'{"name": "Fand"}')
+            body, etag = await backend.aget_with_etag(key)
+            unchanged = await backend.aget_with_etag(key, if_none_match=etag)
+            missing = await backend.aget_with_etag('datastore/games/game-data/missing/data.json')
+            return body, etag, unchanged, missing
+        finally:
+            await close_async_clients()
+
+    body, etag, unchanged, missing = asyncio.run(round_trip())
+    assert body == b'{"name": "Fand"}'
+    assert etag
+    assert unchanged == (None, etag)
+    assert missing == (None, None)
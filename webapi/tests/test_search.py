@@ -0,0 +1,85 @@
+"""
+Tests for the SRD search index.
+"""
+
+import asyncio
+import pytest
+from data.dnd_5e_srd.search import SearchIndex, get_search_index
+from data.dnd_5e_srd.snapshot import Snapshot, set_snapshot, write_snapshot
+from routes import Request, get_reference_search
+
+DOCUMENTS = {
+    'monsters/adult-red-dragon': {
+        'index': 'adult-red-dragon', 'name': 'Adult Red Dragon', 'size': 'Huge', 'challenge_rating': 17,
+        'damage_immunities': ['fire'], 'desc': 'A greedy dragon that breathes fire.',
+    },
+    'monsters/fire-elemental': {
+        'index': 'fire-elemental', 'name': 'Fire Elemental', 'size': 'Large', 'challenge_rating': 5,
+        'damage_immunities': ['fire', 'poison'], 'condition_immunities': [{'index': 'poisoned', 'name': 'Poisoned'}],
+    },
+    'monsters/goblin': {
+        'index': 'goblin', 'name': 'Goblin', 'size': 'Small', 'challenge_rating': 0.25, 'damage_immunities': [],
+    },
+    'spells/fireball': {
+        'index': 'fireball', 'name': 'Fireball', 'level': 3, 'school': {'index': 'evocation', 'name': 'Evocation'},
+        'desc': ['A bright streak flashes and blossoms into an explosion of fire.'],
+    },
+}
+
+
+@pytest.fixture
+def search_index():
+    return SearchIndex(DOCUMENTS)
+
+
+def paths(response):
+    return [result['path'] for result in response['results']]
+
+
+def test_text_search_ranks_name_matches_first(search_index):
+    response = search_index.search('fire')
+    assert paths(response)[0] == 'monsters/fire-elemental'
+    assert set(paths(response)) == {'monsters/fire-elemental', 'monsters/adult-red-dragon', 'spells/fireball'}
+    assert search_index.search('red dragon')['total'] == 1
+
+
+def test_attribute_and_range_filters(search_index):
+    response = search_index.search(filters={'damage_immunities': 'fire'}, ranges={'challenge_rating': (5, None)})
+    assert paths(response) == ['monsters/adult-red-dragon', 'monsters/fire-elemental']
+    assert paths(search_index.search(ranges={'challenge_rating': (None, 5)})) == ['monsters/fire-elemental', 'monsters/goblin']
+    assert paths(search_index.search(filters={'school': 'Evocation'})) == ['spells/fireball']
+    assert paths(search_index.search(filters={'condition_immunities': 'poisoned'})) == ['monsters/fire-elemental']
+    assert search_index.search(filters={'database': 'spells'})['total'] == 1
+
+
+def test_numeric_attribute_filters(search_index):
+    assert paths(search_index.search(filters={'level': '3'})) == ['spells/fireball']
+    assert paths(search_index.search(filters={'challenge_rating': '0.25'})) == ['monsters/goblin']
+    assert paths(search_index.search(filters={'level': 'three'})) == []
+
+
+def test_pagination(search_index):
+    response = search_index.search(filters={'database': 'monsters'}, limit=2, offset=1)
+    assert response['total'] == 3
+    assert paths(response) == ['monsters/fire-elemental', 'monsters/goblin']
+
+
+def test_reference_search_route(tmp_path):
+    path = str(tmp_path / 'srd.snapshot')
+    write_snapshot(path, dict(DOCUMENTS, monsters={'count': 3, 'results': []}))
+    snapshot = Snapshot(path)
+    set_snapshot(snapshot)
+    try:
+        assert len(get_search_index().documents) == len(DOCUMENTS)
+
+        def search(query_string_parameters):
+            return asyncio.run(get_reference_search(Request('game', 'player', '', query_string_parameters=query_string_parameters)))
+
+        response = search({'database': 'monsters', 'damage_immunities': 'fire', 'challenge_rating_min': '5', 'limit': '1'})
+        assert response['statusCode'] == 200
+        assert response['body']['total'] == 2
+        assert paths(response['body']) == ['monsters/adult-red-dragon']
+        assert search({'challenge_rating_min': 'high'})['statusCode'] == 400
+    finally:
+        set_snapshot(None)
+        snapshot.close()
@@ -0,0 +1,58 @@
+"""
+Tests for the offline D&D 5e SRD snapshot.
+"""
+
+import pytest
+from data.dnd_5e_srd.resource import get_resource_data
+from data.dnd_5e_srd.snapshot import Snapshot, crawl_resources, set_snapshot, write_snapshot
+
+API = {
+    '': {'ability-scores': '/api/2014/ability-scores', 'classes': '/api/2014/classes'},
+    'ability-scores': {'count': 1, 'results': [{'index': 'con', 'name': 'CON', 'url': '/api/2014/ability-scores/con'}]},
+    'ability-scores/con': {'index': 'con', 'full_name': 'Constitution'},
+    'classes': {'count': 1, 'results': [{'index': 'ranger', 'name': 'Ranger', 'url': '/api/2014/classes/ranger'}]},
+    'classes/ranger': {'index': 'ranger', 'hit_die': 10, 'multi_classing': '/api/2014/classes/ranger/multi-classing'},
+    'classes/ranger/multi-classing': {'prerequisites': [{'minimum_score': 13}]},
+}
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    path = str(tmp_path / 'srd.snapshot')
+    write_snapshot(path, API)
+    snapshot = Snapshot(path)
+    set_snapshot(snapshot)
+    yield snapshot
+    set_snapshot(None)
+    snapshot.close()
+
+
+def test_crawl_follows_every_referenced_path():
+    fetched = []
+
+    def fetch_json(api_path):
+        fetched.append(api_path)
+        return API.get(api_path)
+
+    assert crawl_resources(fetch_json) == API
+    assert sorted(fetched) == sorted(API)
+
+
+def test_snapshot_round_trip(snapshot):
+    assert len(snapshot) == len(API)
+    assert 'classes/ranger' in snapshot
+    assert snapshot.get('ability-scores/con') == {'index': 'con', 'full_name': 'Constitution'}
+    assert snapshot.get('spells/fireball') is None
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'not-a-snapshot'
+    path.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        Snapshot(str(path))
+
+
+def test_resource_data_is_served_from_the_snapshot(snapshot):
+    assert get_resource_data() == API['']
+    assert get_resource_data('ability-scores', 'con') == API['ability-scores/con']
+    assert get_resource_data('classes', 'ranger', 'multi-classing') == API['classes/ranger/multi-classing']
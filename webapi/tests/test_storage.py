@@ -0,0 +1,52 @@
+"""
+Tests for the datastore storage engines.
+"""
+
+import os
+import pytest
+from data.datastore import Datastore
+from data.storage import LocalBackend, StorageBackend
+
+
+def test_local_backend_round_trip(tmp_path):
+    backend = LocalBackend(str(tmp_path))
+    datastore = Datastore('games', 'game-data', 'test-game', backend=backend)
+
+    assert datastore.get() is None
+    assert not datastore.exists()
+
+    assert datastore.upsert({'data': {'name': 'Fand'}, 'last_updated': 'now'})
+    assert datastore.exists()
+    assert datastore.get() == {'data': {'name': 'Fand'}, 'last_updated': 'now'}
+    assert os.path.isfile(tmp_path / 'datastore' / 'games' / 'game-data' / 'test-game' / 'data.json')
+
+    assert datastore.delete()
+    assert datastore.get() is None
+
+
+def test_local_backend_overwrite_leaves_no_temp_files(tmp_path):
+    backend = LocalBackend(str(tmp_path))
+    key = 'datastore/games/game-data/test-game/data.json'
+
+    assert backend.put(key, b'{"a": 1}')
+    assert backend.put(key, b'{"a": 2}')
+
+    assert backend.get(key) == b'{"a": 2}'
+    assert os.listdir(os.path.dirname(backend.get_path(key))) == ['data.json']
+
+
+def test_local_backend_empty_object(tmp_path):
+    backend = LocalBackend(str(tmp_path))
+    key = 'datastore/games/game-data/empty/data.json'
+
+    assert backend.put(key, b'')
+    assert backend.get(key) == b''
+
+
+def test_storage_backend_requires_the_engine_methods():
+    class PartialBackend(StorageBackend):
+        def put(self, key, body, content_type='application/json', if_match=None, if_none_match=None):
+            return True
+
+    with pytest.raises(TypeError):
+        PartialBackend()
@@ -0,0 +1,96 @@
+"""
+Tests for streaming model responses.
+"""
+
+import asyncio
+import json
+import pytest
+from llm.bedrock import BedrockProvider
+from llm.provider import set_provider
+from data.cache import datastore_cache
+from data.game import Game
+from data.npc import NPC
+from data.player import Player
+from data.storage import LocalBackend, set_backend
+from handler_get import handle_get
+from routes import Request, get_dialogue
+
+
+class StreamingBedrockClient:
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.requests = []
+
+    def invoke_model_with_response_stream(self, **kwargs):
+        self.requests.append(kwargs)
+        events = [{'chunk': {'bytes': json.dumps({'type': 'message_start'}).encode()}}]
+        for delta in self.deltas:
+            payload = {'type': 'content_block_delta', 'index': 0, 'delta': {'type': 'text_delta', 'text': delta}}
+            events.append({'chunk': {'bytes': json.dumps(payload).encode()}})
+        events.append({'chunk': {'bytes': json.dumps({'type': 'message_stop'}).encode()}})
+        return {'body': iter(events)}
+
+
+class StubbedBedrockProvider(BedrockProvider):
+    def __init__(self, client):
+        super().__init__()
+        self.stub_client = client
+
+    @property
+    def client(self):
+        return self.stub_client
+
+
+@pytest.fixture
+def bedrock_client():
+    client = StreamingBedrockClient(['Well met, ', 'traveller', '.'])
+    set_provider(StubbedBedrockProvider(client))
+    yield client
+    set_provider(None)
+
+
+def test_bedrock_stream_yields_text_deltas(bedrock_client):
+    provider = StubbedBedrockProvider(bedrock_client)
+    assert list(provider.stream('system', 'user', max_tokens=64)) == ['Well met, ', 'traveller', '.']
+    request_body = json.loads(bedrock_client.requests[0]['body'])
+    assert request_body['system'][0]['text'] == 'system'
+    assert request_body['max_tokens'] == 64
+
+
+def test_dialogue_route_streams_events(tmp_path, bedrock_client):
+    set_backend(LocalBackend(str(tmp_path)))
+    datastore_cache.clear()
+    try:
+        Game('stream-game').upsert_game_data_dict({'players': ['stream-dm', 'stream-player']})
+        Player('stream-dm').upsert_player_data_dict({'dungeon_master': True})
+        Player('stream-player').upsert_player_data_dict({})
+        NPC('brigid').upsert_npc_data_dict({'name': 'Brigid'})
+
+        def post_dialogue(player_id, body, game_id='stream-game'):
+            return asyncio.run(handle_get({
+                'rawPath': '/game/dialogue',
+                'headers': {'game_id': game_id, 'player_id': player_id},
+                'requestContext': {'http': {'method': 'POST'}},
+                'body': json.dumps(body),
+            }, None))
+
+        response = post_dialogue('stream-dm', {'role': 'npc', 'id': 'brigid', 'story': 'The party enters the forge.'})
+        assert response['headers']['Content-Type'] == 'text/event-stream'
+        events = [json.loads(line[len('data: '):]) for line in response['body'].split('\n\n') if line]
+        assert events == [{'delta': 'Well met, '}, {'delta': 'traveller'}, {'delta': '.'}, {'done': True}]
+        assert 'Brigid' in json.loads(bedrock_client.requests[0]['body'])['messages'][0]['content'][0]['text']
+
+        assert post_dialogue('stream-player', {'role': 'npc', 'id': 'brigid', 'story': ''})['statusCode'] == 400
+        assert post_dialogue('stream-dm', {'role': 'dragon', 'id': 'brigid'})['statusCode'] == 400
+        assert len(bedrock_client.requests) == 1
+
+        # A DM of another game is turned away before the model is called
+        Game('other-game').upsert_game_data_dict({'players': ['stream-player']})
+        body = {'role': 'npc', 'id': 'brigid', 'story': 'The party enters the forge.'}
+        assert post_dialogue('stream-dm', body, 'other-game')['statusCode'] == 400
+        request = Request('other-game', 'stream-dm', '', Game('other-game').get_data(), True, body=body)
+        assert asyncio.run(get_dialogue(request))['statusCode'] == 400
+        assert len(bedrock_client.requests) == 1
+    finally:
+        set_backend(None)
+        datastore_cache.clear()
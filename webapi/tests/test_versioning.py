@@ -0,0 +1,83 @@
+"""
+Tests for versioned, compare-and-swap upserts.
+"""
+
+import pytest
+from data.cache import datastore_cache
+from data.player import Player
+from data.storage import LocalBackend, WriteConflictError, set_backend
+
+
+@pytest.fixture
+def local_backend(tmp_path):
+    backend = LocalBackend(str(tmp_path))
+    set_backend(backend)
+    datastore_cache.clear()
+    yield backend
+    set_backend(None)
+    datastore_cache.clear()
+
+
+def test_versions_increase_on_every_write(local_backend):
+    player = Player('versioned-player')
+    assert player.get_player_data().version == 0
+
+    assert player.upsert_player_data_dict({'name': 'Remmie'})
+    assert player.get_player_data().version == 1
+
+    assert player.upsert_player_data_dict({'name': 'Andros'})
+    assert player.get_player_data().version == 2
+
+
+def test_expected_version_conflict(local_backend):
+    player = Player('versioned-player')
+    player.upsert_player_data_dict({'name': 'Remmie'})
+
+    assert player.upsert_player_data_dict({'hit_points': 9}, expected_version=1)
+
+    with pytest.raises(WriteConflictError) as conflict:
+        player.upsert_player_data_dict({'hit_points': 4}, expected_version=1)
+
+    assert conflict.value.current_version == 2
+    assert player.get_player_data_dict() == {'hit_points': 9}
+
+
+def test_local_backend_conditional_put(local_backend):
+    key = 'datastore/players/player-data/raw/data.json'
+
+    assert local_backend.put(key, b'{}', if_none_match='*')
+    with pytest.raises(WriteConflictError):
+        local_backend.put(key, b'{}', if_none_match='*')
+
+    _, etag = local_backend.get_with_etag(key)
+    assert local_backend.put(key, b'{"a": 1}', if_match=etag)
+    with pytest.raises(WriteConflictError):
+        local_backend.put(key, b'{"a": 2}', if_match=etag)
+
+
+def test_write_builds_on_cached_copy_without_reading(local_backend, monkeypatch):
+    player = Player('versioned-player')
+    player.upsert_player_data_dict({'name': 'Remmie'})
+    player.get_player_data()
+
+    reads = []
+    get_with_etag = local_backend.get_with_etag
+    monkeypatch.setattr(local_backend, 'get_with_etag', lambda *args: reads.append(args) or get_with_etag(*args))
+
+    assert player.patch_data_dict({'level': 2})
+    assert reads == []
+    assert player.written_version == 2
+
+
+def test_write_on_stale_cached_copy_retries_on_newer_version(local_backend):
+    player = Player('versioned-player')
+    player.upsert_player_data_dict({'name': 'Remmie'})
+    player.get_player_data()
+    stale_entry = datastore_cache.get_entry(player.datastore.get_s3_key())
+
+    Player('versioned-player').patch_data_dict({'hit_points': 9})
+    datastore_cache.set(player.datastore.get_s3_key(), stale_entry[0], 30, stale_entry[1])
+
+    assert player.patch_data_dict({'level': 2})
+    assert player.written_version == 3
+    assert player.get_player_data_dict() == {'name': 'Remmie', 'hit_points': 9, 'level': 2}
@@ -19,6 +19,27 @@ function getPlayerId() {
     return getCookie('playerId');
 }
 
+function getApiCacheKey(gameId, playerId, path, dmDataId) {
+    return `api-cache:${gameId}:${playerId}:${path}:${dmDataId || ''}`;
+}
+
+function getCachedApiResponse(cacheKey) {
+    try {
+        const cached = sessionStorage.getItem(cacheKey);
+        return cached ? JSON.parse(cached) : null;
+    } catch (error) {
+        return null;
+    }
+}
+
+function setCachedApiResponse(cacheKey, etag, body) {
+    try {
+        sessionStorage.setItem(cacheKey, JSON.stringify({ etag: etag, body: body }));
+    } catch (error) {
+        console.warn('Unable to cache API response:', error.message);
+    }
+}
+
 async function getFromApi(path, dmDataId) {
     const gameId = getGameId();
     const playerId = getPlayerId();
@@ -30,6 +51,7 @@ async function getFromApi(path, dmDataId) {
 
     const maxRetries = 3;
     const retryDelayMs = 1000;
+    const cacheKey = getApiCacheKey(gameId, playerId, path, dmDataId);
     
     for (let attempt = 1; attempt <= maxRetries; attempt++) {
         try {
@@ -40,15 +62,28 @@ async function getFromApi(path, dmDataId) {
             if (dmDataId) {
                 headers['dm_data_id'] = dmDataId;
             }
+            const cached = getCachedApiResponse(cacheKey);
+            if (cached?.etag) {
+                headers['If-None-Match'] = cached.etag;
+            }
             const response = await fetch(`${API_URL}${path}`, {
                 headers: headers,
             });
 
+            if (response.status === 304 && cached) {
+                return cached.body;
+            }
+
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
             
-            return response.json();
+            const body = await response.json();
+            const etag = response.headers.get('ETag');
+            if (etag) {
+                setCachedApiResponse(cacheKey, etag, body);
+            }
+            return body;
         } catch (error) {
             console.warn(`API request attempt ${attempt} failed:`, error.message);
             
@@ -62,7 +97,53 @@ async function getFromApi(path, dmDataId) {
     }
 }
 
-async function postToApi(path, body, dmDataId) {
+const pendingBatchRequests = [];
+let pendingBatchTimer = null;
+
+/**
+ * Queues a GET request so that requests made during the same tick, such as the
+ * page load requests from game.js and the page script, share one /batch round trip.
+ */
+function getFromApiBatched(path, dmDataId) {
+    return new Promise((resolve, reject) => {
+        pendingBatchRequests.push({ path: path, dmDataId: dmDataId || '', resolve: resolve, reject: reject });
+        if (!pendingBatchTimer) {
+            pendingBatchTimer = setTimeout(flushBatchRequests, 0);
+        }
+    });
+}
+
+function flushBatchRequests() {
+    const requests = pendingBatchRequests.splice(0);
+    pendingBatchTimer = null;
+
+    const groups = {};
+    requests.forEach(request => {
+        groups[request.dmDataId] = groups[request.dmDataId] || [];
+        groups[request.dmDataId].push(request);
+    });
+
+    Object.entries(groups).forEach(([dmDataId, group]) => {
+        if (group.length === 1) {
+            getFromApi(group[0].path, dmDataId).then(group[0].resolve, group[0].reject);
+            return;
+        }
+
+        const query = group.map(request => `path=${encodeURIComponent(request.path)}`).join('&');
+        getFromApi(`batch?${query}`, dmDataId).then(batch => {
+            group.forEach(request => {
+                const response = batch?.responses?.[request.path];
+                if (response && response.statusCode === 200) {
+                    request.resolve(response.body);
+                } else {
+                    request.reject(new Error(`HTTP error! status: ${response?.statusCode}`));
+                }
+            });
+        }, error => group.forEach(request => request.reject(error)));
+    });
+}
+
+async function postToApi(path, body, dmDataId, expectedVersion) {
     const gameId = getGameId();
     const playerId = getPlayerId();
 
@@ -86,6 +167,9 @@ async function postToApi(path, body, dmDataId) {
     if (dmDataId) {
         headers['dm_data_id'] = dmDataId;
     }
+    if (expectedVersion !== undefined && expectedVersion !== null) {
+        headers['expected_version'] = String(expectedVersion);
+    }
 
     const response = await fetch(`${API_URL}${path}`, {
         method: 'POST',
@@ -93,9 +177,110 @@ async function postToApi(path, body, dmDataId) {
         body: body_content
     });
 
+    checkWriteResponse(response);
+
     return response.json();
 }
 
+const WRITE_CONFLICT_MESSAGE = 'Conflict: this data was changed by someone else. Reload to get the latest version.';
+
+function checkWriteResponse(response) {
+    if (response.status === 409) {
+        throw new Error(WRITE_CONFLICT_MESSAGE);
+    }
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+}
+
+/**
+ * Sends a JSON Merge Patch. Pass expectedVersion only when the patch was
+ * computed from values that must not have changed since they were read.
+ */
+async function patchToApi(path, patch, dmDataId, expectedVersion) {
+    const gameId = getGameId();
+    const playerId = getPlayerId();
+
+    if (!gameId || !playerId) {
+        document.location.href = '/';
+    }
+
+    const headers = {
+        'game_id': gameId,
+        'player_id': playerId,
+        'Content-Type': 'application/merge-patch+json',
+    }
+    if (dmDataId) {
+        headers['dm_data_id'] = dmDataId;
+    }
+    if (expectedVersion !== undefined && expectedVersion !== null) {
+        headers['expected_version'] = String(expectedVersion);
+    }
+
+    const response = await fetch(`${API_URL}${path}`, {
+        method: 'PATCH',
+        headers: headers,
+        body: JSON.stringify(patch)
+    });
+
+    checkWriteResponse(response);
+
+    return response.json();
+}
+
+function isPlainObject(value) {
+    return value !== null && typeof value === 'object' && !Array.isArray(value);
+}
+
+/**
+ * Builds an RFC 7386 JSON Merge Patch that turns original into updated.
+ * Removed properties are sent as null and unchanged properties are left out.
+ */
+function buildMergePatch(original, updated) {
+    const patch = {};
+    Object.keys(original || {}).forEach(key => {
+        if (!(key in updated)) {
+            patch[key] = null;
+        }
+    });
+    Object.entries(updated).forEach(([key, value]) => {
+        const originalValue = original ? original[key] : undefined;
+        if (isPlainObject(value) && isPlainObject(originalValue)) {
+            const nestedPatch = buildMergePatch(originalValue, value);
+            if (Object.keys(nestedPatch).length > 0) {
+                patch[key] = nestedPatch;
+            }
+        } else if (JSON.stringify(value) !== JSON.stringify(originalValue)) {
+            patch[key] = value;
+        }
+    });
+    return patch;
+}
+
+async function saveChangesToApi(path, updatedData, dmDataId) {
+    const patch = buildMergePatch(currentApiControllerData.data, updatedData);
+    if (Object.keys(patch).length === 0) {
+        return true;
+    }
+    // The patch is merged into the latest stored data, so edits to different
+    // fields by other players are kept rather than rejected as a conflict.
+    // The baseline only moves once the server has stored the patch, so a failed save is diffed again next time
+    const response = await patchToApi(path, patch, dmDataId);
+    currentApiControllerData.data = updatedData;
+    currentApiControllerData.version = response.version;
+    return response;
+}
+
+/**
+ * Tells the user about a save that lost a race with another writer, and reloads the latest data.
+ */
+async function handleSaveError(error) {
+    if (error.message === WRITE_CONFLICT_MESSAGE) {
+        alert(error.message);
+        await reloadApiController();
+    }
+}
+
 function createPropertyField(propertyName, propertyValue) {
     const fieldId = `field-${propertyName.replace(/[^a-zA-Z0-9_-]/g, '-')}`;
     let propertyValueString = '';
@@ -168,7 +353,9 @@ async function loadApiController(apiPath, containerId, title, formFunction = ini
         formFunction: formFunction
     };
     const dmDataId = document.getElementById('dm-id-input')?.value || '';
-    const settings = await getFromApi(apiPath, dmDataId);
+    const settings = await getFromApiBatched(apiPath, dmDataId);
+    currentApiControllerData.data = settings?.data || {};
+    currentApiControllerData.version = settings?.version;
     
     formFunction(containerId, settings, title, apiPath);
 }
@@ -263,7 +450,7 @@ async function handleFormSubmission(event, apiPath) {
         
         const dmDataId = document.getElementById('dm-id-input')?.value || '';
         const settingsData = collectFormData();
-        const response = await postToApi(apiPath, settingsData, dmDataId);
+        const response = await saveChangesToApi(apiPath, settingsData, dmDataId);
         
         console.log(response);
         setButtonState(submitButton, 'Saved!', false, '#4CAF50', 'white');
@@ -271,6 +458,7 @@ async function handleFormSubmission(event, apiPath) {
     } catch (error) {
         console.error('Save failed:', error);
         setButtonState(submitButton, 'Save Failed', false, '#f44336', 'white');
+        await handleSaveError(error);
     }
     
     setTimeout(() => {
@@ -1,5 +1,5 @@
 async function gameLoad() {
-    const allGameDataJson = await getFromApi('loadgame');
+    const allGameDataJson = await getFromApiBatched('loadgame');
     console.log('All game Data:', allGameDataJson);
     
     // Store game data globally so other scripts can access it
@@ -225,7 +225,7 @@ async function handlePlayerFormSubmission(event, apiPath) {
         
         const dmDataId = document.getElementById('dm-id-input')?.value || '';
         const playerData = collectPlayerFormData();
-        const response = await postToApi(apiPath, playerData, dmDataId);
+        const response = await saveChangesToApi(apiPath, playerData, dmDataId);
         
         console.log(response);
         setButtonState(submitButton, 'Saved!', false, '#4CAF50', 'white');
@@ -233,6 +233,7 @@ async function handlePlayerFormSubmission(event, apiPath) {
     } catch (error) {
         console.error('Save failed:', error);
         setButtonState(submitButton, 'Save Failed', false, '#f44336', 'white');
+        await handleSaveError(error);
     }
     
     setTimeout(() => {